@@ -1,7 +1,10 @@
 import fnmatch
 import os
 import sys
+import threading
 import time
+from contextlib import contextmanager
+from io import StringIO
 from threading import Lock
 
 from colorama import Fore, Style
@@ -56,6 +59,7 @@ class ConanOutput:
     _silent_warn_tags = []
     _warnings_as_errors = []
     lock = Lock()
+    _thread_buffer = threading.local()
 
     def __init__(self, scope=""):
         self.stream = sys.stderr
@@ -64,6 +68,32 @@ class ConanOutput:
         #         stream to capture it, so colorama is not there to strip the color bytes
         self._color = color_enabled(self.stream)
 
+    @classmethod
+    @contextmanager
+    def buffered(cls):
+        """ all the output of the calling thread inside this block, from any ConanOutput, is
+        kept and written at once when the block finishes, not to interleave it with the output
+        of other threads (as the parallel jobs of the installer)
+        """
+        buffer = StringIO()
+        cls._thread_buffer.stream = buffer
+        try:
+            yield buffer
+        finally:
+            cls._thread_buffer.stream = None
+            if buffer.getvalue():
+                with cls.lock:
+                    sys.stderr.write(buffer.getvalue())
+                    sys.stderr.flush()
+
+    @classmethod
+    def thread_buffer(cls):
+        """ the buffer of the calling thread, if it is inside a buffered() block """
+        return getattr(cls._thread_buffer, "stream", None)
+
+    def _stream(self):
+        return self.thread_buffer() or self.stream
+
     @classmethod
     def define_silence_warnings(cls, warnings):
         cls._silent_warn_tags = warnings
@@ -131,8 +161,9 @@ class ConanOutput:
             data = "%s\n" % data
 
         with self.lock:
-            self.stream.write(data)
-            self.stream.flush()
+            stream = self._stream()
+            stream.write(data)
+            stream.flush()
 
         return self
 
@@ -168,8 +199,9 @@ class ConanOutput:
             ret += "{}".format(msg)
 
         with self.lock:
-            self.stream.write("{}\n".format(ret))
-            self.stream.flush()
+            stream = self._stream()
+            stream.write("{}\n".format(ret))
+            stream.flush()
 
     def trace(self, msg):
         if self._conan_output_level <= LEVEL_TRACE:
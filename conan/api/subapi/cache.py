@@ -9,13 +9,14 @@ from conan.api.output import ConanOutput
 from conan.internal.cache.cache import PkgCache
 from conan.internal.cache.home_paths import HomePaths
 from conan.internal.conan_app import ConanApp
+from conan.internal.paths import COMPRESSION_FORMATS
 from conan.internal.cache.integrity_check import IntegrityChecker
 from conans.client.downloaders.download_cache import DownloadCache
 from conans.errors import ConanException
 from conans.model.package_ref import PkgReference
 from conans.model.recipe_ref import RecipeReference
 from conans.util.dates import revision_timestamp_now
-from conans.util.files import rmdir, gzopen_without_timestamps, mkdir, remove
+from conans.util.files import rmdir, open_tar_writer, mkdir, remove, tar_extract, load
 
 
 class CacheAPI:
@@ -99,6 +100,7 @@ class CacheAPI:
                     info = os.path.join(folder, "p", "conaninfo.txt")
                     if not os.path.exists(manifest) or not os.path.exists(info):
                         rmdir(folder)
+            app.cache.collect_blobs()
         if backup_sources:
             backup_files = self.conan_api.cache.get_backup_sources(package_list, exclude=False, only_upload=False)
             for f in backup_files:
@@ -127,9 +129,12 @@ class CacheAPI:
         mkdir(os.path.dirname(tgz_path))
         name = os.path.basename(tgz_path)
         compresslevel = global_conf.get("core.gzip:compresslevel", check_type=int)
+        threads = global_conf.get("core.gzip:threads", check_type=int)
+        compression_format = global_conf.get("core.upload:compression_format", default="gzip",
+                                             choices=list(COMPRESSION_FORMATS))
         with open(tgz_path, "wb") as tgz_handle:
-            tgz = gzopen_without_timestamps(name, mode="w", fileobj=tgz_handle,
-                                            compresslevel=compresslevel)
+            tgz = open_tar_writer(name, tgz_handle, compression_format,
+                                  compresslevel=compresslevel, threads=threads)
             for ref, ref_bundle in package_list.refs().items():
                 ref_layout = cache.recipe_layout(ref)
                 recipe_folder = os.path.relpath(ref_layout.base_folder, cache_folder)
@@ -166,13 +171,11 @@ class CacheAPI:
         cache = PkgCache(self.conan_api.cache_folder, self.conan_api.config.global_conf)
         cache_folder = cache.store  # Note, this is not the home, but the actual package cache
 
+        # Any compression format, it is detected from the contents
+        threads = self.conan_api.config.global_conf.get("core.extract:threads", check_type=int)
         with open(path, mode='rb') as file_handler:
-            the_tar = tarfile.open(fileobj=file_handler)
-            fileobj = the_tar.extractfile("pkglist.json")
-            pkglist = fileobj.read()
-            the_tar.extraction_filter = (lambda member, _: member)  # fully_trusted (Py 3.14)
-            the_tar.extractall(path=cache_folder)
-            the_tar.close()
+            tar_extract(file_handler, cache_folder, threads=threads)
+        pkglist = load(os.path.join(cache_folder, "pkglist.json"))
 
         # After unzipping the files, we need to update the DB that references these files
         out = ConanOutput()
@@ -211,6 +214,7 @@ class CacheAPI:
                     shutil.move(os.path.join(cache_folder, unzipped_pkg_folder),
                                 pkg_layout.package())
                     pref_bundle["package_folder"] = db_pkg_folder
+                cache.deduplicate_package(pkg_layout)
                 unzipped_metadata_folder = pref_bundle.get("metadata_folder")
                 if unzipped_metadata_folder:
                     # FIXME: Restore metadata is not incremental, but destructive
@@ -181,7 +181,7 @@ class GraphAPI:
         return deps_graph
 
     def analyze_binaries(self, graph, build_mode=None, remotes=None, update=None, lockfile=None,
-                         build_modes_test=None, tested_graph=None):
+                         build_modes_test=None, tested_graph=None, prefetch_binaries=False):
         """ Given a dependency graph, will compute the package_ids of all recipes in the graph, and
         evaluate if they should be built from sources, downloaded from a remote server, of if the
         packages are already in the local Conan cache
@@ -194,9 +194,12 @@ class GraphAPI:
             revisions for already existing recipes in the Conan cache
         :param build_modes_test: the --build-test argument
         :param tested_graph: In case of a "test_package", the graph being tested
+        :param prefetch_binaries: start downloading the binaries while the graph is analyzed,
+            if core.download:prefetch_parallel is defined. Only for graphs that are installed
+            right after with ``install_binaries()``, that waits for them
         """
         ConanOutput().title("Computing necessary packages")
         conan_app = ConanApp(self.conan_api)
         binaries_analyzer = GraphBinariesAnalyzer(conan_app, self.conan_api.config.global_conf)
         binaries_analyzer.evaluate_graph(graph, build_mode, lockfile, remotes, update,
-                                         build_modes_test, tested_graph)
+                                         build_modes_test, tested_graph, prefetch_binaries)
@@ -22,11 +22,17 @@ class InstallAPI:
         app = ConanApp(self.conan_api)
         installer = BinaryInstaller(app, self.conan_api.config.global_conf,
                                     self.conan_api.local.editable_packages)
-        install_graph = InstallGraph(deps_graph)
-        install_graph.raise_errors()
-        install_order = install_graph.install_order()
-        installer.install_system_requires(deps_graph, install_order=install_order)
-        installer.install(deps_graph, remotes, install_order=install_order)
+        try:
+            install_graph = InstallGraph(deps_graph)
+            install_graph.raise_errors()
+            install_order = install_graph.install_order()
+            installer.install_system_requires(deps_graph, install_order=install_order)
+            installer.install(deps_graph, remotes, install_order=install_order)
+        except BaseException:
+            # The binaries prefetched while analyzing the graph are not left half-downloaded
+            if deps_graph.prefetched_binaries is not None:
+                deps_graph.prefetched_binaries.cancel()
+            raise
 
     def install_system_requires(self, graph, only_info=False):
         """ Install binaries for dependency graph
@@ -7,6 +7,7 @@ from conan.api.model import Remote, LOCAL_RECIPES_INDEX
 from conan.api.output import ConanOutput
 from conan.internal.cache.home_paths import HomePaths
 from conan.internal.conan_app import ConanApp
+from conans.client.remote_search_cache import RemoteSearchCache
 from conans.client.rest_client_local_recipe_index import add_local_recipes_index_remote, \
     remove_local_recipes_index_remote
 from conan.internal.api.remotes.localdb import LocalDB
@@ -282,6 +283,8 @@ def _save(remotes_file, remotes):
             remote["remote_type"] = r.remote_type
         remote_list.append(remote)
     save(remotes_file, json.dumps({"remotes": remote_list}, indent=True))
+    # Any change to the remotes definition invalidates the persisted search results
+    RemoteSearchCache(os.path.dirname(remotes_file)).invalidate()
 
 
 def _filter(remotes, pattern, only_enabled=True):
@@ -5,7 +5,7 @@ from multiprocessing.pool import ThreadPool
 from conan.api.output import ConanOutput
 from conan.internal.conan_app import ConanApp
 from conan.internal.api.uploader import PackagePreparator, UploadExecutor, UploadUpstreamChecker, \
-    gather_metadata
+    UploadPipeline, gather_metadata
 from conans.client.pkg_sign import PkgSignaturesPlugin
 from conans.client.rest.file_uploader import FileUploader
 from conans.errors import ConanException, AuthenticationException, ForbiddenException
@@ -40,8 +40,7 @@ class UploadAPI:
         :param metadata: A list of patterns of metadata that should be uploaded. Default None
         means all metadata will be uploaded together with the pkg artifacts. If metadata is empty
         string (""), it means that no metadata files should be uploaded."""
-        if metadata and metadata != [''] and '' in metadata:
-            raise ConanException("Empty string and patterns can not be mixed for metadata.")
+        _check_metadata(metadata)
         app = ConanApp(self.conan_api)
         preparator = PackagePreparator(app, self.conan_api.config.global_conf)
         preparator.prepare(package_list, enabled_remotes)
@@ -51,6 +50,14 @@ class UploadAPI:
         # This might add files entries to package_list with signatures
         signer.sign(package_list)
 
+    def _prepare_upload(self, package_list, remote, enabled_remotes, metadata=None):
+        """ same as prepare() + upload(), but overlapping the preparation of every recipe and
+        package with the upload of the previous ones"""
+        _check_metadata(metadata)
+        app = ConanApp(self.conan_api)
+        UploadPipeline(app, self.conan_api.config.global_conf).upload(package_list, remote,
+                                                                     enabled_remotes, metadata)
+
     def upload(self, package_list, remote):
         app = ConanApp(self.conan_api)
         app.remote_manager.check_credentials(remote)
@@ -75,18 +82,24 @@ class UploadAPI:
             # Check if the recipes/packages are in the remote
             subtitle("Checking server existing packages")
             self.check_upstream(pkglist, remote, enabled_remotes, force)
-            subtitle("Preparing artifacts for upload")
-            self.prepare(pkglist, enabled_remotes, metadata)
+            if pipeline and not dry_run:
+                subtitle("Preparing and uploading artifacts")
+                self._prepare_upload(pkglist, remote, enabled_remotes, metadata)
+            else:
+                subtitle("Preparing artifacts for upload")
+                self.prepare(pkglist, enabled_remotes, metadata)
 
             if not dry_run:
-                subtitle("Uploading artifacts")
-                self.upload(pkglist, remote)
+                if not pipeline:
+                    subtitle("Uploading artifacts")
+                    self.upload(pkglist, remote)
                 backup_files = self.conan_api.cache.get_backup_sources(pkglist)
                 self.upload_backup_sources(backup_files)
 
         t = time.time()
         ConanOutput().title(f"Uploading to remote {remote.name}")
         parallel = self.conan_api.config.get("core.upload:parallel", default=1, check_type=int)
+        pipeline = self.conan_api.config.get("core.upload:pipeline", default=False, check_type=bool)
         thread_pool = ThreadPool(parallel) if parallel > 1 else None
         if not thread_pool or len(package_list.recipes) <= 1:
             _upload_pkglist(package_list, subtitle=ConanOutput().subtitle)
@@ -140,3 +153,8 @@ class UploadAPI:
 
         output.success("Upload backup sources complete\n")
         return files
+
+
+def _check_metadata(metadata):
+    if metadata and metadata != [''] and '' in metadata:
+        raise ConanException("Empty string and patterns can not be mixed for metadata.")
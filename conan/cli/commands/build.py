@@ -57,7 +57,7 @@ def build(conan_api, parser, *args):
     print_graph_basic(deps_graph)
     deps_graph.report_graph_error()
     conan_api.graph.analyze_binaries(deps_graph, args.build, remotes=remotes, update=args.update,
-                                     lockfile=lockfile)
+                                     lockfile=lockfile, prefetch_binaries=True)
     print_graph_packages(deps_graph)
 
     out = ConanOutput()
@@ -112,7 +112,8 @@ def create(conan_api, parser, *args):
             raise ConanException(
                 "This package cannot be created, 'build_policy=never', it can only be 'export-pkg'")
         conan_api.graph.analyze_binaries(deps_graph, build_modes, remotes=remotes,
-                                         update=args.update, lockfile=lockfile)
+                                         update=args.update, lockfile=lockfile,
+                                         prefetch_binaries=True)
         print_graph_packages(deps_graph)
 
         conan_api.install.install_binaries(deps_graph=deps_graph, remotes=remotes)
@@ -68,7 +68,8 @@ def install(conan_api, parser, *args):
                                               profile_build, lockfile, remotes, args.update)
     print_graph_basic(deps_graph)
     deps_graph.report_graph_error()
-    gapi.analyze_binaries(deps_graph, args.build, remotes, update=args.update, lockfile=lockfile)
+    gapi.analyze_binaries(deps_graph, args.build, remotes, update=args.update, lockfile=lockfile,
+                          prefetch_binaries=True)
     print_graph_packages(deps_graph)
 
     # Installation of binaries and consumer generators
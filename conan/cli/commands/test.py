@@ -74,7 +74,7 @@ def run_test(conan_api, path, ref, profile_host, profile_build, remotes, lockfil
 
     conan_api.graph.analyze_binaries(deps_graph, build_modes, remotes=remotes, update=update,
                                      lockfile=lockfile, build_modes_test=build_modes_test,
-                                     tested_graph=tested_graph)
+                                     tested_graph=tested_graph, prefetch_binaries=True)
     print_graph_packages(deps_graph)
 
     conan_api.install.install_binaries(deps_graph=deps_graph, remotes=remotes)
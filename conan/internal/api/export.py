@@ -54,7 +54,10 @@ def cmd_export(app, global_conf, conanfile_path, name, version, user, channel, g
     conanfile.folders.set_base_export_sources(None)
 
     # Compute the new digest
-    manifest = FileTreeManifest.create(export_folder, export_src_folder)
+    # The exported files are copies of the user ones, with the same modification time
+    manifest = FileTreeManifest.create(export_folder, export_src_folder,
+                                       hash_cache=cache.export_hashes(conanfile.recipe_folder),
+                                       origin_folder=conanfile.recipe_folder)
     manifest.save(export_folder)
     manifest.report_summary(scoped_output)
 
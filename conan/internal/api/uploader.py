@@ -2,16 +2,19 @@ import fnmatch
 import os
 import shutil
 import time
+from multiprocessing.pool import ThreadPool
 
 from conan.internal.conan_app import ConanApp
 from conan.api.output import ConanOutput
+from conans.client.pkg_sign import PkgSignaturesPlugin
 from conans.client.source import retrieve_exports_sources
 from conans.errors import ConanException, NotFoundException
+from conans.model.package_ref import PkgReference
 from conan.internal.paths import (CONAN_MANIFEST, CONANFILE, EXPORT_SOURCES_TGZ_NAME,
-                                  EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, CONANINFO)
-from conans.util.files import (clean_dirty, is_dirty, gather_files,
-                               gzopen_without_timestamps, set_dirty_context_manager, mkdir,
-                               human_size)
+                                  EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, CONANINFO,
+                                  COMPRESSION_FORMATS, archive_name, archive_names)
+from conans.util.files import (clean_dirty, is_dirty, gather_files, open_tar_writer,
+                               set_dirty_context_manager, mkdir, human_size)
 
 UPLOAD_POLICY_FORCE = "force-upload"
 UPLOAD_POLICY_SKIP = "skip-upload"
@@ -82,23 +85,29 @@ class PackagePreparator:
         self._global_conf = global_conf
 
     def prepare(self, upload_bundle, enabled_remotes):
-        local_url = self._global_conf.get("core.scm:local_url", choices=["allow", "block"])
         for ref, bundle in upload_bundle.refs().items():
-            layout = self._app.cache.recipe_layout(ref)
-            conanfile_path = layout.conanfile()
-            conanfile = self._app.loader.load_basic(conanfile_path)
-            url = conanfile.conan_data.get("scm", {}).get("url") if conanfile.conan_data else None
-            if local_url != "allow" and url is not None:
-                if not any(url.startswith(v) for v in ("ssh", "git", "http", "file")):
-                    raise ConanException(f"Package {ref} contains conandata scm url={url}\n"
-                                         "This isn't a remote URL, the build won't be reproducible\n"
-                                         "Failing because conf 'core.scm:local_url!=allow'")
-
-            if bundle.get("upload"):
-                self._prepare_recipe(ref, bundle, conanfile, enabled_remotes)
+            self.prepare_recipe(ref, bundle, enabled_remotes)
             for pref, prev_bundle in upload_bundle.prefs(ref, bundle).items():
-                if prev_bundle.get("upload"):
-                    self._prepare_package(pref, prev_bundle)
+                self.prepare_package(pref, prev_bundle)
+
+    def prepare_recipe(self, ref, bundle, enabled_remotes):
+        local_url = self._global_conf.get("core.scm:local_url", choices=["allow", "block"])
+        layout = self._app.cache.recipe_layout(ref)
+        conanfile_path = layout.conanfile()
+        conanfile = self._app.loader.load_basic(conanfile_path)
+        url = conanfile.conan_data.get("scm", {}).get("url") if conanfile.conan_data else None
+        if local_url != "allow" and url is not None:
+            if not any(url.startswith(v) for v in ("ssh", "git", "http", "file")):
+                raise ConanException(f"Package {ref} contains conandata scm url={url}\n"
+                                     "This isn't a remote URL, the build won't be reproducible\n"
+                                     "Failing because conf 'core.scm:local_url!=allow'")
+
+        if bundle.get("upload"):
+            self._prepare_recipe(ref, bundle, conanfile, enabled_remotes)
+
+    def prepare_package(self, pref, prev_bundle):
+        if prev_bundle.get("upload"):
+            self._prepare_package(pref, prev_bundle)
 
     def _prepare_recipe(self, ref, ref_bundle, conanfile, remotes):
         """ do a bunch of things that are necessary before actually executing the upload:
@@ -118,7 +127,7 @@ class PackagePreparator:
         download_export_folder = layout.download_export()
 
         output = ConanOutput(scope=str(ref))
-        for f in (EXPORT_TGZ_NAME, EXPORT_SOURCES_TGZ_NAME):
+        for f in archive_names(EXPORT_TGZ_NAME) + archive_names(EXPORT_SOURCES_TGZ_NAME):
             tgz_path = os.path.join(download_export_folder, f)
             if is_dirty(tgz_path):
                 output.warning("Removing %s, marked as dirty" % f)
@@ -149,19 +158,38 @@ class PackagePreparator:
         files.pop(CONAN_MANIFEST)
 
         def add_tgz(tgz_name, tgz_files):
-            tgz = os.path.join(download_export_folder, tgz_name)
-            if os.path.isfile(tgz):
-                result[tgz_name] = tgz
-            elif tgz_files:
-                compresslevel = self._global_conf.get("core.gzip:compresslevel", check_type=int)
-                tgz = compress_files(tgz_files, tgz_name, download_export_folder,
-                                     compresslevel=compresslevel, ref=ref)
-                result[tgz_name] = tgz
+            tgz = self._existing_archive(tgz_name, download_export_folder)
+            if tgz is None and tgz_files:
+                tgz = self._compress(tgz_name, tgz_files, download_export_folder, ref)
+            if tgz is not None:
+                result[os.path.basename(tgz)] = tgz
 
         add_tgz(EXPORT_TGZ_NAME, files)
         add_tgz(EXPORT_SOURCES_TGZ_NAME, src_files)
         return result
 
+    def _compression_format(self):
+        return self._global_conf.get("core.upload:compression_format", default="gzip",
+                                     choices=list(COMPRESSION_FORMATS))
+
+    def _existing_archive(self, tgz_name, folder):
+        """ An existing tgz_name archive in the folder, of any compression format, like the one
+        downloaded from a server, is reused, preferring the configured compression format
+        """
+        preferred = archive_name(tgz_name, self._compression_format())
+        for name in [preferred] + archive_names(tgz_name):
+            tgz = os.path.join(folder, name)
+            if os.path.isfile(tgz):
+                return tgz
+
+    def _compress(self, tgz_name, files, folder, ref):
+        compression_format = self._compression_format()
+        name = archive_name(tgz_name, compression_format)
+        compresslevel = self._global_conf.get("core.gzip:compresslevel", check_type=int)
+        threads = self._global_conf.get("core.gzip:threads", check_type=int)
+        return compress_files(files, name, folder, compresslevel=compresslevel, ref=ref,
+                              threads=threads, compression_format=compression_format)
+
     def _prepare_package(self, pref, prev_bundle):
         pkg_layout = self._app.cache.pkg_layout(pref)
         if pkg_layout.package_is_dirty():
@@ -173,11 +201,12 @@ class PackagePreparator:
     def _compress_package_files(self, layout, pref):
         output = ConanOutput(scope=str(pref))
         download_pkg_folder = layout.download_package()
-        package_tgz = os.path.join(download_pkg_folder, PACKAGE_TGZ_NAME)
-        if is_dirty(package_tgz):
-            output.warning("Removing %s, marked as dirty" % PACKAGE_TGZ_NAME)
-            os.remove(package_tgz)
-            clean_dirty(package_tgz)
+        for f in archive_names(PACKAGE_TGZ_NAME):
+            package_tgz = os.path.join(download_pkg_folder, f)
+            if is_dirty(package_tgz):
+                output.warning("Removing %s, marked as dirty" % f)
+                os.remove(package_tgz)
+                clean_dirty(package_tgz)
 
         # Get all the files in that directory
         # existing package, will use short paths if defined
@@ -198,15 +227,13 @@ class PackagePreparator:
         files.pop(CONANINFO)
         files.pop(CONAN_MANIFEST)
 
-        if not os.path.isfile(package_tgz):
+        package_tgz = self._existing_archive(PACKAGE_TGZ_NAME, download_pkg_folder)
+        if package_tgz is None:
             tgz_files = {f: path for f, path in files.items()}
-            compresslevel = self._global_conf.get("core.gzip:compresslevel", check_type=int)
-            tgz_path = compress_files(tgz_files, PACKAGE_TGZ_NAME, download_pkg_folder,
-                                      compresslevel=compresslevel, ref=pref)
-            assert tgz_path == package_tgz
+            package_tgz = self._compress(PACKAGE_TGZ_NAME, tgz_files, download_pkg_folder, pref)
             assert os.path.exists(package_tgz)
 
-        return {PACKAGE_TGZ_NAME: package_tgz,
+        return {os.path.basename(package_tgz): package_tgz,
                 CONANINFO: os.path.join(download_pkg_folder, CONANINFO),
                 CONAN_MANIFEST: os.path.join(download_pkg_folder, CONAN_MANIFEST)}
 
@@ -254,14 +281,61 @@ class UploadExecutor:
         output.debug(f"Upload {pref} in {duration} time")
 
 
-def compress_files(files, name, dest_dir, compresslevel=None, ref=None):
+class UploadPipeline:
+    """ prepares the recipes and packages (compress, gather metadata and sign) one by one in a
+    background thread, while the main thread uploads the already prepared ones in order, so the
+    compression of the next package overlaps the transfer of the previous one
+    """
+    def __init__(self, app: ConanApp, global_conf):
+        self._app = app
+        self._preparator = PackagePreparator(app, global_conf)
+        self._executor = UploadExecutor(app)
+        self._signer = PkgSignaturesPlugin(app.cache, app.cache_folder)
+
+    def upload(self, upload_data, remote, enabled_remotes, metadata=None):
+        self._app.remote_manager.check_credentials(remote)
+        items = []
+        for ref, bundle in upload_data.refs().items():
+            items.append((ref, bundle))
+            items.extend(upload_data.prefs(ref, bundle).items())
+
+        # A single thread, the compression is already parallelized by core.gzip:threads
+        thread_pool = ThreadPool(1)
+        try:
+            prepared = [thread_pool.apply_async(self._prepare, (ref, bundle, enabled_remotes,
+                                                                metadata))
+                        for ref, bundle in items]
+            for (ref, bundle), result in zip(items, prepared):
+                result.get()  # raises if the preparation failed
+                if not bundle.get("upload"):
+                    continue
+                if isinstance(ref, PkgReference):
+                    self._executor.upload_package(ref, bundle, remote)
+                else:
+                    self._executor.upload_recipe(ref, bundle, remote)
+        finally:
+            thread_pool.terminate()  # Do not keep compressing if something failed
+            thread_pool.join()
+
+    def _prepare(self, ref, bundle, enabled_remotes, metadata):
+        if isinstance(ref, PkgReference):
+            self._preparator.prepare_package(ref, bundle)
+        else:
+            self._preparator.prepare_recipe(ref, bundle, enabled_remotes)
+        if metadata != ['']:
+            gather_bundle_metadata(ref, bundle, self._app.cache, metadata)
+        self._signer.sign_bundle(ref, bundle)
+
+
+def compress_files(files, name, dest_dir, compresslevel=None, ref=None, threads=None,
+                   compression_format="gzip"):
     t1 = time.time()
     # FIXME, better write to disk sequentially and not keep tgz contents in memory
     tgz_path = os.path.join(dest_dir, name)
     ConanOutput(scope=str(ref)).info(f"Compressing {name}")
     with set_dirty_context_manager(tgz_path), open(tgz_path, "wb") as tgz_handle:
-        tgz = gzopen_without_timestamps(name, mode="w", fileobj=tgz_handle,
-                                        compresslevel=compresslevel)
+        tgz = open_tar_writer(name, tgz_handle, compression_format, compresslevel=compresslevel,
+                              threads=threads)
         for filename, abs_path in sorted(files.items()):
             # recursive is False in case it is a symlink to a folder
             tgz.add(abs_path, filename, recursive=False)
@@ -296,19 +370,23 @@ def _metadata_files(folder, metadata):
 
 def gather_metadata(package_list, cache, metadata):
     for rref, recipe_bundle in package_list.refs().items():
-        if metadata or recipe_bundle["upload"]:
-            metadata_folder = cache.recipe_layout(rref).metadata()
-            files = _metadata_files(metadata_folder, metadata)
-            if files:
-                ConanOutput(scope=str(rref)).info(f"Recipe metadata: {len(files)} files")
-                recipe_bundle.setdefault("files", {}).update(files)
-                recipe_bundle["upload"] = True
-
+        gather_bundle_metadata(rref, recipe_bundle, cache, metadata)
         for pref, pkg_bundle in package_list.prefs(rref, recipe_bundle).items():
-            if metadata or pkg_bundle["upload"]:
-                metadata_folder = cache.pkg_layout(pref).metadata()
-                files = _metadata_files(metadata_folder, metadata)
-                if files:
-                    ConanOutput(scope=str(pref)).info(f"Package metadata: {len(files)} files")
-                    pkg_bundle.setdefault("files", {}).update(files)
-                    pkg_bundle["upload"] = True
+            gather_bundle_metadata(pref, pkg_bundle, cache, metadata)
+
+
+def gather_bundle_metadata(ref, bundle, cache, metadata):
+    """ ref can be a RecipeReference or a PkgReference, for the recipe or package bundle
+    """
+    if metadata or bundle["upload"]:
+        if isinstance(ref, PkgReference):
+            metadata_folder = cache.pkg_layout(ref).metadata()
+            kind = "Package"
+        else:
+            metadata_folder = cache.recipe_layout(ref).metadata()
+            kind = "Recipe"
+        files = _metadata_files(metadata_folder, metadata)
+        if files:
+            ConanOutput(scope=str(ref)).info(f"{kind} metadata: {len(files)} files")
+            bundle.setdefault("files", {}).update(files)
+            bundle["upload"] = True
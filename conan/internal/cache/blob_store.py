@@ -0,0 +1,90 @@
+import os
+import stat
+
+from conans.model.manifest import FileTreeManifest
+from conans.util.files import md5sum
+
+
+class BlobStore:
+    """ Content-addressed store of the package files, so identical files of different packages in
+    the cache are hardlinks to the same blob instead of full copies. The blobs are keyed by the
+    md5 of the conanmanifest.txt of the packages (plus the executable bit, as hardlinks share
+    the permissions), so the files are not hashed again, except when adding new blobs.
+    The reference counting is the filesystem links count: a blob with only 1 link is not used by
+    any package anymore and it can be garbage collected.
+    """
+
+    def __init__(self, folder):
+        self._folder = folder
+
+    def _blob_path(self, key):
+        return os.path.join(self._folder, key[:2], key)
+
+    @staticmethod
+    def _blob_keys(folder):
+        """ {abs_path: blob_key} of the regular files in the manifest of a package folder
+        """
+        try:
+            manifest = FileTreeManifest.load(folder)
+        except (IOError, OSError):  # Nothing to do without a manifest
+            return {}
+        result = {}
+        for filename, file_md5 in manifest.file_sums.items():
+            path = os.path.join(folder, filename)
+            try:
+                st = os.lstat(path)
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):  # symlinks are not deduplicated
+                result[path] = file_md5 + ("x" if st.st_mode & stat.S_IXUSR else "")
+        return result
+
+    def store(self, folder):
+        """ replaces the files of the package folder with hardlinks to the blobs of the same
+        contents, adding the missing ones to the store. Every file that cannot be linked (no
+        hardlinks support, concurrent updates...) just keeps being a regular copy
+        """
+        linked = set()
+        for path, key in sorted(self._blob_keys(folder).items()):
+            # Identical files in the same package are not linked, so the package archives
+            # (with hardlinks entries for the same inodes) don't depend on the blob store
+            if key in linked:
+                continue
+            linked.add(key)
+            blob = self._blob_path(key)
+            tmp = path + ".blob"
+            try:
+                if not os.path.isfile(blob):
+                    # The manifest is never trusted for new blobs, they would be shared
+                    if md5sum(path) == key[:32]:
+                        os.makedirs(os.path.dirname(blob), exist_ok=True)
+                        os.link(path, blob)
+                elif not os.path.samefile(blob, path):
+                    os.link(blob, tmp)
+                    os.replace(tmp, path)
+            except OSError:
+                if os.path.lexists(tmp):
+                    os.remove(tmp)
+
+    def blobs(self, folder):
+        """ the blobs that might be linked by the package folder, to collect them after
+        removing the package
+        """
+        if not os.path.isdir(self._folder):  # Avoid loading the manifest if never enabled
+            return []
+        return [self._blob_path(key) for key in set(self._blob_keys(folder).values())]
+
+    def collect(self, blobs=None):
+        """ remove the given blobs (or all of them if None) that are not linked by any package
+        """
+        if blobs is None:
+            if not os.path.isdir(self._folder):
+                return
+            blobs = [os.path.join(self._folder, d, b) for d in os.listdir(self._folder)
+                     for b in os.listdir(os.path.join(self._folder, d))]
+        for blob in blobs:
+            try:
+                if os.stat(blob).st_nlink == 1:
+                    os.remove(blob)
+            except OSError:
+                pass
@@ -2,10 +2,13 @@ import hashlib
 import os
 import re
 import shutil
+import sqlite3
 import uuid
 from fnmatch import translate
 from typing import List
 
+from conan.api.output import ConanOutput
+from conan.internal.cache.blob_store import BlobStore
 from conan.internal.cache.conan_reference_layout import RecipeLayout, PackageLayout
 # TODO: Random folders are no longer accessible, how to get rid of them asap?
 # TODO: We need the workflow to remove existing references.
@@ -14,7 +17,7 @@ from conans.errors import ConanReferenceAlreadyExistsInDB, ConanException
 from conans.model.package_ref import PkgReference
 from conans.model.recipe_ref import RecipeReference
 from conans.util.dates import revision_timestamp_now
-from conans.util.files import rmdir, renamedir, mkdir
+from conans.util.files import rmdir, renamedir, mkdir, md5
 
 
 class PkgCache:
@@ -30,9 +33,17 @@ class PkgCache:
             mkdir(self._store_folder)
             db_filename = os.path.join(self._store_folder, 'cache.sqlite3')
             self._base_folder = os.path.abspath(self._store_folder)
-            self._db = CacheDatabase(filename=db_filename)
+            wal = global_conf.get("core.cache:sqlite_wal", check_type=bool, default=False)
+            lru_granularity = global_conf.get("core.cache:lru_granularity")
+            self._db = CacheDatabase(filename=db_filename, wal=wal,
+                                     lru_granularity=lru_granularity)
         except Exception as e:
             raise ConanException(f"Couldn't initialize storage in {self._store_folder}: {e}")
+        self._blob_store = BlobStore(os.path.join(self._base_folder, "blobs"))
+        self._deduplicate = global_conf.get("core.cache:deduplicate", check_type=bool,
+                                            default=False)
+        self._manifest_hashes = global_conf.get("core.cache:manifest_hashes", check_type=bool,
+                                                default=False)
 
     @property
     def store(self):
@@ -172,13 +183,16 @@ class PkgCache:
 
     def search_recipes(self, pattern=None, ignorecase=True):
         # Conan references in main storage
+        prefix = None
         if pattern:
             if isinstance(pattern, RecipeReference):
                 pattern = repr(pattern)
+            # The literal start of the pattern is filtered by the DB, the rest by the regex
+            prefix = re.split(r"[*?\[]", pattern, 1)[0]
             pattern = translate(pattern)
             pattern = re.compile(pattern, re.IGNORECASE if ignorecase else 0)
 
-        refs = self._db.list_references()
+        refs = self._db.list_references(prefix, ignorecase)
         if pattern:
             refs = [r for r in refs if r.partial_match(pattern)]
         return refs
@@ -207,8 +221,34 @@ class PkgCache:
         self._db.remove_recipe(layout.reference)
 
     def remove_package_layout(self, layout: PackageLayout):
+        blobs = self._blob_store.blobs(layout.package())
         layout.remove()
         self._db.remove_package(layout.reference)
+        self._blob_store.collect(blobs)
+
+    def deduplicate_package(self, layout: PackageLayout):
+        """ hardlinks the identical files of the package with the ones of other packages,
+        if core.cache:deduplicate is enabled"""
+        if self._deduplicate:
+            self._blob_store.store(layout.package())
+
+    def manifest_hashes(self, layout):
+        """ the file to keep the md5 of the files of the recipe or package layout, so the
+        manifests verifications are not hashing again the unchanged ones, None if
+        core.cache:manifest_hashes is not enabled"""
+        if self._manifest_hashes:
+            return os.path.join(layout.base_folder, "manifest_hashes.json")
+
+    def export_hashes(self, recipe_folder):
+        """ the file to keep the md5 of the user files exported from that recipe folder, so
+        exporting again the unchanged ones doesn't hash them, None if core.cache:manifest_hashes
+        is not enabled"""
+        if self._manifest_hashes:
+            return os.path.join(self._base_folder, "export_hashes", f"{md5(recipe_folder)}.json")
+
+    def collect_blobs(self):
+        """ removes the deduplicated files no longer used by any package"""
+        self._blob_store.collect()
 
     def remove_build_id(self, pref):
         self._db.remove_build_id(pref)
@@ -236,6 +276,7 @@ class PkgCache:
             #  update it, the update_package_timestamp() can be simplified and path dropped
             relpath = os.path.relpath(layout.base_folder, self._base_folder)
             self._db.update_package_timestamp(pref, path=relpath, build_id=build_id)
+        self.deduplicate_package(layout)
 
     def assign_rrev(self, layout: RecipeLayout):
         """ called at export, once the exported recipe revision has been computed, it
@@ -274,10 +315,21 @@ class PkgCache:
         return self._db.get_recipe_lru(ref)
 
     def update_recipe_lru(self, ref):
+        # Deferred until flush_lru(), many updates are written in a single transaction
         self._db.update_recipe_lru(ref)
 
     def get_package_lru(self, pref):
         return self._db.get_package_lru(pref)
 
     def update_package_lru(self, pref):
+        # Deferred until flush_lru(), many updates are written in a single transaction
         self._db.update_package_lru(pref)
+
+    def flush_lru(self):
+        """ writes the deferred LRU updates. It runs after failed commands too, so it never raises,
+        not to hide their error, the LRUs are kept to be written in the next flush
+        """
+        try:
+            self._db.flush_lru()
+        except (sqlite3.Error, OSError) as e:
+            ConanOutput().warning(f"The cache LRU couldn't be updated: {e}")
@@ -70,12 +70,13 @@ class RecipeLayout(LayoutBase):
     def conandata(self):
         return os.path.join(self.export(), DATA_YML)
 
-    def recipe_manifests(self):
+    def recipe_manifests(self, hash_cache=None):
         # Used for comparison and integrity check
         export_folder = self.export()
         readed_manifest = FileTreeManifest.load(export_folder)
         exports_source_folder = self.export_sources()
-        expected_manifest = FileTreeManifest.create(export_folder, exports_source_folder)
+        expected_manifest = FileTreeManifest.create(export_folder, exports_source_folder,
+                                                    hash_cache=hash_cache)
         return readed_manifest, expected_manifest
 
     def sources_remove(self):
@@ -109,10 +110,10 @@ class PackageLayout(LayoutBase):
     def metadata(self):
         return os.path.join(self.download_package(), METADATA)
 
-    def package_manifests(self):
+    def package_manifests(self, hash_cache=None):
         package_folder = self.package()
         readed_manifest = FileTreeManifest.load(package_folder)
-        expected_manifest = FileTreeManifest.create(package_folder)
+        expected_manifest = FileTreeManifest.create(package_folder, hash_cache=hash_cache)
         return readed_manifest, expected_manifest
 
     @contextmanager
@@ -1,22 +1,33 @@
 import os
 import sqlite3
+import threading
 
 from conan.api.output import ConanOutput
 from conan.internal.cache.db.packages_table import PackagesDBTable
 from conan.internal.cache.db.recipes_table import RecipesDBTable
+from conan.internal.cache.db.table import DbConnections
 from conans.model.package_ref import PkgReference
 from conans.model.recipe_ref import RecipeReference
 from conans.model.version import Version
+from conans.util.dates import timelimit
 
 
 class CacheDatabase:
 
-    def __init__(self, filename):
+    def __init__(self, filename, wal=False, lru_granularity=None):
         version = sqlite3.sqlite_version
         if Version(version) < "3.7.11":
             ConanOutput().error(f"Your sqlite3 '{version} < 3.7.11' version is not supported")
-        self._recipes = RecipesDBTable(filename)
-        self._packages = PackagesDBTable(filename)
+        self._filename = filename
+        self._lru_granularity = lru_granularity
+        # The recipes and packages used whose LRU has not been written yet
+        # {ref_repr: ref}, {pref_repr: pref}
+        self._lru_refs = {}
+        self._lru_prefs = {}
+        self._lru_lock = threading.Lock()
+        self._connections = DbConnections(filename, wal=wal)
+        self._recipes = RecipesDBTable(filename, self._connections)
+        self._packages = PackagesDBTable(filename, self._connections)
         if not os.path.isfile(filename):
             self._recipes.create_table()
             self._packages.create_table()
@@ -43,10 +54,35 @@ class CacheDatabase:
         return self._packages.get(pref)["lru"]
 
     def update_recipe_lru(self, ref):
-        self._recipes.update_lru(ref)
+        """ The LRU is only recorded in the journal, it is written by flush_lru() """
+        with self._lru_lock:
+            self._lru_refs[ref.repr_notime()] = ref
 
     def update_package_lru(self, pref):
-        self._packages.update_lru(pref)
+        """ The LRU is only recorded in the journal, it is written by flush_lru() """
+        with self._lru_lock:
+            self._lru_prefs[pref.repr_notime()] = pref
+
+    def flush_lru(self):
+        """ writes the journaled LRUs in a single transaction. With a lru_granularity like "10m",
+        the LRUs updated less than 10 minutes ago are not written. The journal entries are
+        removed only if the transaction succeeds, so a failed one is retried in the next flush
+        """
+        with self._lru_lock:
+            refs, prefs = dict(self._lru_refs), dict(self._lru_prefs)
+        if not refs and not prefs:
+            return
+        older_than = timelimit(self._lru_granularity) if self._lru_granularity else None
+        with self._connections.transaction():
+            for ref in refs.values():
+                self._recipes.update_lru(ref, older_than)
+            for pref in prefs.values():
+                self._packages.update_lru(pref, older_than)
+        with self._lru_lock:
+            for key in refs:
+                self._lru_refs.pop(key, None)
+            for key in prefs:
+                self._lru_prefs.pop(key, None)
 
     def remove_recipe(self, ref: RecipeReference):
         # Removing the recipe must remove all the package binaries too from DB
@@ -90,9 +126,9 @@ class CacheDatabase:
     def create_package(self, path, ref: PkgReference, build_id):
         self._packages.create(path, ref, build_id=build_id)
 
-    def list_references(self):
+    def list_references(self, prefix=None, ignorecase=True):
         return [d["ref"]
-                for d in self._recipes.all_references()]
+                for d in self._recipes.all_references(prefix, ignorecase)]
 
     def get_package_revisions_references(self, pref: PkgReference, only_latest_prev=False):
         return [d["pref"]
@@ -18,6 +18,7 @@ class PackagesDBTable(BaseDbTable):
                            ('build_id', str, True),
                            ('lru', int)]
     unique_together = ('reference', 'rrev', 'pkgid', 'prev')
+    indexes = (('reference', 'rrev', 'pkgid', 'timestamp'),)
 
     @staticmethod
     def _as_dict(row):
@@ -39,8 +40,8 @@ class PackagesDBTable(BaseDbTable):
             self.columns.prev: pref.revision,
         }
         where_expr = ' AND '.join(
-            [f"{k}='{v}' " if v is not None else f'{k} IS NULL' for k, v in where_dict.items()])
-        return where_expr
+            [f"{k} = ?" if v is not None else f'{k} IS NULL' for k, v in where_dict.items()])
+        return where_expr, [v for v in where_dict.values() if v is not None]
 
     def _set_clause(self, pref: PkgReference, path=None, build_id=None):
         set_dict = {
@@ -52,17 +53,17 @@ class PackagesDBTable(BaseDbTable):
             self.columns.timestamp: pref.timestamp,
             self.columns.build_id: build_id,
         }
-        set_expr = ', '.join([f"{k} = '{v}'" for k, v in set_dict.items() if v is not None])
-        return set_expr
+        set_expr = ', '.join([f"{k} = ?" for k, v in set_dict.items() if v is not None])
+        return set_expr, [v for v in set_dict.values() if v is not None]
 
     def get(self, pref: PkgReference):
         """ Returns the row matching the reference or fails """
-        where_clause = self._where_clause(pref)
+        where_clause, params = self._where_clause(pref)
         query = f'SELECT * FROM {self.table_name} ' \
                 f'WHERE {where_clause};'
 
         with self.db_connection() as conn:
-            r = conn.execute(query)
+            r = conn.execute(query, params)
             row = r.fetchone()
 
         if not row:
@@ -89,59 +90,67 @@ class PackagesDBTable(BaseDbTable):
     def update_timestamp(self, pref: PkgReference, path: str, build_id: str):
         assert pref.revision
         assert pref.timestamp
-        where_clause = self._where_clause(pref)
-        set_clause = self._set_clause(pref, path=path, build_id=build_id)
+        where_clause, where_params = self._where_clause(pref)
+        set_clause, set_params = self._set_clause(pref, path=path, build_id=build_id)
         query = f"UPDATE {self.table_name} " \
                 f"SET {set_clause} " \
                 f"WHERE {where_clause};"
         with self.db_connection() as conn:
             try:
-                conn.execute(query)
+                conn.execute(query, set_params + where_params)
             except sqlite3.IntegrityError:
                 raise ConanReferenceAlreadyExistsInDB(f"Reference '{repr(pref)}' already exists")
 
-    def update_lru(self, pref):
+    def update_lru(self, pref, older_than=None):
+        """ if older_than is defined, the LRU is only updated if it is older than it """
         assert pref.revision is not None
         # TODO: InstallGraph is dropping the pref.timestamp, cannot be checked here yet
         # assert pref.timestamp is not None, f"PREF _TIMESSTAMP IS NONE {repr(pref)}"
-        where_clause = self._where_clause(pref)
+        where_clause, params = self._where_clause(pref)
+        if older_than is not None:
+            where_clause += f" AND {self.columns.lru} < ?"
+            params.append(older_than)
         lru = timestamp_now()
         query = f"UPDATE {self.table_name} " \
-                f"SET {self.columns.lru} = '{lru}' " \
+                f"SET {self.columns.lru} = ? " \
                 f"WHERE {where_clause};"
         with self.db_connection() as conn:
-            conn.execute(query)
+            conn.execute(query, [lru] + params)
 
     def remove_build_id(self, pref):
-        where_clause = self._where_clause(pref)
+        where_clause, params = self._where_clause(pref)
         query = f"UPDATE {self.table_name} " \
                 f"SET {self.columns.build_id} = 'null' " \
                 f"WHERE {where_clause};"
         with self.db_connection() as conn:
             try:
-                conn.execute(query)
+                conn.execute(query, params)
             except sqlite3.IntegrityError:
                 raise ConanReferenceAlreadyExistsInDB(f"Reference '{repr(pref)}' already exists")
 
     def remove_recipe(self, ref: RecipeReference):
         # can't use the _where_clause, because that is an exact match on the package_id, etc
         query = f"DELETE FROM {self.table_name} " \
-                f"WHERE {self.columns.reference} = '{str(ref)}' " \
-                f"AND {self.columns.rrev} = '{ref.revision}' "
+                f"WHERE {self.columns.reference} = ? " \
+                f"AND {self.columns.rrev} = ? "
         with self.db_connection() as conn:
-            conn.execute(query)
+            conn.execute(query, [str(ref), ref.revision])
 
     def remove(self, pref: PkgReference):
-        where_clause = self._where_clause(pref)
+        where_clause, params = self._where_clause(pref)
         query = f"DELETE FROM {self.table_name} " \
                 f"WHERE {where_clause};"
         with self.db_connection() as conn:
-            conn.execute(query)
+            conn.execute(query, params)
 
     def get_package_revisions_references(self, pref: PkgReference, only_latest_prev=False):
         assert pref.ref.revision, "To search package revisions you must provide a recipe revision."
         assert pref.package_id, "To search package revisions you must provide a package id."
-        check_prev = f"AND {self.columns.prev} = '{pref.revision}' " if pref.revision else ""
+        params = [pref.ref.revision, str(pref.ref), pref.package_id]
+        check_prev = ""
+        if pref.revision:
+            check_prev = f"AND {self.columns.prev} = ? "
+            params.append(pref.revision)
         if only_latest_prev:
             query = f'SELECT {self.columns.reference}, ' \
                     f'{self.columns.rrev}, ' \
@@ -152,22 +161,22 @@ class PackagesDBTable(BaseDbTable):
                     f'{self.columns.build_id}, ' \
                     f'{self.columns.lru} ' \
                     f'FROM {self.table_name} ' \
-                    f"WHERE {self.columns.rrev} = '{pref.ref.revision}' " \
-                    f"AND {self.columns.reference} = '{str(pref.ref)}' " \
-                    f"AND {self.columns.pkgid} = '{pref.package_id}' " \
+                    f"WHERE {self.columns.rrev} = ? " \
+                    f"AND {self.columns.reference} = ? " \
+                    f"AND {self.columns.pkgid} = ? " \
                     f'{check_prev} ' \
                     f'AND {self.columns.prev} IS NOT NULL ' \
                     f'GROUP BY {self.columns.pkgid} '
         else:
             query = f'SELECT * FROM {self.table_name} ' \
-                    f"WHERE {self.columns.rrev} = '{pref.ref.revision}' " \
-                    f"AND {self.columns.reference} = '{str(pref.ref)}' " \
-                    f"AND {self.columns.pkgid} = '{pref.package_id}' " \
+                    f"WHERE {self.columns.rrev} = ? " \
+                    f"AND {self.columns.reference} = ? " \
+                    f"AND {self.columns.pkgid} = ? " \
                     f'{check_prev} ' \
                     f'AND {self.columns.prev} IS NOT NULL ' \
                     f'ORDER BY {self.columns.timestamp} DESC'
         with self.db_connection() as conn:
-            r = conn.execute(query)
+            r = conn.execute(query, params)
             for row in r.fetchall():
                 yield self._as_dict(self.row_type(*row))
 
@@ -185,16 +194,16 @@ class PackagesDBTable(BaseDbTable):
                     f'{self.columns.build_id}, ' \
                     f'{self.columns.lru} ' \
                     f'FROM {self.table_name} ' \
-                    f"WHERE {self.columns.rrev} = '{ref.revision}' " \
-                    f"AND {self.columns.reference} = '{str(ref)}' " \
+                    f"WHERE {self.columns.rrev} = ? " \
+                    f"AND {self.columns.reference} = ? " \
                     f'GROUP BY {self.columns.pkgid} '
         else:
             query = f'SELECT * FROM {self.table_name} ' \
-                    f"WHERE {self.columns.rrev} = '{ref.revision}' " \
-                    f"AND {self.columns.reference} = '{str(ref)}' " \
+                    f"WHERE {self.columns.rrev} = ? " \
+                    f"AND {self.columns.reference} = ? " \
                     f'AND {self.columns.prev} IS NOT NULL ' \
                     f'ORDER BY {self.columns.timestamp} DESC'
         with self.db_connection() as conn:
-            r = conn.execute(query)
+            r = conn.execute(query, [ref.revision, str(ref)])
             for row in r.fetchall():
                 yield self._as_dict(self.row_type(*row))
@@ -1,3 +1,4 @@
+import re
 import sqlite3
 
 from conan.internal.cache.db.table import BaseDbTable
@@ -14,6 +15,7 @@ class RecipesDBTable(BaseDbTable):
                            ('timestamp', float),
                            ('lru', int)]
     unique_together = ('reference', 'rrev')
+    indexes = (('reference', 'timestamp'),)
 
     @staticmethod
     def _as_dict(row):
@@ -33,8 +35,8 @@ class RecipesDBTable(BaseDbTable):
             self.columns.rrev: ref.revision,
         }
         where_expr = ' AND '.join(
-            [f"{k}='{v}' " if v is not None else f'{k} IS NULL' for k, v in where_dict.items()])
-        return where_expr
+            [f"{k} = ?" if v is not None else f'{k} IS NULL' for k, v in where_dict.items()])
+        return where_expr, [v for v in where_dict.values() if v is not None]
 
     def create(self, path, ref: RecipeReference):
         assert ref is not None
@@ -54,51 +56,79 @@ class RecipesDBTable(BaseDbTable):
         assert ref.revision is not None
         assert ref.timestamp is not None
         query = f"UPDATE {self.table_name} " \
-                f"SET {self.columns.timestamp} = '{ref.timestamp}' " \
-                f"WHERE {self.columns.reference}='{str(ref)}' " \
-                f"AND {self.columns.rrev} = '{ref.revision}' "
+                f"SET {self.columns.timestamp} = ? " \
+                f"WHERE {self.columns.reference} = ? " \
+                f"AND {self.columns.rrev} = ? "
         with self.db_connection() as conn:
-            conn.execute(query)
+            conn.execute(query, [ref.timestamp, str(ref), ref.revision])
 
-    def update_lru(self, ref):
+    def update_lru(self, ref, older_than=None):
+        """ if older_than is defined, the LRU is only updated if it is older than it """
         assert ref.revision is not None
         assert ref.timestamp is not None
-        where_clause = self._where_clause(ref)
+        where_clause, params = self._where_clause(ref)
+        if older_than is not None:
+            where_clause += f" AND {self.columns.lru} < ?"
+            params.append(older_than)
         lru = timestamp_now()
         query = f"UPDATE {self.table_name} " \
-                f"SET {self.columns.lru} = '{lru}' " \
+                f"SET {self.columns.lru} = ? " \
                 f"WHERE {where_clause};"
         with self.db_connection() as conn:
-            conn.execute(query)
+            conn.execute(query, [lru] + params)
 
     def remove(self, ref: RecipeReference):
-        where_clause = self._where_clause(ref)
+        where_clause, params = self._where_clause(ref)
         query = f"DELETE FROM {self.table_name} " \
                 f"WHERE {where_clause};"
         with self.db_connection() as conn:
-            conn.execute(query)
+            conn.execute(query, params)
 
     # returns all different conan references (name/version@user/channel)
-    def all_references(self):
+    def all_references(self, prefix=None, ignorecase=True):
+        """ if a prefix is given, only the references whose "name/version@user/channel#rrev"
+        start with it are returned, so the filtering is done by the DB and not in Python
+        """
+        where_clause, params = self._prefix_clause(prefix, ignorecase) if prefix else ("", [])
         query = f'SELECT DISTINCT {self.columns.reference}, ' \
                     f'{self.columns.rrev}, ' \
                     f'{self.columns.path} ,' \
                     f'{self.columns.timestamp}, ' \
                     f'{self.columns.lru} ' \
                     f'FROM {self.table_name} ' \
+                    f'{where_clause}' \
                     f'ORDER BY {self.columns.timestamp} DESC'
 
         with self.db_connection() as conn:
-            r = conn.execute(query)
+            r = conn.execute(query, params)
             result = [self._as_dict(self.row_type(*row)) for row in r.fetchall()]
         return result
 
+    def _prefix_clause(self, prefix, ignorecase):
+        # The prefix has no wildcards, it is the literal start of a fnmatch pattern
+        if ignorecase:  # LIKE is case insensitive, GLOB is not (but it can use the index)
+            op, wildcard = "LIKE ? ESCAPE '\\'", "%"
+
+            def escape(v):
+                return re.sub(r"([\\%_])", r"\\\1", v)
+        else:
+            op, wildcard = "GLOB ?", "*"
+
+            def escape(v):
+                return v
+        # The reference column never contains the "#", everything after it belongs to the rrev
+        if "#" not in prefix:
+            return f"WHERE {self.columns.reference} {op} ", [escape(prefix) + wildcard]
+        reference, rrev = prefix.split("#", 1)
+        return f"WHERE {self.columns.reference} {op} AND {self.columns.rrev} {op} ", \
+            [escape(reference), escape(rrev) + wildcard]
+
     def get_recipe(self, ref: RecipeReference):
         query = f'SELECT * FROM {self.table_name} ' \
-                f"WHERE {self.columns.reference}='{str(ref)}' " \
-                f"AND {self.columns.rrev} = '{ref.revision}' "
+                f"WHERE {self.columns.reference} = ? " \
+                f"AND {self.columns.rrev} = ? "
         with self.db_connection() as conn:
-            r = conn.execute(query)
+            r = conn.execute(query, [str(ref), ref.revision])
             row = r.fetchone()
             if not row:
                 raise ConanReferenceDoesNotExistInDB(f"Recipe '{ref.repr_notime()}' not found")
@@ -112,11 +142,11 @@ class RecipesDBTable(BaseDbTable):
                 f'MAX({self.columns.timestamp}), ' \
                 f'{self.columns.lru} ' \
                 f'FROM {self.table_name} ' \
-                f"WHERE {self.columns.reference} = '{str(ref)}' " \
+                f"WHERE {self.columns.reference} = ? " \
                 f'GROUP BY {self.columns.reference} '  # OTHERWISE IT FAILS THE MAX()
 
         with self.db_connection() as conn:
-            r = conn.execute(query)
+            r = conn.execute(query, [str(ref)])
             row = r.fetchone()
             if row is None:
                 raise ConanReferenceDoesNotExistInDB(f"Recipe '{ref}' not found")
@@ -126,10 +156,10 @@ class RecipesDBTable(BaseDbTable):
     def get_recipe_revisions_references(self, ref: RecipeReference):
         assert ref.revision is None
         query = f'SELECT * FROM {self.table_name} ' \
-                f"WHERE {self.columns.reference} = '{str(ref)}' " \
+                f"WHERE {self.columns.reference} = ? " \
                 f'ORDER BY {self.columns.timestamp} DESC'
 
         with self.db_connection() as conn:
-            r = conn.execute(query)
+            r = conn.execute(query, [str(ref)])
             ret = [self._as_dict(self.row_type(*row))["ref"] for row in r.fetchall()]
         return ret
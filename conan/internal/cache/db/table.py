@@ -5,31 +5,85 @@ from contextlib import contextmanager
 from typing import Tuple, List, Optional
 
 
+class DbConnections:
+    """ The connections of the different threads of this process to the same database file.
+
+    By default a connection only lives for a single query or transaction. In WAL mode every
+    thread keeps its own connection open while this object lives, and the database uses the
+    SQLite write-ahead log, that allows readers and one writer of other processes concurrently
+    """
+    _lock_storage = defaultdict(threading.RLock)
+
+    def __init__(self, filename, wal=False):
+        self.filename = filename
+        self._wal = wal
+        self._lock = self._lock_storage[self.filename]
+        self._local = threading.local()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.filename, isolation_level=None, timeout=10)
+        if self._wal:
+            # The journal mode is persisted in the DB file, synchronous is per connection
+            connection.execute("PRAGMA journal_mode=WAL;")
+            connection.execute("PRAGMA synchronous=NORMAL;")
+        return connection
+
+    @contextmanager
+    def connection(self):
+        assert self._lock.acquire(timeout=10), "Conan failed to acquire database lock"
+        try:
+            connection = getattr(self._local, "connection", None)
+            if connection is not None:  # persistent or in the middle of a transaction
+                yield connection
+                return
+            connection = self._connect()
+            if self._wal:
+                self._local.connection = connection
+                yield connection
+                return
+            self._local.connection = connection
+            try:
+                yield connection
+            finally:
+                self._local.connection = None
+                connection.close()
+        finally:
+            self._lock.release()
+
+    @contextmanager
+    def transaction(self):
+        """ All the queries done by this thread inside the block are a single transaction
+        """
+        with self.connection() as connection:
+            if connection.in_transaction:  # nested, the outer one will commit
+                yield
+                return
+            connection.execute("BEGIN IMMEDIATE;")
+            try:
+                yield
+            except BaseException:
+                connection.execute("ROLLBACK;")
+                raise
+            connection.execute("COMMIT;")
+
+
 class BaseDbTable:
     table_name: str = None
     columns_description: List[Tuple[str, type]] = None
     row_type: namedtuple = None
     columns: namedtuple = None
     unique_together: tuple = None
-    _lock: threading.Lock = None
-    _lock_storage = defaultdict(threading.Lock)
+    indexes: tuple = ()
 
-    def __init__(self, filename):
+    def __init__(self, filename, connections=None):
         self.filename = filename
         column_names: List[str] = [it[0] for it in self.columns_description]
         self.row_type = namedtuple('_', column_names)
         self.columns = self.row_type(*column_names)
-        self._lock = self._lock_storage[self.filename]
+        self._connections = connections or DbConnections(filename)
 
-    @contextmanager
     def db_connection(self):
-        assert self._lock.acquire(timeout=10), "Conan failed to acquire database lock"
-        connection = sqlite3.connect(self.filename, isolation_level=None, timeout=10)
-        try:
-            yield connection
-        finally:
-            connection.close()
-            self._lock.release()
+        return self._connections.connection()
 
     def create_table(self):
         def field(name, typename, nullable=False, check_constraints: Optional[List] = None,
@@ -61,6 +115,13 @@ class BaseDbTable:
         table_checks = f", UNIQUE({', '.join(self.unique_together)})" if self.unique_together else ''
         with self.db_connection() as conn:
             conn.execute(f"CREATE TABLE {guard} {self.table_name} ({fields} {table_checks});")
+            self.create_indexes(conn)
+
+    def create_indexes(self, conn):
+        for columns in self.indexes:
+            index_name = f"{self.table_name}_{'_'.join(columns)}_idx"
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} "
+                         f"ON {self.table_name} ({', '.join(columns)});")
 
     def dump(self):
         print(f"********* BEGINTABLE {self.table_name}*************")
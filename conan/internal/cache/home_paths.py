@@ -16,6 +16,10 @@ class HomePaths:
     def local_recipes_index_path(self):
         return os.path.join(self._home, ".local_recipes_index")
 
+    @property
+    def remote_search_cache_path(self):
+        return os.path.join(self._home, ".remote_search_cache")
+
     @property
     def global_conf_path(self):
         return os.path.join(self._home, "global.conf")
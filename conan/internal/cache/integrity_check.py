@@ -32,7 +32,8 @@ class IntegrityChecker:
     def _recipe_corrupted(self, ref: RecipeReference):
         layout = self._app.cache.recipe_layout(ref)
         output = ConanOutput()
-        read_manifest, expected_manifest = layout.recipe_manifests()
+        hash_cache = self._app.cache.manifest_hashes(layout)
+        read_manifest, expected_manifest = layout.recipe_manifests(hash_cache)
         # Filter exports_sources from read manifest if there are no exports_sources locally
         # This happens when recipe is downloaded without sources (not built from source)
         export_sources_folder = layout.export_sources()
@@ -52,7 +53,8 @@ class IntegrityChecker:
     def _package_corrupted(self, ref: PkgReference):
         layout = self._app.cache.pkg_layout(ref)
         output = ConanOutput()
-        read_manifest, expected_manifest = layout.package_manifests()
+        hash_cache = self._app.cache.manifest_hashes(layout)
+        read_manifest, expected_manifest = layout.package_manifests(hash_cache)
 
         if read_manifest != expected_manifest:
             output.error(f"{ref}: Manifest mismatch", error_type="exception")
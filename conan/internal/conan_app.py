@@ -49,13 +49,13 @@ class ConanApp:
         self.hook_manager = HookManager(home_paths.hooks_path)
 
         # Wraps an http_requester to inject proxies, certs, etc
-        self.requester = ConanRequester(global_conf, cache_folder)
+        self.requester = self._requester(conan_api, global_conf, cache_folder)
         # To handle remote connections
         # Wraps RestApiClient to add authentication support (same interface)
         self.localdb = LocalDB(cache_folder)
         auth_manager = ConanApiAuthManager(self.requester, cache_folder, self.localdb, global_conf)
         # Handle remote connections
-        self.remote_manager = RemoteManager(self.cache, auth_manager, cache_folder)
+        self.remote_manager = RemoteManager(self.cache, auth_manager, cache_folder, global_conf)
 
         self.proxy = ConanProxy(self, conan_api.local.editable_packages)
         self.range_resolver = RangeResolver(self, global_conf, conan_api.local.editable_packages)
@@ -66,6 +66,17 @@ class ConanApp:
                                              self.cache_folder)
         self.loader = ConanFileLoader(self.pyreq_loader, conanfile_helpers)
 
+    @staticmethod
+    def _requester(conan_api, global_conf, cache_folder):
+        """ The same requester is reused by all the ConanApp of a ConanAPI, so its pool of
+        keep-alive connections is not lost between the different API calls
+        """
+        requester = getattr(conan_api, "_conan_requester", None)
+        if requester is None:
+            requester = ConanRequester(global_conf, cache_folder)
+            conan_api._conan_requester = requester
+        return requester
+
     @staticmethod
     def _configure(global_conf):
         ConanOutput.set_warnings_as_errors(global_conf.get("core:warnings_as_errors",
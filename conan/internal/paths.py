@@ -84,4 +84,27 @@ CONANINFO = "conaninfo.txt"
 PACKAGE_TGZ_NAME = "conan_package.tgz"
 EXPORT_TGZ_NAME = "conan_export.tgz"
 EXPORT_SOURCES_TGZ_NAME = "conan_sources.tgz"
+# The extension of the archives for every "core.upload:compression_format"
+COMPRESSION_FORMATS = {"gzip": ".tgz", "zstd": ".tzst", "xz": ".txz", "none": ".tar"}
 DATA_YML = "conandata.yml"
+
+
+def archive_name(tgz_name, compression_format):
+    """ the name of one of the above *_TGZ_NAME archives for a compression format, like
+    "conan_package.tzst" for "zstd"
+    """
+    return os.path.splitext(tgz_name)[0] + COMPRESSION_FORMATS[compression_format]
+
+
+def archive_names(tgz_name):
+    """ all the accepted names of one of the above *_TGZ_NAME archives, one per compression
+    format, in order of preference if more than one is available
+    """
+    return [archive_name(tgz_name, f) for f in COMPRESSION_FORMATS]
+
+
+def find_archive(tgz_name, files):
+    """ the name, of any compression format, of the tgz_name archive in the files collection,
+    None if it is not there
+    """
+    return next((f for f in archive_names(tgz_name) if f in files), None)
@@ -39,7 +39,8 @@ class TestServerLauncher(object):
             server_capabilities.append(REVISIONS)
 
         base_url = base_url or server_config.public_url
-        self.server_store = get_server_store(server_config.disk_storage_path, base_url)
+        self.server_store = get_server_store(server_config.disk_storage_path, base_url,
+                                             server_config.metadata_index)
 
         # Prepare some test users
         if not read_permissions:
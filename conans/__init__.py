@@ -1,5 +1,6 @@
 CHECKSUM_DEPLOY = "checksum_deploy"  # Only when v2
 REVISIONS = "revisions"  # Only when enabled in config, not by default look at server_launcher.py
 OAUTH_TOKEN = "oauth_token"
+LATEST_PACKAGES_BATCH = "latest_packages_batch"  # Only when v2
 
 __version__ = '2.9.0-dev'
@@ -10,7 +10,8 @@ from conans.client.downloaders.file_downloader import FileDownloader
 from conans.client.downloaders.download_cache import DownloadCache
 from conans.errors import NotFoundException, ConanException, AuthenticationException, \
     ForbiddenException
-from conans.util.files import mkdir, set_dirty_context_manager, remove_if_dirty, human_size
+from conans.util.files import mkdir, set_dirty_context_manager, remove_if_dirty, human_size, \
+    tar_extract
 
 
 class SourcesCachingDownloader:
@@ -20,8 +21,9 @@ class SourcesCachingDownloader:
     def __init__(self, conanfile):
         helpers = getattr(conanfile, "_conan_helpers")
         self._global_conf = helpers.global_conf
+        segments = self._global_conf.get("core.download:segments", check_type=int)
         self._file_downloader = FileDownloader(helpers.requester, scope=conanfile.display_name,
-                                               source_credentials=True)
+                                               source_credentials=True, segments=segments)
         self._home_folder = helpers.home_folder
         self._output = conanfile.output
         self._conanfile = conanfile
@@ -160,7 +162,9 @@ class ConanInternalCacheDownloader:
         self._download_cache = config.get("core.download:download_cache")
         if self._download_cache and not os.path.isabs(self._download_cache):
             raise ConanException("core.download:download_cache must be an absolute path")
-        self._file_downloader = FileDownloader(requester, scope=scope)
+        self._extract_threads = config.get("core.extract:threads", check_type=int)
+        segments = config.get("core.download:segments", check_type=int)
+        self._file_downloader = FileDownloader(requester, scope=scope, segments=segments)
         self._scope = scope
 
     def download(self, url, file_path, auth, verify_ssl, retry, retry_wait, metadata=False):
@@ -191,3 +195,35 @@ class ConanInternalCacheDownloader:
             # Everything good, file in the cache, just copy it to final destination
             mkdir(os.path.dirname(file_path))
             shutil.copy2(cached_path, file_path)
+
+    def download_extract(self, url, dest_folder, auth, verify_ssl, retry, retry_wait):
+        """ extracts the archive in the url into dest_folder while downloading it. The archive
+        itself is only kept if the download cache is enabled, saved directly in the cache
+        """
+        if not self._download_cache:
+            self._file_downloader.download_extract(url, dest_folder, retry=retry,
+                                                   retry_wait=retry_wait, verify_ssl=verify_ssl,
+                                                   auth=auth, threads=self._extract_threads)
+            return
+
+        download_cache = DownloadCache(self._download_cache)
+        cached_path, h = download_cache.cached_path(url)
+        with download_cache.lock(h):
+            remove_if_dirty(cached_path)
+
+            if not os.path.exists(cached_path):
+                with set_dirty_context_manager(cached_path):
+                    self._file_downloader.download_extract(url, dest_folder, retry=retry,
+                                                           retry_wait=retry_wait,
+                                                           verify_ssl=verify_ssl, auth=auth,
+                                                           file_path=cached_path,
+                                                           threads=self._extract_threads)
+            else:  # Found in cache!
+                total_length = os.path.getsize(cached_path)
+                if total_length > 10000000:  # 10 MB
+                    hs = human_size(total_length)
+                    ConanOutput(scope=self._scope).info(f"Extracting {hs} {os.path.basename(url)} "
+                                                        f"from download cache, instead of "
+                                                        f"downloading it")
+                with open(cached_path, mode="rb") as file_handler:
+                    tar_extract(file_handler, dest_folder, threads=self._extract_threads)
@@ -1,21 +1,72 @@
+import hashlib
 import os
 import re
+import threading
 import time
+from multiprocessing.pool import ThreadPool
 
+import requests
+import urllib3
 
 from conan.api.output import ConanOutput, TimedOutput
 from conans.client.rest import response_to_str
 from conans.errors import ConanException, NotFoundException, AuthenticationException, \
     ForbiddenException, ConanConnectionError, RequestErrorException
-from conans.util.files import human_size, check_with_algorithm_sum
+from conans.util.files import human_size, check_with_algorithm_sum, mkdir, rmdir, tar_extract
+
+
+class _ResponseReader:
+    """ Sequential file-like reader of the response body, for tarfile stream mode. It computes
+    the sha1 checksum of the read data and, optionally, saves it in a file too
+    """
+    def __init__(self, response, file_handler=None, progress=None):
+        self._chunks = iter(response.iter_content(1024 * 100))
+        self._buffer = bytearray()
+        self._file_handler = file_handler
+        self._progress = progress
+        self.sha1 = hashlib.sha1()
+        self.size = 0
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if not chunk:
+                if chunk is None:
+                    break
+                continue
+            self.sha1.update(chunk)
+            self.size += len(chunk)
+            if self._file_handler is not None:
+                self._file_handler.write(chunk)
+            if self._progress is not None:
+                self._progress(self.size)
+            self._buffer += chunk
+        if size < 0 or size >= len(self._buffer):
+            result = bytes(self._buffer)
+            self._buffer.clear()
+        else:
+            result = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        return result
+
+
+class _RangesNotSupported(ConanException):
+    """ the server answered a byte range request with the full file
+    """
 
 
 class FileDownloader:
+    # Each segment of a segmented download is retried independently these times
+    _SEGMENT_RETRIES = 3
 
-    def __init__(self, requester, scope=None, source_credentials=None):
+    def __init__(self, requester, scope=None, source_credentials=None, segments=None):
+        """ if segments is defined, the large files (> 10 MB) of servers that accept byte ranges
+        are downloaded as that number of concurrent ranges
+        """
         self._output = ConanOutput(scope=scope)
         self._requester = requester
         self._source_credentials = source_credentials
+        self._segments = segments
 
     def download(self, url, file_path, retry=2, retry_wait=0, verify_ssl=True, auth=None,
                  overwrite=False, headers=None, md5=None, sha1=None, sha256=None):
@@ -33,21 +84,8 @@ class FileDownloader:
                 raise ConanException("Error, the file to download already exists: '%s'" % file_path)
 
         try:
-            for counter in range(retry + 1):
-                try:
-                    self._download_file(url, auth, headers, file_path, verify_ssl)
-                    break
-                except (NotFoundException, ForbiddenException, AuthenticationException,
-                        RequestErrorException):
-                    raise
-                except ConanException as exc:
-                    if counter == retry:
-                        raise
-                    else:
-                        self._output.warning(exc, warn_tag="network")
-                        self._output.info(f"Waiting {retry_wait} seconds to retry...")
-                        time.sleep(retry_wait)
-
+            self._retry(lambda: self._download_file(url, auth, headers, file_path, verify_ssl),
+                        retry, retry_wait)
             self.check_checksum(file_path, md5, sha1, sha256)
             self._output.debug(f"Downloaded {file_path} from {url}")
         except Exception:
@@ -55,6 +93,44 @@ class FileDownloader:
                 os.remove(file_path)
             raise
 
+    def download_extract(self, url, dest_folder, retry=2, retry_wait=0, verify_ssl=True, auth=None,
+                         file_path=None, threads=None):
+        """ download a (compressed) tar archive, extracting it into dest_folder while it is being
+        downloaded, so the archive is never written to disk, unless a file_path is given, to
+        also save it there (e.g. the download cache). A failed attempt removes the dest_folder
+        before retrying, as the extraction cannot be resumed. The files are written by a pool of
+        "threads" if defined
+        """
+        assert os.path.isabs(dest_folder), "Target dest_folder must be absolute"
+
+        def _download():
+            try:
+                self._download_extract(url, auth, dest_folder, verify_ssl, file_path, threads)
+            except Exception:
+                rmdir(dest_folder)
+                if file_path is not None and os.path.exists(file_path):
+                    os.remove(file_path)
+                raise
+
+        self._retry(_download, retry, retry_wait)
+        self._output.debug(f"Downloaded and extracted {url} to {dest_folder}")
+
+    def _retry(self, download, retry, retry_wait):
+        for counter in range(retry + 1):
+            try:
+                download()
+                break
+            except (NotFoundException, ForbiddenException, AuthenticationException,
+                    RequestErrorException):
+                raise
+            except ConanException as exc:
+                if counter == retry:
+                    raise
+                else:
+                    self._output.warning(exc, warn_tag="network")
+                    self._output.info(f"Waiting {retry_wait} seconds to retry...")
+                    time.sleep(retry_wait)
+
     @staticmethod
     def check_checksum(file_path, md5, sha1, sha256):
         if md5 is not None:
@@ -64,14 +140,7 @@ class FileDownloader:
         if sha256 is not None:
             check_with_algorithm_sum("sha256", file_path, sha256)
 
-    def _download_file(self, url, auth, headers, file_path, verify_ssl, try_resume=False):
-        if try_resume and os.path.exists(file_path):
-            range_start = os.path.getsize(file_path)
-            headers = headers.copy() if headers else {}
-            headers["range"] = "bytes={}-".format(range_start)
-        else:
-            range_start = 0
-
+    def _get_response(self, url, auth, headers, verify_ssl):
         try:
             response = self._requester.get(url, stream=True, verify=verify_ssl, auth=auth,
                                            headers=headers,
@@ -90,6 +159,62 @@ class FileDownloader:
             elif response.status_code == 401:
                 raise AuthenticationException(response_to_str(response))
             raise ConanException("Error %d downloading file %s" % (response.status_code, url))
+        return response
+
+    def _download_extract(self, url, auth, dest_folder, verify_ssl, file_path, threads):
+        response = self._get_response(url, auth, None, verify_ssl)
+        try:
+            total_length = response.headers.get('Content-Length')
+            total_length = int(total_length) if total_length is not None else None
+            base_name = url.rsplit("/", 1)[-1]
+            is_large_file = total_length is not None and total_length > 10000000  # 10 MB
+            if is_large_file:
+                hs = human_size(total_length)
+                self._output.info(f"Downloading and extracting {hs} {base_name}")
+
+            def msg_format(msg, downloaded):
+                perc = int(downloaded * 100 / total_length)
+                return msg + f" {human_size(downloaded)} {perc}% {base_name}"
+            timed_output = TimedOutput(10, out=self._output, msg_format=msg_format)
+            progress = (lambda size: timed_output.info("Downloaded", size)) if is_large_file \
+                else None
+
+            mkdir(dest_folder)
+            file_handler = open(file_path, "wb") if file_path is not None else None
+            try:
+                reader = _ResponseReader(response, file_handler, progress)
+                tar_extract(reader, dest_folder, stream=True, threads=threads)
+                reader.read()  # The tar end-of-archive padding, to hash and save the full file
+            finally:
+                if file_handler is not None:
+                    file_handler.close()
+
+            gzip = (response.headers.get("content-encoding") == "gzip")
+            response.close()
+            # it seems that if gzip we don't know the size and shouldn't raise
+            if total_length is not None and reader.size != total_length and not gzip:
+                raise ConanException("Transfer interrupted before complete: %s < %s"
+                                     % (reader.size, total_length))
+            # The checksum header is not defined by all servers, it is verified if it is there
+            sha1 = response.headers.get("X-Checksum-Sha1")
+            if sha1 and not gzip and reader.sha1.hexdigest() != sha1:
+                raise ConanException(f"Corrupted download of {url}: sha1 checksum "
+                                     f"{reader.sha1.hexdigest()} != {sha1}")
+        except Exception as e:
+            # If this part failed, it means problems with the connection to server, or a
+            # truncated or corrupted archive, that will also be retried
+            raise ConanConnectionError("Download failed, check server, possibly try again\n%s"
+                                       % str(e))
+
+    def _download_file(self, url, auth, headers, file_path, verify_ssl, try_resume=False):
+        if try_resume and os.path.exists(file_path):
+            range_start = os.path.getsize(file_path)
+            headers = headers.copy() if headers else {}
+            headers["range"] = "bytes={}-".format(range_start)
+        else:
+            range_start = 0
+
+        response = self._get_response(url, auth, headers, verify_ssl)
 
         def get_total_length():
             if range_start:
@@ -108,6 +233,17 @@ class FileDownloader:
             is_large_file = total_length > 10000000  # 10 MB
             base_name = os.path.basename(file_path)
 
+            if (not range_start and is_large_file and self._segments and self._segments > 1
+                    and response.headers.get("Accept-Ranges") == "bytes"
+                    and response.headers.get("Content-Length")
+                    and response.headers.get("content-encoding") != "gzip"):
+                if self._download_segments(response, url, auth, headers, file_path, verify_ssl,
+                                           total_length):
+                    return
+                self._output.warning(f"The server doesn't serve the byte ranges of {url}, "
+                                     f"downloading it without segments", warn_tag="network")
+                response = self._get_response(url, auth, headers, verify_ssl)
+
             def msg_format(msg, downloaded):
                 perc = int(total_downloaded_size * 100 / total_length)
                 return msg + f" {human_size(downloaded)} {perc}% {base_name}"
@@ -142,3 +278,119 @@ class FileDownloader:
             # If this part failed, it means problems with the connection to server
             raise ConanConnectionError("Download failed, check server, possibly try again\n%s"
                                        % str(e))
+
+    def _download_segments(self, response, url, auth, headers, file_path, verify_ssl,
+                           total_length):
+        """ download the file as concurrent byte ranges written at their offset of the
+        preallocated file, the first one from the already open (full) response. The checksum is
+        verified once at the end, if the server provides it. Returns False, without raising, if
+        the server doesn't really serve the ranges, to download the file in a single stream
+        """
+        sha1 = response.headers.get("X-Checksum-Sha1")
+        segment_size = -(-total_length // self._segments)  # ceil division
+        ranges = [(start, min(start + segment_size, total_length) - 1)
+                  for start in range(0, total_length, segment_size)]
+        with open(file_path, "wb") as file_handler:
+            file_handler.truncate(total_length)
+
+        base_name = os.path.basename(file_path)
+        self._output.info(f"Downloading {human_size(total_length)} {base_name} in "
+                          f"{len(ranges)} segments")
+        lock = threading.Lock()
+        downloaded = [0]
+
+        def msg_format(msg, size):
+            return msg + f" {human_size(size)} {int(size * 100 / total_length)}% {base_name}"
+        timed_output = TimedOutput(10, out=self._output, msg_format=msg_format)
+
+        def progress(size):
+            with lock:
+                downloaded[0] += size
+                timed_output.info("Downloaded", downloaded[0])
+
+        stop = threading.Event()  # Cancels the other segments, the download already failed
+
+        def segment(index):
+            start, end = ranges[index]
+            try:
+                self._download_segment(url, auth, headers, file_path, verify_ssl, start, end,
+                                       progress, stop, response if index == 0 else None)
+            except BaseException:
+                stop.set()
+                raise
+
+        pool = ThreadPool(len(ranges))
+        try:
+            pool.map(segment, range(len(ranges)))
+        except _RangesNotSupported:
+            return False
+        finally:
+            response.close()
+            pool.close()
+            pool.join()
+
+        # The checksum header is not defined by all servers, it is verified if it is there
+        if sha1:
+            check_with_algorithm_sum("sha1", file_path, sha1)
+        return True
+
+    def _download_segment(self, url, auth, headers, file_path, verify_ssl, start, end, progress,
+                          stop, response=None):
+        """ download the [start, end] byte range into its offset of file_path, the first
+        attempt from the given full file response, if any. A failed request is retried with
+        exponential backoff, resuming from the bytes already written. A server answering the
+        range request with the full file raises _RangesNotSupported, that is not retried
+        """
+        position = start
+        for counter in range(self._SEGMENT_RETRIES + 1):
+            if stop.is_set():
+                return
+            try:
+                if response is None:
+                    segment_headers = headers.copy() if headers else {}
+                    segment_headers["range"] = f"bytes={position}-{end}"
+                    response = self._get_response(url, auth, segment_headers, verify_ssl)
+                    if response.status_code != 206:
+                        response.close()
+                        raise _RangesNotSupported(f"Error in segmented download from {url}\n"
+                                                  f"Byte range not served: "
+                                                  f"{response.status_code}")
+                    content_range = response.headers.get("Content-Range", "")
+                    match = re.match(r"^bytes (\d+)-(\d+)/(\d+)", content_range)
+                    if not match or int(match.group(1)) != position or int(match.group(2)) != end:
+                        response.close()
+                        raise ConanException(f"Error in segmented download from {url}\n"
+                                             f"Incorrect Content-Range header {content_range}")
+                try:
+                    with open(file_path, "r+b") as file_handler:
+                        file_handler.seek(position)
+                        for chunk in response.iter_content(1024 * 100):
+                            if stop.is_set():
+                                return
+                            chunk = chunk[:end + 1 - position]
+                            file_handler.write(chunk)
+                            position += len(chunk)
+                            progress(len(chunk))
+                            if position > end:
+                                break
+                except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError,
+                        OSError) as exc:
+                    # The connection broken in the middle, it is resumed from the position
+                    raise ConanException(f"Error in segmented download from {url}\n{exc}")
+                finally:
+                    response.close()
+                    response = None
+                if position <= end:
+                    raise ConanException(f"Transfer of segment interrupted before complete: "
+                                         f"{position - start} < {end + 1 - start}")
+                return
+            except (NotFoundException, ForbiddenException, AuthenticationException,
+                    RequestErrorException, _RangesNotSupported):
+                raise
+            except ConanException as exc:
+                if counter == self._SEGMENT_RETRIES:
+                    raise
+                wait = 0.5 * 2 ** counter
+                self._output.warning(f"{exc}\nRetrying segment in {wait} seconds",
+                                     warn_tag="network")
+                time.sleep(wait)
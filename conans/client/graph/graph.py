@@ -1,4 +1,4 @@
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 
 from conans.client.graph.graph_error import GraphError
 from conans.model.package_ref import PkgReference
@@ -41,11 +41,29 @@ class TransitiveRequirement:
         return "Require: {}, Node: {}".format(repr(self.require), repr(self.node))
 
 
+class TransitiveIndex:
+    """ Graph-global index of the names of the nodes references and of the requirements defined
+    in the nodes "transitive_deps". A require whose name is not in the index cannot be found by
+    Node.check_downstream_exists(), which is the case of every package the first time it
+    appears in the graph, so the recursive walk of the dependants can be skipped.
+    Entries are only added, never removed, so the index can be a superset, never a subset
+    """
+    def __init__(self):
+        self._names = defaultdict(int)
+
+    def add(self, name):
+        self._names[name] += 1
+
+    def count(self, name):
+        return self._names.get(name, 0)
+
+
 class Node(object):
     def __init__(self, ref, conanfile, context, recipe=None, path=None, test=False):
         self.ref = ref
         self.path = path  # path to the consumer conanfile.xx for consumer, None otherwise
         self._package_id = None
+        self._graph = None  # DepsGraph containing this node, its levels depend on the package_id
         self.prev = None
         self.pref_timestamp = None
         if conanfile is not None:
@@ -61,6 +79,7 @@ class Node(object):
 
         # real graph model
         self.transitive_deps = OrderedDict()  # of _TransitiveRequirement
+        self.transitive_index = None  # TransitiveIndex of the graph, assigned by DepsGraph
         self.dependencies = []  # Ordered Edges
         self.dependants = []  # Edges
         self.error = None
@@ -76,6 +95,13 @@ class Node(object):
         # TODO: Remove this order, shouldn't be necessary
         return (str(self.ref), self._package_id) < (str(other.ref), other._package_id)
 
+    def add_transitive_require(self, require):
+        """ define the node own "require", still not expanded, in its transitive_deps
+        """
+        if self.transitive_index is not None and require not in self.transitive_deps:
+            self.transitive_index.add(require.ref.name)
+        self.transitive_deps[require] = TransitiveRequirement(require, node=None)
+
     def propagate_closing_loop(self, require, prev_node):
         self.propagate_downstream(require, prev_node)
         # List to avoid mutating the dict
@@ -104,6 +130,8 @@ class Node(object):
                 existing.require.override_ref = require.ref
 
         assert not require.version_range  # No ranges slip into transitive_deps definitions
+        if existing is None and self.transitive_index is not None:
+            self.transitive_index.add(require.ref.name)
         # TODO: Might need to move to an update() for performance
         self.transitive_deps.pop(require, None)
         self.transitive_deps[require] = TransitiveRequirement(require, node)
@@ -129,6 +157,18 @@ class Node(object):
         return d.src.propagate_downstream(down_require, node)
 
     def check_downstream_exists(self, require):
+        index = self.transitive_index
+        if index is not None:
+            # The own not expanded "require" is in the index, but it cannot produce a result
+            count = index.count(require.ref.name)
+            own = self.transitive_deps.get(require)
+            if own is not None and own.require is require and own.node is None:
+                count -= 1
+            if count <= 0:
+                return None
+        return self._check_downstream_exists(require)
+
+    def _check_downstream_exists(self, require):
         # First, a check against self, could be a loop-conflict
         # This is equivalent as the Requirement hash and eq methods
         # TODO: Make self.ref always exist, but with name=None if name not defined
@@ -165,7 +205,6 @@ class Node(object):
         assert len(self.dependants) == 1
         dependant = self.dependants[0]
 
-        # TODO: Implement an optimization where the requires is checked against a graph global
         # print("    Lets check_downstream one more")
         down_require = dependant.require.transform_downstream(self.conanfile.package_type,
                                                               require, None)
@@ -176,7 +215,7 @@ class Node(object):
 
         down_require.defining_require = require.defining_require
         source_node = dependant.src
-        return source_node.check_downstream_exists(down_require) or result
+        return source_node._check_downstream_exists(down_require) or result
 
     def check_loops(self, new_node, count=0):
         if self.ref == new_node.ref and self.context == new_node.context:
@@ -198,6 +237,8 @@ class Node(object):
     def package_id(self, pkg_id):
         assert self._package_id is None, "Trying to override an existing package_id"
         self._package_id = pkg_id
+        if self._graph is not None:
+            self._graph.invalidate_levels()
 
     @property
     def name(self):
@@ -340,6 +381,12 @@ class DepsGraph(object):
         self.replaced_requires = {}
         self.options_conflicts = {}
         self.error = False
+        # Binaries being downloaded in the background while the graph was analyzed
+        self.prefetched_binaries = None  # BinariesPrefetch
+        # Cache of by_levels(), invalidated when nodes or edges are added, or a package_id is
+        # assigned, as the nodes in every level are sorted by it
+        self._levels = None
+        self.transitive_index = TransitiveIndex()
 
     def overrides(self):
         return Overrides.create(self.nodes)
@@ -353,12 +400,21 @@ class DepsGraph(object):
 
     def add_node(self, node):
         self.nodes.append(node)
+        node._graph = self
+        self._levels = None
+        index = self.transitive_index
+        node.transitive_index = index
+        if node.ref is not None:
+            index.add(node.ref.name)
+        for require in node.transitive_deps:
+            index.add(require.ref.name)
 
     def add_edge(self, src, dst, require):
         assert src in self.nodes and dst in self.nodes
         edge = Edge(src, dst, require)
         src.add_edge(edge)
         dst.add_edge(edge)
+        self._levels = None
 
     def ordered_iterate(self):
         ordered = self.by_levels()
@@ -371,25 +427,33 @@ class DepsGraph(object):
         dependencies. Second level will be with nodes that only have dependencies to
         first level nodes, and so on
         return [[node1, node34], [node3], [node23, node8],...]
+        The result is cached until the graph changes, it must not be modified
         """
-        result = []
-        # We make it a dict to preserve insertion order and be deterministic, s
-        # sets are not deterministic order. dict is fast for look up operations
-        opened = dict.fromkeys(self.nodes)
-        while opened:
-            current_level = []
-            for o in opened:
-                o_neighs = o.neighbors()
-                if not any(n in opened for n in o_neighs):
-                    current_level.append(o)
+        if self._levels is None:
+            self._levels = self._compute_levels()
+        return self._levels
+
+    def invalidate_levels(self):
+        self._levels = None
 
+    def _compute_levels(self):
+        # Kahn's algorithm, every level is computed from the dependants of the previous one
+        position = {n: i for i, n in enumerate(self.nodes)}
+        pending = {n: len(set(n.neighbors())) for n in self.nodes}
+        result = []
+        current_level = [n for n in self.nodes if not pending[n]]
+        while current_level:
             # TODO: SORTING seems only necessary for test order
             current_level.sort()
             result.append(current_level)
-            # now start new level, removing the current level items
-            for item in current_level:
-                opened.pop(item)
-
+            next_level = []
+            for node in current_level:
+                for dependant in set(node.inverse_neighbors()):
+                    pending[dependant] -= 1
+                    if not pending[dependant]:
+                        next_level.append(dependant)
+            # To be deterministic, ties in the sorting keep the order of the nodes in the graph
+            current_level = sorted(next_level, key=lambda n: position[n])
         return result
 
     def build_time_nodes(self):
@@ -1,6 +1,8 @@
 import json
 import os
+import threading
 from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
 
 from conan.api.output import ConanOutput
 from conan.internal.cache.home_paths import HomePaths
@@ -14,13 +16,62 @@ from conans.client.graph.graph import (BINARY_BUILD, BINARY_CACHE, BINARY_DOWNLO
                                        BINARY_PLATFORM)
 from conans.client.graph.proxy import should_update_reference
 from conans.errors import NoRemoteAvailable, NotFoundException, \
-    PackageNotFoundException, conanfile_exception_formatter, ConanConnectionError, ConanException
+    PackageNotFoundException, conanfile_exception_formatter, ConanConnectionError, ConanException, \
+    ForbiddenException, AuthenticationException
 from conans.model.info import RequirementInfo, RequirementsInfo
 from conans.model.package_ref import PkgReference
-from conans.model.recipe_ref import RecipeReference
+from conans.model.recipe_ref import RecipeReference, ref_matches
 from conans.util.files import load
 
 
+class BinariesPrefetch:
+    """ Downloads in background threads the binaries of the graph that will be installed, while
+    the rest of the graph is still analyzed. The installer waits for them with get(), and the
+    ones that are not needed in the end are completed with wait(), or discarded with cancel() if
+    the installation fails, so they are never left half-downloaded in the cache
+    """
+
+    def __init__(self, remote_manager, parallel):
+        self._remote_manager = remote_manager
+        self._thread_pool = ThreadPool(parallel)
+        self._cancelled = threading.Event()
+        self._downloads = {}  # {pref: AsyncResult}
+
+    def start(self, pref, remote):
+        if pref not in self._downloads:
+            self._downloads[pref] = self._thread_pool.apply_async(self._download, (pref, remote))
+
+    def _download(self, pref, remote):
+        if self._cancelled.is_set():
+            raise ConanException(f"Download of {pref.repr_notime()} cancelled")
+        self._remote_manager.get_package(pref, remote)
+
+    def get(self, pref):
+        """ waits for the binary, returns False if it was not prefetched or its download failed,
+        so the caller downloads it as usual
+        """
+        download = self._downloads.get(pref)
+        if download is None:
+            return False
+        try:
+            download.get()
+            return True
+        except Exception:
+            return False
+
+    def wait(self):
+        """ waits for all the downloads, also the ones not used by the installer
+        """
+        self._thread_pool.close()
+        self._thread_pool.join()
+
+    def cancel(self):
+        """ the downloads not started yet are discarded, and the ones in progress are waited for
+        """
+        self._cancelled.set()
+        self.wait()
+
+
 class GraphBinariesAnalyzer:
 
     def __init__(self, conan_app, global_conf):
@@ -30,6 +81,10 @@ class GraphBinariesAnalyzer:
         self._remote_manager = conan_app.remote_manager
         # These are the nodes with pref (not including PREV) that have been evaluated
         self._evaluated = {}  # {pref: [nodes]}
+        # Latest package revisions obtained in bulk from the remotes, None if not in the remote
+        self._remote_prefs = {}  # {(pref, remote_name): latest_pref}
+        self._prefetch_parallel = global_conf.get("core.download:prefetch_parallel",
+                                                  check_type=int)
         compat_folder = HomePaths(conan_app.cache_folder).compatibility_plugin_path
         self._compatibility = BinaryCompatibility(compat_folder)
         unknown_mode = global_conf.get("core.package_id:default_unknown_mode", default="semver_mode")
@@ -74,8 +129,13 @@ class GraphBinariesAnalyzer:
         pref = node.pref
         for r in remotes:
             try:
-                info = node.conanfile.info
-                latest_pref = self._remote_manager.get_latest_package_reference(pref, r, info)
+                if (pref, r.name) in self._remote_prefs:
+                    latest_pref = self._remote_prefs[(pref, r.name)]
+                    if latest_pref is None:
+                        raise PackageNotFoundException(pref)
+                else:
+                    info = node.conanfile.info
+                    latest_pref = self._remote_manager.get_latest_package_reference(pref, r, info)
                 results.append({'pref': latest_pref, 'remote': r})
                 if len(results) > 0 and not should_update_reference(node.ref, update):
                     break
@@ -99,6 +159,31 @@ class GraphBinariesAnalyzer:
             node.prev = None
             raise PackageNotFoundException(pref)
 
+    def _get_packages_from_remotes(self, nodes, remotes, update):
+        """ Obtain in bulk, one request per remote, the latest package revisions of the nodes
+        that are not in the cache (or all of them if updating), so the later evaluation of
+        every node doesn't need to query the servers one by one
+        """
+        nodes = {n.pref: n for n in nodes}  # Only the first node of each pref is evaluated
+        prefs = [pref for pref, n in nodes.items()
+                 if should_update_reference(n.ref, update)
+                 or self._cache.get_latest_package_reference(pref) is None]
+        for r in remotes:
+            if not prefs:
+                break
+            try:
+                infos = {pref: nodes[pref].conanfile.info for pref in prefs}
+                found = self._remote_manager.get_latest_package_references(prefs, r, infos)
+            except (ConanConnectionError, ForbiddenException, AuthenticationException):
+                # A single unauthorized pref fails the whole request, the individual checks of
+                # every binary will report the error of the ones that actually fail
+                return
+            for pref in prefs:
+                self._remote_prefs[(pref, r.name)] = found.get(pref)
+            # Same as _get_package_from_remotes(), stop at the first remote that contains it
+            prefs = [pref for pref in prefs
+                     if pref not in found or should_update_reference(nodes[pref].ref, update)]
+
     def _evaluate_is_cached(self, node):
         """ Each pref has to be evaluated just once, and the action for all of them should be
         exactly the same
@@ -405,7 +490,7 @@ class GraphBinariesAnalyzer:
                 conanfile.layout()
 
     def evaluate_graph(self, deps_graph, build_mode, lockfile, remotes, update, build_mode_test=None,
-                       tested_graph=None):
+                       tested_graph=None, prefetch_binaries=False):
         if tested_graph is None:
             main_mode = BuildMode(build_mode)
             test_mode = None  # Should not be used at all
@@ -430,38 +515,78 @@ class GraphBinariesAnalyzer:
                     return
             self._evaluate_node(n, mode, remotes, update)
 
+        def _needs_remote_check(n):
+            # Not exhaustive, a node not checked here will be checked individually later
+            if n.recipe in (RECIPE_EDITABLE, RECIPE_PLATFORM) or n.conanfile.info.invalid:
+                return False
+            if n.conanfile.upload_policy == "skip" or n.pref in self._evaluated:
+                return False
+            if lockfile and lockfile.resolve_prev(n):
+                return False
+            mode = main_mode if mainprefs is None or str(n.pref) in mainprefs else test_mode
+            return not any(ref_matches(n.ref, p, is_consumer=n.conanfile._conan_is_consumer)
+                           for p in mode.patterns)
+
         levels = deps_graph.by_levels()
         config_version = self._config_version()
-        for level in levels[:-1]:  # all levels but the last one, which is the single consumer
-            for node in level:
-                self._evaluate_package_id(node, config_version)
-            # group by pref to paralelize, so evaluation is done only 1 per pref
-            nodes = {}
-            for node in level:
-                nodes.setdefault(node.pref, []).append(node)
-            # PARALLEL, this is the slow part that can query servers for packages, and compatibility
-            for pref, pref_nodes in nodes.items():
-                _evaluate_single(pref_nodes[0])
-            # END OF PARALLEL
-            # Evaluate the possible nodes with repeated "prefs" that haven't been evaluated
-            for pref, pref_nodes in nodes.items():
-                for n in pref_nodes[1:]:
-                    _evaluate_single(n)
-
-        # Last level is always necessarily a consumer or a virtual
-        assert len(levels[-1]) == 1
-        node = levels[-1][0]
-        assert node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL)
-        if node.path is not None:
-            if node.path.endswith(".py"):
-                # For .py we keep evaluating the package_id, validate(), etc
-                compute_package_id(node, self._modes, config_version=config_version)
-            # To support the ``[layout]`` in conanfile.txt
-            if hasattr(node.conanfile, "layout"):
-                with conanfile_exception_formatter(node.conanfile, "layout"):
-                    node.conanfile.layout()
-
-        self._skip_binaries(deps_graph)
+        prefetch = None
+        if prefetch_binaries and self._prefetch_parallel:
+            prefetch = BinariesPrefetch(self._remote_manager, self._prefetch_parallel)
+        try:
+            for level in levels[:-1]:  # all levels but the last one, which is the single consumer
+                for node in level:
+                    self._evaluate_package_id(node, config_version)
+                # group by pref to paralelize, so evaluation is done only 1 per pref
+                nodes = {}
+                for node in level:
+                    nodes.setdefault(node.pref, []).append(node)
+                if remotes:
+                    self._get_packages_from_remotes([pref_nodes[0] for pref_nodes in nodes.values()
+                                                     if _needs_remote_check(pref_nodes[0])],
+                                                    remotes, update)
+                # PARALLEL, this is the slow part that can query servers for packages, and
+                # compatibility
+                for pref, pref_nodes in nodes.items():
+                    _evaluate_single(pref_nodes[0])
+                # END OF PARALLEL
+                # Evaluate the possible nodes with repeated "prefs" that haven't been evaluated
+                for pref, pref_nodes in nodes.items():
+                    for n in pref_nodes[1:]:
+                        _evaluate_single(n)
+                self._prefetch_binaries(level, prefetch)
+
+            # Last level is always necessarily a consumer or a virtual
+            assert len(levels[-1]) == 1
+            node = levels[-1][0]
+            assert node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL)
+            if node.path is not None:
+                if node.path.endswith(".py"):
+                    # For .py we keep evaluating the package_id, validate(), etc
+                    compute_package_id(node, self._modes, config_version=config_version)
+                # To support the ``[layout]`` in conanfile.txt
+                if hasattr(node.conanfile, "layout"):
+                    with conanfile_exception_formatter(node.conanfile, "layout"):
+                        node.conanfile.layout()
+
+            self._skip_binaries(deps_graph)
+        except BaseException:
+            if prefetch is not None:
+                prefetch.cancel()
+            raise
+        # The installer waits for the prefetched binaries
+        deps_graph.prefetched_binaries = prefetch
+
+    @staticmethod
+    def _prefetch_binaries(level, prefetch):
+        """ Start downloading in background threads the binaries of the level that will be
+        downloaded, so the transfers overlap with the analysis of the rest of the graph. It is
+        speculative, some of them might end being skipped later by _skip_binaries()
+        """
+        if prefetch is None:
+            return
+        for node in level:
+            if node.binary in (BINARY_DOWNLOAD, BINARY_UPDATE):
+                prefetch.start(node.pref, node.binary_remote)
 
     @staticmethod
     def _skip_binaries(graph):
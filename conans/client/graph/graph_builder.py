@@ -1,11 +1,12 @@
 import copy
 
 from collections import deque
+from multiprocessing.pool import ThreadPool
 
 from conan.internal.cache.conan_reference_layout import BasicLayout
 from conans.client.conanfile.configure import run_configure_method
 from conans.client.graph.graph import DepsGraph, Node, CONTEXT_HOST, \
-    CONTEXT_BUILD, TransitiveRequirement, RECIPE_VIRTUAL, RECIPE_EDITABLE
+    CONTEXT_BUILD, RECIPE_VIRTUAL, RECIPE_EDITABLE
 from conans.client.graph.graph import RECIPE_PLATFORM
 from conans.client.graph.graph_error import GraphLoopError, GraphConflictError, GraphMissingError, \
     GraphRuntimeError, GraphError
@@ -30,6 +31,7 @@ class DepsGraphBuilder(object):
         self._update = update
         self._check_update = check_update
         self._resolve_prereleases = global_conf.get('core.version_ranges:resolve_prereleases')
+        self._prefetch_parallel = global_conf.get("core.graph:prefetch_parallel", check_type=int)
 
     def load_graph(self, root_node, profile_host, profile_build, graph_lock=None):
         assert profile_host is not None
@@ -43,8 +45,10 @@ class DepsGraphBuilder(object):
         self._initialize_requires(root_node, dep_graph, graph_lock, profile_build, profile_host)
         dep_graph.add_node(root_node)
 
+        thread_pool = ThreadPool(self._prefetch_parallel) if self._prefetch_parallel else None
         open_requires = deque((r, root_node) for r in root_node.conanfile.requires.values())
         try:
+            self._prefetch_requires(root_node, thread_pool, graph_lock, profile_host, profile_build)
             while open_requires:
                 # Fetch the first waiting to be expanded (depth-first)
                 (require, node) = open_requires.popleft()
@@ -58,15 +62,56 @@ class DepsGraphBuilder(object):
                                                              choices=("build",))):
                     self._initialize_requires(new_node, dep_graph, graph_lock, profile_build,
                                               profile_host)
+                    self._prefetch_requires(new_node, thread_pool, graph_lock, profile_host,
+                                            profile_build)
                     open_requires.extendleft((r, new_node)
                                              for r in reversed(new_node.conanfile.requires.values()))
             self._remove_overrides(dep_graph)
             check_graph_provides(dep_graph)
         except GraphError as e:
             dep_graph.error = e
+        finally:
+            if thread_pool is not None:
+                thread_pool.close()
+                thread_pool.join()
+            self._cache.flush_lru()
         dep_graph.resolved_ranges = self._resolver.resolved_ranges
         return dep_graph
 
+    def _prefetch_requires(self, node, thread_pool, graph_lock, profile_host, profile_build):
+        """ Start resolving in background threads the recipes of the pinned requires of the node,
+        so they are already in the cache when the depth-first expansion reaches them. The
+        expansion order is not changed, only the remote round-trips are overlapped.
+        Version ranges, overrides, "host_version" and platform requires are not prefetched, as
+        they can only be resolved in the expansion itself. Neither are the requires already
+        defined downstream (overridden, forced or joining an existing node), the expansion uses
+        the downstream ones.
+        """
+        if thread_pool is None or not self._remotes:
+            return
+        for require in node.conanfile.requires.values():
+            if require.override or require.version_range is not None:
+                continue
+            if node.check_downstream_exists(require) is not None:
+                continue
+            if str(require.ref.version).startswith("<"):
+                continue
+            profile = profile_build if node.context == CONTEXT_BUILD else profile_host
+            platform = profile.platform_tool_requires + profile.platform_requires
+            if any(require.ref.name == p.name for p in platform):
+                continue
+            ref = require.ref
+            if graph_lock is not None:
+                # Resolve the locked revision without modifying the real requirement
+                locked_require = Requirement(ref.copy(), build=require.build)
+                try:
+                    graph_lock.resolve_locked(node, locked_require, self._resolve_prereleases)
+                except ConanException:
+                    continue
+                ref = locked_require.ref
+            self._proxy.prefetch_recipe(ref, self._remotes, self._update, self._check_update,
+                                        thread_pool)
+
     def _expand_require(self, require, node, graph, profile_host, profile_build, graph_lock):
         # Handle a requirement of a node. There are 2 possibilities
         #    node -(require)-> new_node (creates a new node in the graph)
@@ -204,7 +249,7 @@ class DepsGraphBuilder(object):
             self._resolve_replace_requires(node, require, profile_build, profile_host, graph)
             if graph_lock:
                 graph_lock.resolve_overrides(require)
-            node.transitive_deps[require] = TransitiveRequirement(require, node=None)
+            node.add_transitive_require(require)
 
     def _resolve_alias(self, node, require, alias, graph):
         # First try cached
@@ -1,6 +1,7 @@
 import json
 import os
 import textwrap
+from collections import defaultdict
 
 from conan.api.output import ConanOutput
 from conans.client.graph.graph import RECIPE_CONSUMER, RECIPE_VIRTUAL, BINARY_SKIP, \
@@ -11,6 +12,40 @@ from conans.model.recipe_ref import RecipeReference
 from conans.util.files import load
 
 
+def _topological_levels(nodes):
+    """ Kahn's algorithm by levels, linear in the number of nodes and dependencies. Every level
+    contains the nodes whose dependencies are all in previous levels, keeping the order of the
+    input "nodes" {key: node}, where node.depends are the keys of its dependencies.
+    Returns the levels and the {key: node} that cannot be ordered because of a loop
+    """
+    keys = list(nodes)
+    index = {k: i for i, k in enumerate(keys)}
+    pending = []  # Number of dependencies of every node not yet in a level
+    consumers = defaultdict(list)
+    for i, node in enumerate(nodes.values()):
+        depends = {index[d] for d in node.depends if d in index}
+        pending.append(len(depends))
+        for d in depends:
+            consumers[d].append(i)
+
+    levels = []
+    current_level = [i for i, p in enumerate(pending) if not p]
+    while current_level:
+        levels.append(current_level)
+        next_level = []
+        for i in current_level:
+            for c in consumers[i]:
+                pending[c] -= 1
+                if not pending[c]:
+                    next_level.append(c)
+        current_level = sorted(next_level)
+
+    values = list(nodes.values())
+    levels = [[values[i] for i in level] for level in levels]
+    loop = {keys[i]: values[i] for i, p in enumerate(pending) if p}
+    return levels, loop
+
+
 class _InstallPackageReference:
     """ Represents a single, unique PackageReference to be downloaded, built, etc.
     Same PREF should only be built or downloaded once, but it is possible to have multiple
@@ -169,24 +204,8 @@ class _InstallRecipeReference:
                     self.depends.append(dep.dst.ref)
 
     def _install_order(self):
-        # TODO: Repeated, refactor
         # a topological order by levels, returns a list of list, in order of processing
-        levels = []
-        opened = self.packages
-        while opened:
-            current_level = []
-            closed = []
-            for o in opened.values():
-                requires = o.depends
-                if not any(n in opened for n in requires):
-                    current_level.append(o)
-                    closed.append(o)
-
-            if current_level:
-                levels.append(current_level)
-            # now initialize new level
-            opened = {k: v for k, v in opened.items() if v not in closed}
-
+        levels, _ = _topological_levels(self.packages)
         return levels
 
     def serialize(self):
@@ -398,41 +417,37 @@ class InstallGraph:
                 existing.add(node)
 
     def reduce(self):
+        # The nodes that depend on every key, to not iterate all the nodes for every removal
+        consumers = defaultdict(list)
+        for n in self._nodes.values():
+            for d in n.depends:
+                consumers[d].append(n)
         result = {}
         for k, node in self._nodes.items():
             if node.need_build:
                 result[k] = node
             else:  # Eliminate this element from the graph
                 dependencies = node.depends
-                # Find all consumers
-                for n in self._nodes.values():
-                    if k in n.depends:
-                        n.depends = [d for d in n.depends if d != k]  # Discard the removed node
-                        # Add new edges, without repetition
-                        n.depends.extend(d for d in dependencies if d not in n.depends)
+                # All consumers, get the dependencies of the removed node
+                for n in consumers.pop(k, []):
+                    if k not in n.depends:  # Already seen, a consumer can be listed twice
+                        continue
+                    depends = [d for d in n.depends if d != k]  # Discard the removed node
+                    existing = set(depends)
+                    for d in dependencies:  # Add new edges, without repetition
+                        if d not in existing:
+                            existing.add(d)
+                            depends.append(d)
+                            consumers[d].append(n)
+                    n.depends = depends
         self._nodes = result
         self.reduced = True
 
     def install_order(self, flat=False):
         # a topological order by levels, returns a list of list, in order of processing
-        levels = []
-        opened = self._nodes
-        while opened:
-            current_level = []
-            closed = []
-            for o in opened.values():
-                requires = o.depends
-                if not any(n in opened for n in requires):
-                    current_level.append(o)
-                    closed.append(o)
-
-            if current_level:
-                levels.append(current_level)
-            else:
-                self._raise_loop_detected(opened)
-
-            # now initialize new level
-            opened = {k: v for k, v in opened.items() if v not in closed}
+        levels, loop = _topological_levels(self._nodes)
+        if loop:
+            self._raise_loop_detected(loop)
         if flat:
             return [r for level in levels for r in level]
         return levels
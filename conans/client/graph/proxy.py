@@ -1,3 +1,5 @@
+from multiprocessing.pool import AsyncResult
+
 from conan.api.output import ConanOutput
 from conan.internal.cache.conan_reference_layout import BasicLayout
 from conans.client.graph.graph import (RECIPE_DOWNLOADED, RECIPE_INCACHE, RECIPE_NEWER,
@@ -24,8 +26,42 @@ class ConanProxy:
         if resolved is None:
             resolved = self._get_recipe(ref, remotes, update, check_update)
             self._resolved[ref] = resolved
+        elif isinstance(resolved, AsyncResult):  # It was prefetched in a background thread
+            try:
+                resolved = resolved.get()
+            except Exception:
+                # Failures are not cached, same as the non-prefetched path
+                self._resolved.pop(ref)
+                raise
+            self._resolved[ref] = resolved
         return resolved
 
+    def prefetch_recipe(self, ref, remotes, update, check_update, thread_pool):
+        """ starts resolving (and downloading if necessary) the recipe in the given thread pool,
+        so a later get_recipe() call only needs to wait for it
+        """
+        if ref in self._resolved:
+            return
+        ref = ref.copy()
+        self._resolved[ref] = thread_pool.apply_async(self._get_recipe,
+                                                      (ref, remotes, update, check_update))
+
+    def prefetched_downloads(self, name):
+        """ the references of the recipes with the given name that have been downloaded to the
+        cache by prefetch_recipe(), but not yet requested with get_recipe()
+        """
+        result = []
+        for ref, resolved in list(self._resolved.items()):
+            if ref.name != name or not isinstance(resolved, AsyncResult):
+                continue
+            try:
+                layout, status, _ = resolved.get()
+            except Exception:
+                continue
+            if status in (RECIPE_DOWNLOADED, RECIPE_UPDATED):
+                result.append(layout.reference)
+        return result
+
     # return the remote where the recipe was found or None if the recipe was not found
     def _get_recipe(self, reference, remotes, update, check_update):
         output = ConanOutput(scope=str(reference))
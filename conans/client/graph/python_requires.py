@@ -67,6 +67,7 @@ class PyRequires(object):
 class PyRequireLoader(object):
     def __init__(self, conan_app, global_conf):
         self._proxy = conan_app.proxy
+        self._cache = conan_app.cache
         self._range_resolver = conan_app.range_resolver
         self._cached_py_requires = {}
         self._resolve_prereleases = global_conf.get("core.version_ranges:resolve_prereleases")
@@ -124,6 +125,8 @@ class PyRequireLoader(object):
             recipe = self._proxy.get_recipe(ref, remotes, update, check_update)
         except ConanException as e:
             raise ConanException(f"Cannot resolve python_requires '{ref}': {str(e)}")
+        # Not only loaded in graph expansions, that flush the LRUs at the end
+        self._cache.flush_lru()
         layout, recipe_status, remote = recipe
         path = layout.conanfile()
         new_ref = layout.reference
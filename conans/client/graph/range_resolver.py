@@ -1,4 +1,5 @@
 from conans.client.graph.proxy import should_update_reference
+from conans.client.remote_search_cache import RemoteSearchCache
 from conans.errors import ConanException
 from conans.model.recipe_ref import RecipeReference
 from conans.model.version_range import VersionRange
@@ -10,8 +11,11 @@ class RangeResolver:
         self._cache = conan_app.cache
         self._editable_packages = editable_packages
         self._remote_manager = conan_app.remote_manager
+        self._proxy = conan_app.proxy
         self._cached_cache = {}  # Cache caching of search result, so invariant wrt installations
         self._cached_remote_found = {}  # dict {ref (pkg/*): {remote_name: results (pkg/1, pkg/2)}}
+        ttl = global_conf.get("core.version_ranges:remote_search_ttl", check_type=int)
+        self._remote_search_cache = RemoteSearchCache(conan_app.cache_folder, ttl)
         self.resolved_ranges = {}
         self._resolve_prereleases = global_conf.get('core.version_ranges:resolve_prereleases')
 
@@ -60,6 +64,11 @@ class RangeResolver:
             # TODO: This is still necessary to filter user/channel, until search_recipes is fixed
             local_found = [ref for ref in local_found if ref.user == search_ref.user
                            and ref.channel == search_ref.channel]
+            # Recipes brought to the cache by the prefetch before the expansion reached them
+            # must be ignored, so the resolution is the same as without prefetching
+            prefetched = self._proxy.prefetched_downloads(search_ref.name)
+            if prefetched:
+                local_found = [ref for ref in local_found if ref not in prefetched]
             local_found.extend(r for r in self._editable_packages.edited_refs
                                if r.name == search_ref.name and r.user == search_ref.user
                                and r.channel == search_ref.channel)
@@ -67,7 +76,7 @@ class RangeResolver:
         if local_found:
             return self._resolve_version(version_range, local_found, self._resolve_prereleases)
 
-    def _search_remote_recipes(self, remote, search_ref):
+    def _search_remote_recipes(self, remote, search_ref, update):
         if remote.allowed_packages and not any(search_ref.matches(f, is_consumer=False)
                                                for f in remote.allowed_packages):
             return []
@@ -75,17 +84,22 @@ class RangeResolver:
         pattern_cached = self._cached_remote_found.setdefault(pattern, {})
         results = pattern_cached.get(remote.name)
         if results is None:
-            results = self._remote_manager.search_recipes(remote, pattern)
-            # TODO: This is still necessary to filter user/channel, until search_recipes is fixed
-            results = [ref for ref in results if ref.user == search_ref.user
-                       and ref.channel == search_ref.channel]
+            # The persistent results from previous processes are not used with --update
+            if not should_update_reference(search_ref, update):
+                results = self._remote_search_cache.get(remote, pattern)
+            if results is None:
+                results = self._remote_manager.search_recipes(remote, pattern)
+                # TODO: This is still necessary to filter user/channel, until search_recipes is fixed
+                results = [ref for ref in results if ref.user == search_ref.user
+                           and ref.channel == search_ref.channel]
+                self._remote_search_cache.store(remote, pattern, results)
             pattern_cached.update({remote.name: results})
         return results
 
     def _resolve_remote(self, search_ref, version_range, remotes, update):
         update_candidates = []
         for remote in remotes:
-            remote_results = self._search_remote_recipes(remote, search_ref)
+            remote_results = self._search_remote_recipes(remote, search_ref, update)
             resolved_version = self._resolve_version(version_range, remote_results,
                                                      self._resolve_prereleases)
             if resolved_version:
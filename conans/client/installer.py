@@ -1,6 +1,8 @@
 import os
 import shutil
+import threading
 from multiprocessing.pool import ThreadPool
+from queue import Queue
 
 from conan.api.output import ConanOutput
 from conans.client.conanfile.build import run_build_method
@@ -15,6 +17,7 @@ from conans.model.build_info import CppInfo, MockInfoProperty
 from conans.model.package_ref import PkgReference
 from conan.internal.paths import CONANINFO
 from conans.util.files import clean_dirty, is_dirty, mkdir, rmdir, save, set_dirty, chdir
+from conans.util.runners import ParallelJobs
 
 
 def build_id(conan_file):
@@ -251,19 +254,98 @@ class BinaryInstaller:
                                  for install_reference in level)])
         handled_count = 1
 
-        self._download_bulk(install_order)
-        for level in install_order:
-            for install_reference in level:
-                for package in install_reference.packages.values():
-                    self._install_source(package.nodes[0], remotes)
-                    self._handle_package(package, install_reference, handled_count, package_count)
-                    handled_count += 1
+        self._download_bulk(install_order, deps_graph.prefetched_binaries)
+        parallel = self._global_conf.get("core.build:parallel_jobs", check_type=int)
+        try:
+            if parallel is not None and parallel > 1:
+                self._install_parallel(install_order, remotes, parallel, package_count)
+            else:
+                for level in install_order:
+                    for install_reference in level:
+                        for package in install_reference.packages.values():
+                            self._install_source(package.nodes[0], remotes)
+                            self._handle_package(package, install_reference, handled_count,
+                                                 package_count)
+                            handled_count += 1
+        finally:
+            self._cache.flush_lru()
 
         MockInfoProperty.message()
 
-    def _download_bulk(self, install_order):
+    def _install_parallel(self, install_order, remotes, parallel, package_count):
+        """ every package is installed in its own job, as soon as all the packages it depends on
+        are installed, with up to "parallel" jobs running their subprocesses concurrently.
+        If some package fails, no more jobs are started, and once the running ones finish, the
+        error of the first failed package in the install order is raised.
+        The output of every job is written at once when it finishes, not interleaved
+        """
+        packages = [(install_reference, package)
+                    for level in install_order
+                    for install_reference in level
+                    for package in install_reference.packages.values()]
+        node_packages = {id(n): i for i, (_, package) in enumerate(packages)
+                         for n in package.nodes}
+        depends = [{node_packages[id(t.node)]
+                    for n in package.nodes
+                    for t in n.transitive_deps.values()
+                    if t.node is not None and id(t.node) in node_packages}
+                   for _, package in packages]
+
+        # The packages of the same recipe share its source folder, retrieved only by the first one
+        source_locks = {id(install_reference): threading.Lock()
+                        for install_reference, _ in packages}
+
+        ConanOutput().info(f"Installing packages in {parallel} parallel jobs")
+        jobs = ParallelJobs()
+        finished = Queue()
+        handled = []
+
+        def _job(index):
+            try:
+                with jobs.job(), ConanOutput.buffered():
+                    handled.append(index)
+                    install_reference, package = packages[index]
+                    source_lock = source_locks[id(install_reference)]
+                    with jobs.released():  # The job holding it might be running a subprocess
+                        source_lock.acquire()
+                    try:
+                        self._install_source(package.nodes[0], remotes)
+                    finally:
+                        source_lock.release()
+                    self._handle_package(package, install_reference, len(handled), package_count)
+            except BaseException as e:
+                finished.put((index, e))
+            else:
+                finished.put((index, None))
+
+        pending = list(range(len(packages)))
+        done, running, errors = set(), set(), {}
+        thread_pool = ThreadPool(parallel)
+        try:
+            while True:
+                if not errors:
+                    ready = [i for i in pending if depends[i] <= done]
+                    for i in ready:
+                        pending.remove(i)
+                        running.add(i)
+                        thread_pool.apply_async(_job, (i,))
+                if not running:
+                    break
+                index, error = finished.get()
+                running.remove(index)
+                if error is None:
+                    done.add(index)
+                else:
+                    errors[index] = error
+        finally:
+            thread_pool.close()
+            thread_pool.join()
+        if errors:
+            raise errors[min(errors)]
+
+    def _download_bulk(self, install_order, prefetch=None):
         """ executes the download of packages (both download and update), only once for a given
-        PREF
+        PREF. The ones already prefetched while analyzing the graph are just waited for
         """
         downloads = []
         for level in install_order:
@@ -272,6 +354,8 @@ class BinaryInstaller:
                     if package.binary in (BINARY_UPDATE, BINARY_DOWNLOAD):
                         downloads.append(package)
         if not downloads:
+            if prefetch is not None:
+                prefetch.wait()
             return
 
         download_count = len(downloads)
@@ -281,17 +365,24 @@ class BinaryInstaller:
         if parallel is not None:
             ConanOutput().info("Downloading binary packages in %s parallel threads" % parallel)
             thread_pool = ThreadPool(parallel)
-            thread_pool.map(self._download_pkg, downloads)
+            thread_pool.map(lambda p: self._download_pkg(p, prefetch), downloads)
             thread_pool.close()
             thread_pool.join()
         else:
             for node in downloads:
-                self._download_pkg(node)
+                self._download_pkg(node, prefetch)
+        if prefetch is not None:
+            # The prefetched binaries that were finally skipped are not needed, but they are
+            # waited for, so they are not left half-downloaded in the cache
+            prefetch.wait()
 
-    def _download_pkg(self, package):
+    def _download_pkg(self, package, prefetch):
         node = package.nodes[0]
         assert node.pref.revision is not None
         assert node.pref.timestamp is not None
+        # Failed prefetches are retried, same as the non-prefetched path would do
+        if prefetch is not None and prefetch.get(node.pref):
+            return
         self._remote_manager.get_package(node.pref, node.binary_remote)
 
     def _handle_package(self, package, install_reference, handled_count, total_count):
@@ -55,6 +55,8 @@ class ClientMigrator(Migrator):
 
         if old_version and old_version < "2.0.14-":
             _migrate_pkg_db_lru(self.cache_folder, old_version)
+        if old_version and old_version < "2.9.0-":
+            _migrate_pkg_db_indexes(self.cache_folder)
 
         # let the back migration files be stored
         # if there was not a previous install (old_version==None)
@@ -75,6 +77,20 @@ def _migrate_default_compatibility(cache_folder):
     save(path, undo)
 
 
+def _migrate_pkg_db_indexes(cache_folder):
+    # Indexes are transparent to older Conan versions, no back-migration is needed
+    from conan.internal.cache.db.packages_table import PackagesDBTable
+    from conan.internal.cache.db.recipes_table import RecipesDBTable
+    config = ConfigAPI.load_config(cache_folder)
+    storage = config.get("core.cache:storage_path") or os.path.join(cache_folder, "p")
+    db_filename = os.path.join(storage, 'cache.sqlite3')
+    if not os.path.exists(db_filename):
+        return
+    for table in (RecipesDBTable(db_filename), PackagesDBTable(db_filename)):
+        with table.db_connection() as connection:
+            table.create_indexes(connection)
+
+
 def _migrate_pkg_db_lru(cache_folder, old_version):
     config = ConfigAPI.load_config(cache_folder)
     storage = config.get("core.cache:storage_path") or os.path.join(cache_folder, "p")
@@ -3,6 +3,7 @@ import os
 from conan.internal.cache.conan_reference_layout import METADATA
 from conan.internal.cache.home_paths import HomePaths
 from conans.client.loader import load_python_file
+from conans.model.package_ref import PkgReference
 from conans.util.files import mkdir
 
 
@@ -18,23 +19,34 @@ class PkgSignaturesPlugin:
         else:
             self._plugin_sign_function = self._plugin_verify_function = None
 
+    @property
+    def verify_enabled(self):
+        return self._plugin_verify_function is not None
+
     def sign(self, upload_data):
         if self._plugin_sign_function is None:
             return
 
-        def _sign(ref, files, folder):
-            metadata_sign = os.path.join(folder, METADATA, "sign")
-            mkdir(metadata_sign)
-            self._plugin_sign_function(ref, artifacts_folder=folder, signature_folder=metadata_sign)
-            for f in os.listdir(metadata_sign):
-                files[f"{METADATA}/sign/{f}"] = os.path.join(metadata_sign, f)
-
         for rref, recipe_bundle in upload_data.refs().items():
-            if recipe_bundle["upload"]:
-                _sign(rref, recipe_bundle["files"], self._cache.recipe_layout(rref).download_export())
+            self.sign_bundle(rref, recipe_bundle)
             for pref, pkg_bundle in upload_data.prefs(rref, recipe_bundle).items():
-                if pkg_bundle["upload"]:
-                    _sign(pref, pkg_bundle["files"], self._cache.pkg_layout(pref).download_package())
+                self.sign_bundle(pref, pkg_bundle)
+
+    def sign_bundle(self, ref, bundle):
+        """ sign a single recipe (ref is a RecipeReference) or package (PkgReference) bundle
+        """
+        if self._plugin_sign_function is None or not bundle["upload"]:
+            return
+        if isinstance(ref, PkgReference):
+            folder = self._cache.pkg_layout(ref).download_package()
+        else:
+            folder = self._cache.recipe_layout(ref).download_export()
+        metadata_sign = os.path.join(folder, METADATA, "sign")
+        mkdir(metadata_sign)
+        self._plugin_sign_function(ref, artifacts_folder=folder, signature_folder=metadata_sign)
+        files = bundle["files"]
+        for f in os.listdir(metadata_sign):
+            files[f"{METADATA}/sign/{f}"] = os.path.join(metadata_sign, f)
 
     def verify(self, ref, folder, files):
         if self._plugin_verify_function is None:
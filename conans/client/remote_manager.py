@@ -10,23 +10,27 @@ from conan.api.model import Remote
 from conan.api.output import ConanOutput
 from conan.internal.cache.conan_reference_layout import METADATA
 from conans.client.pkg_sign import PkgSignaturesPlugin
+from conans.client.remote_search_cache import RemoteSearchCache
 from conans.errors import ConanConnectionError, ConanException, NotFoundException, \
     PackageNotFoundException
 from conans.model.info import load_binary_info
 from conans.model.package_ref import PkgReference
 from conans.model.recipe_ref import RecipeReference
 from conans.util.files import rmdir, human_size
-from conan.internal.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME
+from conan.internal.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, \
+    find_archive
 from conans.util.files import mkdir, tar_extract
 
 
 class RemoteManager:
     """ Will handle the remotes to get recipes, packages etc """
-    def __init__(self, cache, auth_manager, home_folder):
+    def __init__(self, cache, auth_manager, home_folder, global_conf):
         self._cache = cache
         self._auth_manager = auth_manager
         self._signer = PkgSignaturesPlugin(cache, home_folder)
         self._home_folder = home_folder
+        self._search_cache = RemoteSearchCache(home_folder)
+        self._extract_threads = global_conf.get("core.extract:threads", check_type=int)
 
     def _local_folder_remote(self, remote):
         if remote.remote_type == LOCAL_RECIPES_INDEX:
@@ -39,6 +43,7 @@ class RemoteManager:
         assert isinstance(ref, RecipeReference)
         assert ref.revision, "upload_recipe requires RREV"
         self._call_remote(remote, "upload_recipe", ref, files_to_upload)
+        self._search_cache.invalidate(remote)
 
     def upload_package(self, pref, files_to_upload, remote):
         assert pref.ref.revision, "upload_package requires RREV"
@@ -78,10 +83,11 @@ class RemoteManager:
             self._cache.remove_recipe_layout(layout)
             raise
         export_folder = layout.export()
-        tgz_file = zipped_files.pop(EXPORT_TGZ_NAME, None)
+        tgz_file = zipped_files.pop(find_archive(EXPORT_TGZ_NAME, zipped_files), None)
 
         if tgz_file:
-            uncompress_file(tgz_file, export_folder, scope=str(ref))
+            uncompress_file(tgz_file, export_folder, scope=str(ref),
+                            threads=self._extract_threads)
         mkdir(export_folder)
         for file_name, file_path in zipped_files.items():  # copy CONANFILE
             shutil.move(file_path, os.path.join(export_folder, file_name))
@@ -122,8 +128,9 @@ class RemoteManager:
             return
 
         self._signer.verify(ref, download_folder, files=zipped_files)
-        tgz_file = zipped_files[EXPORT_SOURCES_TGZ_NAME]
-        uncompress_file(tgz_file, export_sources_folder, scope=str(ref))
+        tgz_file = zipped_files[find_archive(EXPORT_SOURCES_TGZ_NAME, zipped_files)]
+        uncompress_file(tgz_file, export_sources_folder, scope=str(ref),
+                        threads=self._extract_threads)
 
     def get_package(self, pref, remote, metadata=None):
         output = ConanOutput(scope=str(pref.ref))
@@ -159,22 +166,32 @@ class RemoteManager:
             assert pref.revision is not None
 
             download_pkg_folder = layout.download_package()
+            package_folder = layout.package()
+            # The signature verification needs the package archive before extracting it
+            extract_folder = package_folder if not self._signer.verify_enabled else None
             # Download files to the pkg_tgz folder, not to the final one
             zipped_files = self._call_remote(remote, "get_package", pref, download_pkg_folder,
-                                             metadata, only_metadata=False)
+                                             metadata, only_metadata=False,
+                                             extract_folder=extract_folder)
             zipped_files = {k: v for k, v in zipped_files.items() if not k.startswith(METADATA)}
             # quick server package integrity check:
-            for f in ("conaninfo.txt", "conanmanifest.txt", "conan_package.tgz"):
+            for f in ("conaninfo.txt", "conanmanifest.txt"):
                 if f not in zipped_files:
                     raise ConanException(f"Corrupted {pref} in '{remote.name}' remote: no {f}")
+            package_tgz = find_archive(PACKAGE_TGZ_NAME, zipped_files)
+            if package_tgz is None:
+                raise ConanException(f"Corrupted {pref} in '{remote.name}' remote: "
+                                     f"no {PACKAGE_TGZ_NAME}")
             self._signer.verify(pref, download_pkg_folder, zipped_files)
 
-            tgz_file = zipped_files.pop(PACKAGE_TGZ_NAME, None)
-            package_folder = layout.package()
-            uncompress_file(tgz_file, package_folder, scope=str(pref.ref))
+            tgz_file = zipped_files.pop(package_tgz)
+            if tgz_file is not None:  # None if it was already extracted while downloading
+                uncompress_file(tgz_file, package_folder, scope=str(pref.ref),
+                                threads=self._extract_threads)
             mkdir(package_folder)  # Just in case it doesn't exist, because uncompress did nothing
             for file_name, file_path in zipped_files.items():  # copy CONANINFO and CONANMANIFEST
                 shutil.move(file_path, os.path.join(package_folder, file_name))
+            self._cache.deduplicate_package(layout)
 
             scoped_output.success('Package installed %s' % pref.package_id)
             scoped_output.info("Downloaded package revision %s" % pref.revision)
@@ -198,7 +215,10 @@ class RemoteManager:
         return packages
 
     def remove_recipe(self, ref, remote):
-        return self._call_remote(remote, "remove_recipe", ref)
+        try:
+            return self._call_remote(remote, "remove_recipe", ref)
+        finally:
+            self._search_cache.invalidate(remote)
 
     def remove_packages(self, prefs, remote):
         return self._call_remote(remote, "remove_packages", prefs)
@@ -236,6 +256,25 @@ class RemoteManager:
                 headers['Conan-PkgID-Options'] = ';'.join(options)
         return self._call_remote(remote, "get_latest_package_reference", pref, headers=headers)
 
+    def get_latest_package_references(self, prefs, remote, infos=None):
+        """ the latest package revision in the remote of each one of the prefs (without PREV),
+        in a single request if the server supports it, or one request per pref otherwise.
+        :return: {pref: latest_pref}, not including the ones not found in the remote
+        """
+        assert all(pref.revision is None for pref in prefs), \
+            "get_latest_package_references of a reference with revision"
+        result = self._call_remote(remote, "get_latest_package_references", prefs)
+        if result is not None:
+            return result
+        result = {}
+        infos = infos or {}
+        for pref in prefs:
+            try:
+                result[pref] = self.get_latest_package_reference(pref, remote, infos.get(pref))
+            except NotFoundException:
+                pass
+        return result
+
     def get_recipe_revision_reference(self, ref, remote) -> bool:
         assert ref.revision is not None, "recipe_exists needs a revision"
         return self._call_remote(remote, "get_recipe_revision_reference", ref)
@@ -268,7 +307,7 @@ class RemoteManager:
             raise ConanException(exc, remote=remote)
 
 
-def uncompress_file(src_path, dest_folder, scope=None):
+def uncompress_file(src_path, dest_folder, scope=None, threads=None):
     try:
         filesize = os.path.getsize(src_path)
         big_file = filesize > 10000000  # 10 MB
@@ -276,7 +315,7 @@ def uncompress_file(src_path, dest_folder, scope=None):
             hs = human_size(filesize)
             ConanOutput(scope=scope).info(f"Decompressing {hs} {os.path.basename(src_path)}")
         with open(src_path, mode='rb') as file_handler:
-            tar_extract(file_handler, dest_folder)
+            tar_extract(file_handler, dest_folder, threads=threads)
     except Exception as e:
         error_msg = "Error while extracting downloaded file '%s' to %s\n%s\n"\
                     % (src_path, dest_folder, str(e))
@@ -0,0 +1,66 @@
+import json
+import os
+import time
+import uuid
+
+from conan.api.model import LOCAL_RECIPES_INDEX
+from conan.internal.cache.home_paths import HomePaths
+from conans.model.recipe_ref import RecipeReference
+from conans.util.files import load, md5, rmdir, save
+
+
+class RemoteSearchCache:
+    """ Persistent cache in the Conan home of the results of searching recipes in the remotes,
+    used by the version ranges resolution. There is one file per (remote url, pattern), so
+    concurrent processes never corrupt each other entries, and an entry is just ignored
+    when it is older than the configured TTL or it cannot be read.
+    """
+
+    def __init__(self, home_folder, ttl=None):
+        self._folder = HomePaths(home_folder).remote_search_cache_path
+        self._ttl = ttl
+
+    def _enabled(self, remote):
+        # local-recipes-index remotes are local folders, searching them is already cheap
+        return self._ttl and remote.remote_type != LOCAL_RECIPES_INDEX
+
+    def _remote_folder(self, remote):
+        return os.path.join(self._folder, md5(remote.url))
+
+    def _entry_path(self, remote, pattern):
+        return os.path.join(self._remote_folder(remote), md5(pattern) + ".json")
+
+    def get(self, remote, pattern):
+        """ the cached list of references found for this pattern in the remote, or None if not
+        cached or expired
+        """
+        if not self._enabled(remote):
+            return None
+        path = self._entry_path(remote, pattern)
+        try:
+            data = json.loads(load(path))
+            if data["pattern"] != pattern or time.time() - data["time"] > self._ttl:
+                return None
+            return [RecipeReference.loads(r) for r in data["results"]]
+        except Exception:  # Not existing, corrupted, etc. will be just searched again
+            return None
+
+    def store(self, remote, pattern, results):
+        if not self._enabled(remote):
+            return
+        path = self._entry_path(remote, pattern)
+        content = json.dumps({"pattern": pattern, "time": time.time(),
+                              "results": [repr(r) for r in results]})
+        # Atomic replace, so other processes reading it never see a partial file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            save(tmp_path, content)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def invalidate(self, remote=None):
+        """ remove the cached searches of the given remote or of all remotes if None
+        """
+        rmdir(self._remote_folder(remote) if remote is not None else self._folder)
@@ -58,6 +58,10 @@ class ClientV2Router:
     def common_check_credentials(self):
         return self.base_url + self.routes.common_check_credentials
 
+    def packages_latest(self):
+        """Get the latest of a list of packages"""
+        return self.base_url + self.routes.common_packages_latest
+
     def recipe_file(self, ref, path):
         """Recipe file url"""
         return self.base_url + self._for_recipe_file(ref, path)
@@ -7,7 +7,7 @@ import platform
 import requests
 import urllib3
 from jinja2 import Template
-from requests.adapters import HTTPAdapter
+from requests.adapters import HTTPAdapter, DEFAULT_POOLSIZE
 
 from conan.internal.cache.home_paths import HomePaths
 
@@ -98,17 +98,11 @@ class _SourceURLCredentials:
 class ConanRequester:
 
     def __init__(self, config, cache_folder=None):
-        # TODO: Make all this lazy, to avoid fully configuring Requester, for every api call
-        #  even if it doesn't use it
-        # FIXME: Trick for testing when requests is mocked
-        if hasattr(requests, "Session"):
-            self._http_requester = requests.Session()
-            adapter = HTTPAdapter(max_retries=self._get_retries(config))
-            self._http_requester.mount("http://", adapter)
-            self._http_requester.mount("https://", adapter)
-        else:
-            self._http_requester = requests
-
+        # The http_requester (and its pool of connections) is lazy, to avoid fully configuring
+        # it for every api call even if it doesn't use it
+        self._http_requester_instance = None
+        self._max_retries = config.get("core.net.http:max_retries", default=2, check_type=int)
+        self._pool_maxsize = self._get_pool_maxsize(config)
         self._url_creds = _SourceURLCredentials(cache_folder)
         self._timeout = config.get("core.net.http:timeout", default=DEFAULT_TIMEOUT)
         self._no_proxy_match = config.get("core.net.http:no_proxy_match", check_type=list)
@@ -122,9 +116,25 @@ class ConanRequester:
                                    platform.machine()])
         self._user_agent = "Conan/%s (%s)" % (client_version, platform_info)
 
+    @property
+    def _http_requester(self):
+        if self._http_requester_instance is None:
+            # FIXME: Trick for testing when requests is mocked
+            if hasattr(requests, "Session"):
+                http_requester = requests.Session()
+                # requests.Session already keeps alive the connections of the pool, but the pool
+                # needs to be as large as the concurrent requests, or connections are discarded
+                adapter = HTTPAdapter(max_retries=self._get_retries(self._max_retries),
+                                      pool_maxsize=self._pool_maxsize)
+                http_requester.mount("http://", adapter)
+                http_requester.mount("https://", adapter)
+            else:
+                http_requester = requests
+            self._http_requester_instance = http_requester
+        return self._http_requester_instance
+
     @staticmethod
-    def _get_retries(config):
-        retry = config.get("core.net.http:max_retries", default=2, check_type=int)
+    def _get_retries(retry):
         if retry == 0:
             return 0
         retry_status_code_set = {
@@ -142,6 +152,22 @@ class ConanRequester:
             status_forcelist=retry_status_code_set
         )
 
+    @staticmethod
+    def _get_pool_maxsize(config):
+        """ connections kept alive per host, by default enough for all the concurrent requests of
+        the parallel downloads and uploads
+        """
+        pool_maxsize = config.get("core.net.http:pool_maxsize", check_type=int)
+        if pool_maxsize is not None:
+            return pool_maxsize
+        download = config.get("core.download:parallel", default=1, check_type=int)
+        segments = config.get("core.download:segments", default=1, check_type=int)
+        upload = config.get("core.upload:parallel", default=1, check_type=int)
+        upload_files = config.get("core.upload:parallel_files", default=1, check_type=int)
+        prefetch = config.get("core.graph:prefetch_parallel", default=1, check_type=int)
+        return max(DEFAULT_POOLSIZE, download * max(segments, 1), upload * max(upload_files, 1),
+                   prefetch)
+
     def _should_skip_proxy(self, url):
         if self._no_proxy_match:
             for entry in self._no_proxy_match:
@@ -1,4 +1,4 @@
-from conans import CHECKSUM_DEPLOY, REVISIONS, OAUTH_TOKEN
+from conans import CHECKSUM_DEPLOY, REVISIONS, OAUTH_TOKEN, LATEST_PACKAGES_BATCH
 from conans.client.rest.rest_client_v2 import RestV2Methods
 from conans.errors import AuthenticationException, ConanException
 
@@ -51,8 +51,9 @@ class RestApiClient:
     def get_recipe_sources(self, ref, dest_folder):
         return self._get_api().get_recipe_sources(ref, dest_folder)
 
-    def get_package(self, pref, dest_folder, metadata, only_metadata):
-        return self._get_api().get_package(pref, dest_folder, metadata, only_metadata)
+    def get_package(self, pref, dest_folder, metadata, only_metadata, extract_folder=None):
+        return self._get_api().get_package(pref, dest_folder, metadata, only_metadata,
+                                           extract_folder)
 
     def upload_recipe(self, ref, files_to_upload):
         return self._get_api().upload_recipe(ref, files_to_upload)
@@ -112,6 +113,14 @@ class RestApiClient:
     def get_latest_package_reference(self, pref, headers):
         return self._get_api().get_latest_package_reference(pref, headers=headers)
 
+    def get_latest_package_references(self, prefs):
+        """ None if the server doesn't support resolving them in a single request
+        """
+        api = self._get_api()
+        if not self._capable(LATEST_PACKAGES_BATCH):
+            return None
+        return api.get_latest_package_references(prefs)
+
     def get_recipe_revision_reference(self, ref):
         return self._get_api().get_recipe_revision_reference(ref)
 
@@ -2,6 +2,7 @@ import copy
 import fnmatch
 import json
 import os
+from multiprocessing.pool import ThreadPool
 
 from requests.auth import AuthBase, HTTPBasicAuth
 
@@ -14,7 +15,8 @@ from conans.client.rest.file_uploader import FileUploader
 from conans.errors import ConanException, NotFoundException, PackageNotFoundException, \
     RecipeNotFoundException, AuthenticationException, ForbiddenException, EXCEPTION_CODE_MAPPING
 from conans.model.package_ref import PkgReference
-from conan.internal.paths import EXPORT_SOURCES_TGZ_NAME
+from conan.internal.paths import CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, \
+    PACKAGE_TGZ_NAME, find_archive
 from conans.model.recipe_ref import RecipeReference
 from conans.util.dates import from_iso8601_to_timestamp
 from conans.util.thread import ExceptionThread
@@ -258,9 +260,11 @@ class RestV2Methods:
         result = {}
 
         if not only_metadata:
-            accepted_files = ["conanfile.py", "conan_export.tgz", "conanmanifest.txt",
-                              "metadata/sign"]
+            accepted_files = ["conanfile.py", "conanmanifest.txt", "metadata/sign"]
             files = [f for f in server_files if any(f.startswith(m) for m in accepted_files)]
+            export_tgz = find_archive(EXPORT_TGZ_NAME, server_files)  # Any compression format
+            if export_tgz is not None:
+                files.append(export_tgz)
             # If we didn't indicated reference, server got the latest, use absolute now, it's safer
             urls = {fn: self.router.recipe_file(ref, fn) for fn in files}
             self._download_and_save_files(urls, dest_folder, files, parallel=True)
@@ -278,10 +282,10 @@ class RestV2Methods:
         assert ref.revision, f"get_recipe_sources() called without revision {ref}"
         url = self.router.recipe_snapshot(ref)
         data = self._get_file_list_json(url)
-        files = data["files"]
-        if EXPORT_SOURCES_TGZ_NAME not in files:
+        sources_tgz = find_archive(EXPORT_SOURCES_TGZ_NAME, data["files"])
+        if sources_tgz is None:
             return None
-        files = [EXPORT_SOURCES_TGZ_NAME, ]
+        files = [sources_tgz, ]
 
         # If we didn't indicated reference, server got the latest, use absolute now, it's safer
         urls = {fn: self.router.recipe_file(ref, fn) for fn in files}
@@ -289,20 +293,33 @@ class RestV2Methods:
         ret = {fn: os.path.join(dest_folder, fn) for fn in files}
         return ret
 
-    def get_package(self, pref, dest_folder, metadata, only_metadata):
+    def get_package(self, pref, dest_folder, metadata, only_metadata, extract_folder=None):
+        """ if extract_folder is given, and "core.download:extract_streaming" is enabled, the
+        package archive is extracted there while downloading it, instead of saving it in
+        dest_folder. Then it is returned with a None path
+        """
         url = self.router.package_snapshot(pref)
         data = self._get_file_list_json(url)
         server_files = data["files"]
         result = {}
         # Download only known files, but not metadata (except sign)
         if not only_metadata:  # Retrieve package first, then metadata
-            accepted_files = ["conaninfo.txt", "conan_package.tgz", "conanmanifest.txt",
-                              "metadata/sign"]
+            accepted_files = ["conaninfo.txt", "conanmanifest.txt", "metadata/sign"]
             files = [f for f in server_files if any(f.startswith(m) for m in accepted_files)]
+            package_tgz = find_archive(PACKAGE_TGZ_NAME, server_files)  # Any compression format
+            if package_tgz is not None:
+                files.append(package_tgz)
             # If we didn't indicated reference, server got the latest, use absolute now, it's safer
             urls = {fn: self.router.package_file(pref, fn) for fn in files}
+            streaming = extract_folder is not None and package_tgz is not None and \
+                self._config.get("core.download:extract_streaming", check_type=bool)
+            if streaming:
+                files.remove(package_tgz)
             self._download_and_save_files(urls, dest_folder, files, scope=str(pref.ref))
             result.update({fn: os.path.join(dest_folder, fn) for fn in files})
+            if streaming:
+                self._download_extract(urls[package_tgz], extract_folder, scope=str(pref.ref))
+                result[package_tgz] = None
 
         if metadata:
             metadata = [f"metadata/{m}" for m in metadata]
@@ -337,13 +354,11 @@ class RestV2Methods:
     def _upload_files(self, files, urls, ref):
         failed = []
         uploader = FileUploader(self.requester, self.verify_ssl, self._config)
-        # conan_package.tgz and conan_export.tgz are uploaded first to avoid uploading conaninfo.txt
-        # or conanamanifest.txt with missing files due to a network failure
-        for filename in sorted(files):
-            # As the filenames are sorted, the last one is always "conanmanifest.txt"
-            resource_url = urls[filename]
+        parallel = self._config.get("core.upload:parallel_files", default=1, check_type=int)
+
+        def _upload(filename):
             try:
-                uploader.upload(resource_url, files[filename], auth=self.auth,
+                uploader.upload(urls[filename], files[filename], auth=self.auth,
                                 dedup=self._checksum_deploy, ref=ref)
             except (AuthenticationException, ForbiddenException):
                 raise
@@ -352,9 +367,24 @@ class RestV2Methods:
                                     error_type="exception")
                 failed.append(filename)
 
+        # conan_package.tgz and conan_export.tgz are uploaded first to avoid uploading conaninfo.txt
+        # or conanamanifest.txt with missing files due to a network failure
+        filenames = sorted(files)
+        if parallel > 1 and len(filenames) > 1:
+            # All the other files concurrently, and the manifest after all of them finished
+            thread_pool = ThreadPool(parallel)
+            try:
+                thread_pool.map(_upload, [f for f in filenames if f != CONAN_MANIFEST])
+            finally:
+                thread_pool.close()
+                thread_pool.join()
+            filenames = [f for f in filenames if f == CONAN_MANIFEST]
+        for filename in filenames:
+            _upload(filename)
+
         if failed:
             raise ConanException("Execute upload again to retry upload the failed files: %s"
-                                 % ", ".join(failed))
+                                 % ", ".join(sorted(failed)))
 
     def _download_and_save_files(self, urls, dest_folder, files, parallel=False, scope=None,
                                  metadata=False):
@@ -385,6 +415,13 @@ class RestV2Methods:
         for t in threads:  # Need to join all before raising errors
             t.raise_errors()
 
+    def _download_extract(self, url, dest_folder, scope=None):
+        retry = self._config.get("core.download:retry", check_type=int, default=2)
+        retry_wait = self._config.get("core.download:retry_wait", check_type=int, default=0)
+        downloader = ConanInternalCacheDownloader(self.requester, self._config, scope=scope)
+        downloader.download_extract(url, dest_folder, auth=self.auth, verify_ssl=self.verify_ssl,
+                                    retry=retry, retry_wait=retry_wait)
+
     def remove_all_packages(self, ref):
         """ Remove all packages from the specified reference"""
         self.check_credentials()
@@ -507,6 +544,20 @@ class RestV2Methods:
             raise PackageNotFoundException(pref)
         return remote_prefs
 
+    def get_latest_package_references(self, prefs):
+        url = self.router.packages_latest()
+        assert all(pref.ref.revision is not None for pref in prefs), \
+            "Cannot get the latest packages without RREV"
+        data = self._get_json(url, data={"references": [p.repr_notime() for p in prefs]})
+        data = data["references"]
+        result = {}
+        for pref in prefs:
+            item = data.get(pref.repr_notime())
+            if item is not None:
+                result[pref] = PkgReference(pref.ref, pref.package_id, item.get("revision"),
+                                            from_iso8601_to_timestamp(item.get("time")))
+        return result
+
     def get_latest_package_reference(self, pref: PkgReference, headers):
         url = self.router.package_latest(pref)
         data = self._get_json(url, headers=headers)
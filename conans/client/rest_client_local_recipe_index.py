@@ -85,7 +85,7 @@ class RestApiClientLocalRecipesIndex:
             raise NotFoundException(str(e))
         return self._copy_files(export_sources, dest_folder)
 
-    def get_package(self, pref, dest_folder, metadata, only_metadata):
+    def get_package(self, pref, dest_folder, metadata, only_metadata, extract_folder=None):
         raise ConanException(f"Remote local-recipes-index '{self._remote.name}' doesn't support "
                              "binary packages")
 
@@ -132,6 +132,9 @@ class RestApiClientLocalRecipesIndex:
     def get_latest_package_reference(self, pref, headers):
         raise PackageNotFoundException(pref)
 
+    def get_latest_package_references(self, prefs):
+        return {}
+
     def get_recipe_revision_reference(self, ref):
         new_ref = self._export_recipe(ref)
         if new_ref != ref:
@@ -10,10 +10,21 @@ def run():
                         help='Run the pending migrations')
     parser.add_argument('--server_dir', '-d', default=None,
                         help='Specify where to store server config and data.')
+    parser.add_argument('--rebuild-index', default=False, action='store_true',
+                        help='Rebuild the metadata index (metadata_index in server.conf) from '
+                             'the storage, and exit')
+    parser.add_argument('--collect-blobs', default=False, action='store_true',
+                        help='Remove all the deduplicated files no longer used by any reference '
+                             'of the storage, and exit')
     args = parser.parse_args()
     launcher = ServerLauncher(force_migration=args.migrate,
                               server_dir=args.server_dir or os.environ.get("CONAN_SERVER_HOME"))
-    launcher.launch()
+    if args.rebuild_index:
+        launcher.rebuild_index()
+    elif args.collect_blobs:
+        launcher.collect_blobs()
+    else:
+        launcher.launch()
 
 
 if __name__ == '__main__':
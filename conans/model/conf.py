@@ -20,14 +20,31 @@ BUILT_IN_CONFS = {
     "core:default_build_profile": "Defines the default build profile ('default' by default)",
     "core:allow_uppercase_pkg_names": "Temporarily (will be removed in 2.X) allow uppercase names",
     "core.version_ranges:resolve_prereleases": "Whether version ranges can resolve to pre-releases or not",
+    "core.version_ranges:remote_search_ttl": "Seconds to reuse the remote search results of version ranges, persisted in the Conan home (default: not persisted)",
     "core.upload:retry": "Number of retries in case of failure when uploading to Conan server",
     "core.upload:retry_wait": "Seconds to wait between upload attempts to Conan server",
     "core.upload:parallel": "Number of concurrent threads to upload packages",
+    "core.upload:parallel_files": "(Experimental) Number of concurrent threads to upload the files of a recipe or package, the conanmanifest.txt is always uploaded the last one",
+    "core.upload:pipeline": "(Experimental) Compress every recipe and package while the previous ones are being uploaded, instead of compressing all of them before starting the upload",
+    "core.upload:compression_format": "The compression format of the uploaded Conan artifacts and 'conan cache save': gzip (default), zstd (requires 'zstandard' Python package), xz or none",
     "core.download:parallel": "Number of concurrent threads to download packages",
     "core.download:retry": "Number of retries in case of failure when downloading from Conan server",
     "core.download:retry_wait": "Seconds to wait between download attempts from Conan server",
+    "core.download:segments": "(Experimental) Number of concurrent byte ranges to download the large files (> 10 MB) from servers that accept ranges, both packages and recipes download()",
+    "core.download:prefetch_parallel": "(Experimental) Number of concurrent threads to start downloading the binary packages while the graph is analyzed, by the commands that install them (install, create, build, test), binaries that are skipped later might be downloaded too",
     "core.download:download_cache": "Define path to a file download cache",
+    "core.download:extract_streaming": "(Experimental) Extract the package binaries while they are downloaded, without saving the conan_package.tgz, unless the download cache is enabled",
+    "core.build:parallel_jobs": "Number of packages to build concurrently, every package starts as "
+                                "soon as its dependencies are installed (default: 1)",
+    "core.graph:prefetch_parallel": "Number of concurrent threads to prefetch pinned recipes from "
+                                    "remotes while expanding the dependency graph",
     "core.cache:storage_path": "Absolute path where the packages and database are stored",
+    "core.cache:manifest_hashes": "(Experimental) Keep the md5 of the cache files keyed by their size, modification time and inode, so the manifests verification (check-integrity, upload --check) and the export don't hash again the unchanged files",
+    "core.cache:deduplicate": "(Experimental) Hardlink the identical files of the packages in the cache to a single copy in a content-addressed store. The package files must never be modified",
+    "core.cache:sqlite_wal": "Keep a database connection per thread and use the SQLite WAL journal "
+                             "(the cache must be in a local filesystem)",
+    "core.cache:lru_granularity": "Do not update the LRU of used recipes and packages if it was "
+                                  "updated within this time, like '10m' or '2h' (default: always)",
     # Sources backup
     "core.sources:download_cache": "Folder to store the sources backup",
     "core.sources:download_urls": "List of URLs to download backup sources from",
@@ -42,6 +59,7 @@ BUILT_IN_CONFS = {
     "core.package_id:config_mode": "How the 'config_version' affects binaries. By default 'None'",
     # General HTTP(python-requests) configuration
     "core.net.http:max_retries": "Maximum number of connection retries (requests library)",
+    "core.net.http:pool_maxsize": "(Experimental) Maximum number of connections kept alive per server (requests library), by default enough for the parallel downloads and uploads",
     "core.net.http:timeout": "Number of seconds without response to timeout (requests library)",
     "core.net.http:no_proxy_match": "List of urls to skip from proxies configuration",
     "core.net.http:proxies": "Dictionary containing the proxy configuration",
@@ -50,6 +68,8 @@ BUILT_IN_CONFS = {
     "core.net.http:clean_system_proxy": "If defined, the proxies system env-vars will be discarded",
     # Gzip compression
     "core.gzip:compresslevel": "The Gzip compression level for Conan artifacts (default=9)",
+    "core.gzip:threads": "(Experimental) Number of threads to compress the Conan artifacts in parallel blocks, with the same output for any number of threads >= 1 (0 disables it, the standard sequential gzip)",
+    "core.extract:threads": "(Experimental) Number of threads to write the files while extracting the Conan artifacts, the archive is still decompressed sequentially",
     # Excluded from revision_mode = "scm" dirty and Git().is_dirty() checks
     "core.scm:excluded": "List of excluded patterns for builtin git dirty checks",
     "core.scm:local_url": "By default allows to store local folders as remote url, but not upload them. Use 'allow' for allowing upload and 'block' to completely forbid it",
@@ -86,6 +106,7 @@ BUILT_IN_CONFS = {
     "tools.files.download:retry_wait": "Seconds to wait between download attempts",
     "tools.files.download:verify": "If set, overrides recipes on whether to perform SSL verification for their downloaded files. Only recommended to be set while testing",
     "tools.files.unzip:filter": "Define tar extraction filter: 'fully_trusted', 'tar', 'data'",
+    "tools.files.unzip:threads": "(Experimental) Number of threads to write the files extracted from tar archives by unzip()",
     "tools.graph:vendor": "(Experimental) If 'build', enables the computation of dependencies of vendoring packages to build them",
     "tools.graph:skip_binaries": "Allow the graph to skip binaries not needed in the current configuration (True by default)",
     "tools.gnu:make_program": "Indicate path to make program",
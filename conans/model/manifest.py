@@ -1,4 +1,6 @@
+import json
 import os
+import time
 from collections import defaultdict
 
 from conan.internal.paths import CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME
@@ -85,29 +87,26 @@ class FileTreeManifest(object):
                 output.info("%s %d '%s' %s%s" % (suffix, len(files), ext, file_or_files, files_str))
 
     @classmethod
-    def create(cls, folder, exports_sources_folder=None):
+    def create(cls, folder, exports_sources_folder=None, hash_cache=None, origin_folder=None):
         """ Walks a folder and create a FileTreeManifest for it, reading file contents
         from disk, and capturing current time
+        :param hash_cache: Optional json file to store the md5 of the files keyed by their
+            size, modification time and inode, so the unchanged ones are not hashed again
+        :param origin_folder: Optional folder the files were copied from (preserving their
+            modification time), the unmodified copies use the cache entries of their originals
         """
         files, _ = gather_files(folder)
         # The folders symlinks are discarded for the manifest
         for f in (PACKAGE_TGZ_NAME, EXPORT_TGZ_NAME, CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME):
             files.pop(f, None)
 
-        file_dict = {}
-        for name, filepath in files.items():
-            # For a symlink: md5 of the pointing path, no matter if broken, relative or absolute.
-            value = md5(os.readlink(filepath)) if os.path.islink(filepath) else md5sum(filepath)
-            file_dict[name] = value
-
         if exports_sources_folder:
             export_files, _ = gather_files(exports_sources_folder)
             # The folders symlinks are discarded for the manifest
             for name, filepath in export_files.items():
-                # For a symlink: md5 of the pointing path, no matter if broken, relative or absolute.
-                value = md5(os.readlink(filepath)) if os.path.islink(filepath) else md5sum(filepath)
-                file_dict["export_source/%s" % name] = value
+                files["export_source/%s" % name] = filepath
 
+        file_dict = _FileHasher(hash_cache, origin_folder).hash(files)
         date = timestamp_now()
 
         return cls(date, file_dict)
@@ -128,3 +127,76 @@ class FileTreeManifest(object):
             if h != h2:
                 result[f] = h2, h
         return result
+
+
+class _FileHasher:
+    """ computes the md5 of the files for the manifests, in parallel, and optionally keeping them
+    in a json file keyed by the files (size, mtime_ns, inode), to skip the unchanged files
+    """
+    _RACY_NS = 2 * 10**9  # files modified more recently might change without changing the stat
+
+    def __init__(self, hash_cache=None, origin_folder=None):
+        self._hash_cache = hash_cache
+        self._origin_folder = origin_folder
+
+    def _origin_stat(self, name, st):
+        """ the cache key and stat of the original file of a copy, if the copy has the same
+        size and modification time (copied with shutil.copy2), the new inode would never hit
+        """
+        if name.startswith("export_source/"):
+            name = name[len("export_source/"):]
+        origin = os.path.join(self._origin_folder, *name.split("/"))
+        try:
+            ost = os.stat(origin)
+        except OSError:
+            return None
+        if (ost.st_size, ost.st_mtime_ns) == (st.st_size, st.st_mtime_ns):
+            return origin, (ost.st_size, ost.st_mtime_ns, ost.st_ino)
+
+    def _load(self):
+        try:
+            return json.loads(load(self._hash_cache))
+        except Exception:  # Missing or corrupted, it is just a cache
+            return {}
+
+    def hash(self, files):
+        """ files: {name: abs_path}, returns {name: md5}
+        """
+        cached = self._load() if self._hash_cache else {}
+        result = {}
+        stats = {}
+        keys = {}
+        for name, filepath in files.items():
+            if os.path.islink(filepath):
+                # For a symlink: md5 of the pointing path, no matter if broken, relative or absolute
+                result[name] = md5(os.readlink(filepath))
+                continue
+            st = os.stat(filepath)
+            origin = self._origin_stat(name, st) if self._origin_folder else None
+            keys[name], stats[name] = origin or (name, (st.st_size, st.st_mtime_ns, st.st_ino))
+            entry = cached.get(keys[name])
+            if entry is not None and tuple(entry[:3]) == stats[name]:
+                result[name] = entry[3]
+
+        missing = [name for name in stats if name not in result]
+        if len(missing) > 1:
+            from multiprocessing.pool import ThreadPool
+            # hashlib releases the GIL, the files are read and hashed concurrently
+            thread_pool = ThreadPool(min(len(missing), 8))
+            try:
+                result.update(zip(missing, thread_pool.map(md5sum, [files[m] for m in missing])))
+            finally:
+                thread_pool.close()
+                thread_pool.join()
+        else:
+            result.update((m, md5sum(files[m])) for m in missing)
+
+        if self._hash_cache and (missing or len(cached) != len(stats)):
+            limit = int(time.time() * 10**9) - self._RACY_NS
+            new_cache = {keys[name]: list(st) + [result[name]] for name, st in stats.items()
+                         if st[1] < limit}
+            try:
+                save(self._hash_cache, json.dumps(new_cache))
+            except OSError:  # a read-only cache still works, just not faster
+                pass
+        return result
@@ -1,5 +1,7 @@
-from conans import REVISIONS
+from conans import REVISIONS, LATEST_PACKAGES_BATCH, CHECKSUM_DEPLOY
 
 COMPLEX_SEARCH_CAPABILITY = "complex_search"
 
-SERVER_CAPABILITIES = [COMPLEX_SEARCH_CAPABILITY, REVISIONS]  # Server is always with revisions
+# Server is always with revisions
+SERVER_CAPABILITIES = [COMPLEX_SEARCH_CAPABILITY, REVISIONS, LATEST_PACKAGES_BATCH,
+                       CHECKSUM_DEPLOY]
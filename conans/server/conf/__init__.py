@@ -11,6 +11,7 @@ from configparser import ConfigParser, NoSectionError
 from conans.errors import ConanException
 from conans.server.conf.default_server_conf import default_server_conf
 from conans.server.store.disk_adapter import ServerDiskAdapter
+from conans.server.store.metadata_index import MetadataIndex
 from conans.server.store.server_store import ServerStore
 from conans.util.files import mkdir, save, load
 
@@ -70,6 +71,14 @@ class ConanServerConfigParser(ConfigParser):
                            "host_name": get_env("CONAN_HOST_NAME", None, environment),
                            "custom_authenticator": get_env("CONAN_CUSTOM_AUTHENTICATOR", None, environment),
                            "custom_authorizer": get_env("CONAN_CUSTOM_AUTHORIZER", None, environment),
+                           "metadata_index": get_env("CONAN_SERVER_METADATA_INDEX", None,
+                                                     environment),
+                           "threads": get_env("CONAN_SERVER_THREADS", None, environment),
+                           "processes": get_env("CONAN_SERVER_PROCESSES", None, environment),
+                           "request_queue": get_env("CONAN_SERVER_REQUEST_QUEUE", None,
+                                                    environment),
+                           "keepalive_timeout": get_env("CONAN_SERVER_KEEPALIVE_TIMEOUT", None,
+                                                        environment),
                            # "user:pass,user2:pass2"
                            "users": get_env("CONAN_SERVER_USERS", None, environment)}
 
@@ -160,6 +169,42 @@ class ConanServerConfigParser(ConfigParser):
         mkdir(ret)
         return ret
 
+    @property
+    def metadata_index(self):
+        try:
+            metadata_index = self._get_conf_server_string("metadata_index").lower()
+            return metadata_index == "true" or metadata_index == "1"
+        except ConanException:
+            return False
+
+    def _get_conf_server_int(self, keyname, default):
+        try:
+            value = self._get_conf_server_string(keyname)
+        except ConanException:
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise ConanException("'%s' setting must be an integer, got '%s'" % (keyname, value))
+
+    @property
+    def threads(self):
+        """ 0 means the single-threaded server, serving one request at a time
+        """
+        return self._get_conf_server_int("threads", 0)
+
+    @property
+    def processes(self):
+        return self._get_conf_server_int("processes", 1)
+
+    @property
+    def request_queue(self):
+        return self._get_conf_server_int("request_queue", 64)
+
+    @property
+    def keepalive_timeout(self):
+        return self._get_conf_server_int("keepalive_timeout", 5)
+
     @property
     def read_permissions(self):
         if self.env_config["read_permissions"]:
@@ -244,7 +289,14 @@ class ConanServerConfigParser(ConfigParser):
         return timedelta(minutes=float(self._get_conf_server_string("jwt_expire_minutes")))
 
 
-def get_server_store(disk_storage_path, public_url):
+def get_server_store(disk_storage_path, public_url, metadata_index=False):
     disk_controller_url = "%s/%s" % (public_url, "files")
     adapter = ServerDiskAdapter(disk_controller_url, disk_storage_path)
-    return ServerStore(adapter)
+    if not metadata_index:
+        return ServerStore(adapter)
+    index_path = os.path.join(disk_storage_path, ".metadata_index.sqlite3")
+    new_index = not os.path.exists(index_path)
+    server_store = ServerStore(adapter, MetadataIndex(index_path))
+    if new_index:  # First time enabled, index the existing storage
+        server_store.rebuild_metadata_index()
+    return server_store
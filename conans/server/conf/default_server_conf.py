@@ -20,6 +20,20 @@ disk_storage_path: ./data
 disk_authorize_timeout: 1800
 updown_secret: {updown_secret}
 
+# Serve the searches from a SQLite index of the storage, instead of walking the whole storage.
+# It can be regenerated with "conan_server --rebuild-index"
+# metadata_index: True
+
+# Serve the requests concurrently with a pool of "threads" workers in each of the "processes"
+# pre-forked processes (processes only in POSIX systems). The accepted connections wait in a
+# queue of "request_queue" connections, beyond that they are answered with "503 Service
+# Unavailable", that the clients retry. Idle keep-alive connections are closed after
+# "keepalive_timeout" seconds. Without "threads" the requests are served one by one.
+# threads: 16
+# processes: 1
+# request_queue: 64
+# keepalive_timeout: 5
+
 
 # Check docs.conan.io to implement a different authenticator plugin for conan_server
 # if custom_authenticator is not specified, [users] section will be used to authenticate
@@ -3,6 +3,7 @@ import os
 import sys
 
 from conans import REVISIONS
+from conans.errors import ConanException
 from conans.server import SERVER_CAPABILITIES
 from conans.server.conf import get_server_store
 
@@ -44,7 +45,13 @@ class ServerLauncher(object):
         credentials_manager = JWTCredentialsManager(server_config.jwt_secret,
                                                     server_config.jwt_expire_time)
 
-        server_store = get_server_store(server_config.disk_storage_path, server_config.public_url)
+        server_store = get_server_store(server_config.disk_storage_path, server_config.public_url,
+                                        server_config.metadata_index)
+        self.server_store = server_store
+        self._workers = {"threads": server_config.threads,
+                         "processes": server_config.processes,
+                         "request_queue": server_config.request_queue,
+                         "keepalive_timeout": server_config.keepalive_timeout}
 
         server_capabilities = SERVER_CAPABILITIES
         server_capabilities.append(REVISIONS)
@@ -58,8 +65,22 @@ class ServerLauncher(object):
             print("Storage: %s" % server_config.disk_storage_path)
             print("Public URL: %s" % server_config.public_url)
             print("PORT: %s" % server_config.port)
+            if server_config.threads:
+                print("Workers: %s threads x %s processes" % (server_config.threads,
+                                                              server_config.processes))
             print("***********************")
 
+    def rebuild_index(self):
+        if self.server_store.metadata_index is None:
+            raise ConanException("The metadata index is not enabled, define "
+                                 "'metadata_index: True' in server.conf")
+        self.server_store.rebuild_metadata_index()
+        print("Rebuilt the metadata index of %s" % self.server_store.store)
+
+    def collect_blobs(self):
+        self.server_store.blob_store.collect()
+        print("Collected the unused blobs of %s" % self.server_store.store)
+
     def launch(self):
         if not self.force_migration:
-            self.server.run(host="0.0.0.0")
+            self.server.run(host="0.0.0.0", **self._workers)
@@ -1,12 +1,20 @@
-from bottle import request
+from bottle import request, response
 
-from conans.errors import NotFoundException
 from conans.model.recipe_ref import RecipeReference
 from conans.server.rest.bottle_routes import BottleRoutes
 from conans.server.rest.controller.v2 import get_package_ref
 from conans.server.service.v2.service_v2 import ConanServiceV2
 
 
+def _upload_body():
+    """ the uploaded file is streamed from the wsgi.input, without the spooling of bottle
+    request.body to a temporary file, when its length is known
+    """
+    if request.content_length < 0 or "bottle.request.body" in request.environ:
+        return request.body
+    return request.environ["wsgi.input"]
+
+
 class ConanControllerV2(object):
 
     @staticmethod
@@ -34,13 +42,12 @@ class ConanControllerV2(object):
         @app.route(r.package_revision_file, method=["PUT"])
         def upload_package_file(name, version, username, channel, package_id,
                                 the_path, auth_user, revision, p_revision):
-
-            if "X-Checksum-Deploy" in request.headers:
-                raise NotFoundException("Non checksum storage")
             pref = get_package_ref(name, version, username, channel, package_id,
                                    revision, p_revision)
-            conan_service.upload_package_file(request.body, request.headers, pref,
+            conan_service.upload_package_file(_upload_body(), request.headers, pref,
                                               the_path, auth_user)
+            if "X-Checksum-Deploy" in request.headers:
+                response.status = 201  # Deployed from an identical file already in the server
 
         @app.route(r.recipe_revision_files, method=["GET"])
         def get_recipe_file_list(name, version, username, channel, auth_user, revision):
@@ -56,7 +63,8 @@ class ConanControllerV2(object):
 
         @app.route(r.recipe_revision_file, method=["PUT"])
         def upload_recipe_file(name, version, username, channel, the_path, auth_user, revision):
-            if "X-Checksum-Deploy" in request.headers:
-                raise NotFoundException("Not a checksum storage")
             ref = RecipeReference(name, version, username, channel, revision)
-            conan_service.upload_recipe_file(request.body, request.headers, ref, the_path, auth_user)
+            conan_service.upload_recipe_file(_upload_body(), request.headers, ref, the_path,
+                                             auth_user)
+            if "X-Checksum-Deploy" in request.headers:
+                response.status = 201  # Deployed from an identical file already in the server
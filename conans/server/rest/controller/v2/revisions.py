@@ -1,3 +1,7 @@
+from bottle import request
+
+from conans.errors import RequestErrorException
+from conans.model.package_ref import PkgReference
 from conans.model.recipe_ref import RecipeReference
 from conans.server.rest.bottle_routes import BottleRoutes
 from conans.server.rest.controller.v2 import get_package_ref
@@ -53,6 +57,29 @@ class RevisionsController(object):
             pref = conan_service.get_latest_package_reference(package_reference, auth_user)
             return _format_pref_return(pref)
 
+        @app.route(r.common_packages_latest, method="POST")
+        def get_latest_package_references(auth_user):
+            """ Gets a JSON with the latest revision of each of the requested package references
+            (with RREV, without PREV). Those without any revision are not in the result
+            """
+            try:
+                references = {}
+                for p in request.json["references"]:
+                    pref = PkgReference.loads(p)
+                    assert pref.ref.revision, f"{p} without recipe revision"
+                    # Same as the single package routes, that receive "_" in the URL
+                    package_reference = get_package_ref(pref.ref.name, pref.ref.version,
+                                                        pref.ref.user or "_",
+                                                        pref.ref.channel or "_", pref.package_id,
+                                                        pref.ref.revision, p_revision=None)
+                    references[package_reference] = p
+            except Exception as e:
+                raise RequestErrorException(f"Invalid list of package references: {e}")
+            conan_service = ConanServiceV2(app.authorizer, app.server_store)
+            prefs = conan_service.get_latest_package_references(references, auth_user)
+            return {"references": {references[pref]: _format_pref_return(latest)
+                                   for pref, latest in prefs.items()}}
+
 
 def _format_rev_return(rev):
     # FIXME: fix this when RecipeReference
@@ -3,6 +3,7 @@ from bottle import Bottle
 
 from conans.server.rest.api_v2 import ApiV2
 from conans.server.rest.controller.v2.ping import PingController
+from conans.server.rest.wsgi_server import WorkersServer
 
 
 class ConanServer(object):
@@ -48,5 +49,10 @@ class ConanServer(object):
         port = kwargs.pop("port", self.run_port)
         debug_set = kwargs.pop("debug", False)
         host = kwargs.pop("host", "localhost")
+        # Without threads, the default single-threaded bottle server, serving one request at a time
+        if kwargs.get("threads"):
+            kwargs["server"] = WorkersServer
+        else:
+            kwargs = {}
         bottle.Bottle.run(self.root_app, host=host,
-                          port=port, debug=debug_set, reloader=False)
+                          port=port, debug=debug_set, reloader=False, **kwargs)
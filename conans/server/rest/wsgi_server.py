@@ -0,0 +1,272 @@
+""" Built-in concurrent WSGI server of the conan_server, over the standard library wsgiref, so it
+doesn't need any external infrastructure. It serves the connections with a pool of worker threads,
+optionally in several pre-forked processes sharing the listening socket, keeps the HTTP/1.1
+connections alive, and shuts down gracefully, finishing the requests in progress.
+"""
+import os
+import queue
+import signal
+import socket
+import threading
+from wsgiref.simple_server import WSGIServer, WSGIRequestHandler, ServerHandler
+
+import bottle
+
+from conans.errors import ConanException
+
+
+class _RequestInput:
+    """ The wsgi.input of a request, limited to its Content-Length, so the connection can be
+    reused even if the application didn't read the whole body
+    """
+
+    def __init__(self, rfile, length):
+        self._rfile = rfile
+        self.remaining = length
+
+    def _size(self, size):
+        if size is None or size < 0 or size > self.remaining:
+            return self.remaining
+        return size
+
+    def read(self, size=-1):
+        data = self._rfile.read(self._size(size)) if self.remaining > 0 else b""
+        self.remaining -= len(data)
+        return data
+
+    def readline(self, size=-1):
+        data = self._rfile.readline(self._size(size)) if self.remaining > 0 else b""
+        self.remaining -= len(data)
+        return data
+
+    def readlines(self, hint=-1):
+        return list(self)
+
+    def __iter__(self):
+        line = self.readline()
+        while line:
+            yield line
+            line = self.readline()
+
+
+class _ServerHandler(ServerHandler):
+    http_version = "1.1"
+    keep_alive = False
+
+    def cleanup_headers(self):
+        super().cleanup_headers()
+        # Without Content-Length the client reads the response until the connection is closed
+        self.keep_alive = ("Content-Length" in self.headers
+                           and self.headers.get("Connection", "").lower() != "close"
+                           and not self.request_handler.server.closing)
+        if not self.keep_alive:
+            self.headers["Connection"] = "close"
+
+    def sendfile(self):
+        """ zero-copy transmission of the files that bottle serves with the wsgi.file_wrapper,
+        if they tell their range (as the service FileRange does)
+        """
+        filelike = self.result.filelike
+        try:
+            file, offset, length = filelike.file, filelike.offset, filelike.length
+        except AttributeError:
+            return False
+        if not self.headers_sent:
+            self.send_headers()
+        self.bytes_sent = self.request_handler.connection.sendfile(file, offset, length)
+        return True
+
+
+class _RequestHandler(WSGIRequestHandler):
+    """ serves the requests of a connection while the client keeps it alive
+    """
+    protocol_version = "HTTP/1.1"
+    _MAX_DISCARD = 64 * 1024  # Bigger unread bodies are not worth it, the connection is closed
+
+    def handle(self):
+        self.close_connection = True
+        self._handle_request()
+        while not self.close_connection and not self.server.closing:
+            self._handle_request()
+
+    def _handle_request(self):
+        # The idle connections only hold their worker for the keep-alive timeout
+        self.connection.settimeout(self.server.keepalive_timeout)
+        try:
+            self.raw_requestline = self.rfile.readline(65537)
+        except (socket.timeout, ConnectionError):
+            self.close_connection = True
+            return
+        if not self.raw_requestline:
+            self.close_connection = True
+            return
+        self.connection.settimeout(None)
+        if len(self.raw_requestline) > 65536:
+            self.requestline = ''
+            self.request_version = ''
+            self.command = ''
+            self.send_error(414)
+            return
+        if not self.parse_request():  # An error code has been sent, just exit
+            return
+
+        environ = self.get_environ()
+        if "HTTP_TRANSFER_ENCODING" in environ:
+            # The application decodes the chunked body by itself, can't know where it ends
+            stdin = self.rfile
+            self.close_connection = True
+        else:
+            try:
+                stdin = _RequestInput(self.rfile, int(environ.get("CONTENT_LENGTH") or 0))
+            except ValueError:
+                self.send_error(400, "Bad Content-Length")
+                return
+        handler = _ServerHandler(stdin, self.wfile, self.get_stderr(), environ,
+                                 multithread=True, multiprocess=self.server.processes > 1)
+        handler.request_handler = self  # backpointer for logging
+        handler.run(self.server.get_app())
+
+        if not handler.keep_alive:
+            self.close_connection = True
+        elif isinstance(stdin, _RequestInput) and stdin.remaining:
+            if stdin.remaining > self._MAX_DISCARD:
+                self.close_connection = True
+            else:
+                stdin.read()
+
+    def log_request(self, *args, **kwargs):
+        if not self.server.quiet:
+            super().log_request(*args, **kwargs)
+
+
+class WorkersWSGIServer(WSGIServer):
+    """ WSGIServer that serves the accepted connections with a pool of worker threads. The
+    connections wait in a bounded queue, the ones that don't fit are answered with a
+    "503 Service Unavailable", that the clients retry later, instead of piling up
+    """
+    request_queue_size = 128  # listen() backlog
+
+    def __init__(self, address, threads, processes=1, request_queue=64, keepalive_timeout=5,
+                 quiet=False):
+        super().__init__(address, _RequestHandler)
+        self.threads = max(threads, 1)
+        self.processes = processes
+        self.keepalive_timeout = keepalive_timeout
+        self.quiet = quiet
+        self.closing = False
+        self._queue = queue.Queue(maxsize=max(request_queue, 1))
+        self._workers = []
+
+    def serve_forever(self, poll_interval=0.5):
+        # The workers are started here, threads don't survive the forks of the processes
+        if not self._workers:
+            for _ in range(self.threads):
+                worker = threading.Thread(target=self._work, daemon=True)
+                worker.start()
+                self._workers.append(worker)
+        super().serve_forever(poll_interval)
+
+    def process_request(self, request, client_address):
+        try:
+            self._queue.put_nowait((request, client_address))
+        except queue.Full:
+            try:
+                request.sendall(b"HTTP/1.1 503 Service Unavailable\r\nRetry-After: 1\r\n"
+                                b"Content-Length: 0\r\nConnection: close\r\n\r\n")
+            except OSError:
+                pass
+            self.shutdown_request(request)
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    def server_close(self):
+        """ stops listening, and waits for the workers to finish the requests in progress and
+        the queued connections
+        """
+        self.closing = True
+        super().server_close()
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+
+
+def _serve(server):
+    def _shutdown(*_):
+        # shutdown() waits for serve_forever(), that runs in this (main) thread
+        threading.Thread(target=server.shutdown).start()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def _wait(children):
+    while children:
+        os.waitpid(children[0], 0)
+        children.pop(0)
+
+
+def serve(app, host, port, threads, processes=1, request_queue=64, keepalive_timeout=5,
+          quiet=False):
+    server = WorkersWSGIServer((host, port), threads, processes, request_queue,
+                               keepalive_timeout, quiet)
+    server.set_app(app)
+    if processes <= 1:
+        _serve(server)
+        return
+
+    if not hasattr(os, "fork"):
+        server.server_close()
+        raise ConanException("The conan_server 'processes' setting is not supported in this "
+                             "platform, use 'threads' instead")
+    children = []
+    for _ in range(processes):
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                _serve(server)
+                status = 0
+            finally:
+                os._exit(status)
+        children.append(pid)
+    server.socket.close()  # Only the children accept the connections
+
+    def _terminate(*_):
+        for child in children:
+            try:
+                os.kill(child, signal.SIGTERM)
+            except OSError:
+                pass
+
+    signal.signal(signal.SIGTERM, _terminate)
+    try:
+        _wait(children)
+    except KeyboardInterrupt:  # The children also got it, if it came from the terminal
+        _terminate()
+        _wait(children)
+
+
+class WorkersServer(bottle.ServerAdapter):
+    """ bottle adapter of the built-in concurrent server, the options are the ``serve()`` ones
+    """
+
+    def run(self, handler):
+        serve(handler, self.host, self.port, quiet=self.quiet, **self.options)
@@ -0,0 +1,97 @@
+import mimetypes
+import os
+import time
+
+from bottle import HTTPError, HTTPResponse, parse_date, parse_range_header, request
+
+from conans.server.service.mime import get_mime_type
+from conans.util.files import sha1sum
+
+
+class FileRange:
+    """ file-like object of a byte range of a file, that bottle serves with the wsgi.file_wrapper
+    of the server. The servers that know about its file, offset and length (the built-in
+    WorkersWSGIServer) send it with a zero-copy sendfile(), the others just read() it
+    """
+
+    def __init__(self, path, offset, length):
+        self.file = open(path, "rb")
+        self.file.seek(offset)
+        self.offset = offset
+        self.length = length
+        self._remaining = length
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self.file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def _etag_matches(header, etag):
+    if header is None:
+        return False
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in [t[2:] if t.startswith("W/") else t for t in tags]
+
+
+def serve_file(path, checksum=None):
+    """ bottle response of the file, like bottle's static_file(), plus the ETag (its sha1, also
+    sent as X-Checksum-Sha1, that the clients verify) for the If-None-Match and If-Range
+    conditional requests. A Range request gets its first range, enough for resuming and for the
+    segmented downloads of the clients, that request one range per segment
+    checksum: optional function(path, stats) returning the sha1 without reading the file, as
+    the one saved at upload time, otherwise the file is hashed
+    """
+    if not os.path.isfile(path):
+        return HTTPError(404, "File does not exist.")
+    if not os.access(path, os.R_OK):
+        return HTTPError(403, "You do not have permission to access this file.")
+
+    stats = os.stat(path)
+    sha1 = checksum(path, stats) if checksum is not None else sha1sum(path)
+    etag = '"%s"' % sha1
+    headers = {"Accept-Ranges": "bytes",
+               "ETag": etag,
+               "X-Checksum-Sha1": sha1,
+               "Last-Modified": time.strftime("%a, %d %b %Y %H:%M:%S GMT",
+                                              time.gmtime(stats.st_mtime))}
+    mimetype = get_mime_type(path)
+    if mimetype == "auto":
+        mimetype, encoding = mimetypes.guess_type(path)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+    if mimetype:
+        if mimetype.startswith("text/") and "charset" not in mimetype:
+            mimetype += "; charset=UTF-8"
+        headers["Content-Type"] = mimetype
+
+    if_none_match = request.environ.get("HTTP_IF_NONE_MATCH")
+    if if_none_match is not None:
+        if _etag_matches(if_none_match, etag):
+            return HTTPResponse(status=304, **headers)
+    else:
+        ims = request.environ.get("HTTP_IF_MODIFIED_SINCE")
+        ims = parse_date(ims.split(";")[0].strip()) if ims else None
+        if ims is not None and ims >= int(stats.st_mtime):
+            return HTTPResponse(status=304, **headers)
+
+    offset, length, status = 0, stats.st_size, 200
+    if_range = request.environ.get("HTTP_IF_RANGE")
+    if "HTTP_RANGE" in request.environ and (if_range is None or _etag_matches(if_range, etag)):
+        ranges = list(parse_range_header(request.environ["HTTP_RANGE"], stats.st_size))
+        if not ranges:
+            return HTTPError(416, "Requested Range Not Satisfiable",
+                             **{"Content-Range": "bytes */%d" % stats.st_size})
+        offset, end = ranges[0]
+        length = end - offset
+        headers["Content-Range"] = "bytes %d-%d/%d" % (offset, end - 1, stats.st_size)
+        status = 206
+    headers["Content-Length"] = str(length)
+
+    body = "" if request.method == "HEAD" else FileRange(path, offset, length)
+    return HTTPResponse(body, status=status, **headers)
@@ -11,7 +11,22 @@ from conans.server.utils.files import list_folder_subdirs
 from conans.util.files import load
 
 
+def _get_indexed_infos_min(server_store, ref):
+    result = {}
+    for package_id, prev, content in server_store.metadata_index.packages(ref):
+        if content is None:  # It was not there when indexed, but it should be now
+            info_path = os.path.join(server_store.package(PkgReference(ref, package_id, prev)),
+                                     CONANINFO)
+            if not os.path.exists(info_path):
+                raise Exception(f"No conaninfo.txt file for listed {ref}:{package_id}#{prev}")
+            content = load(info_path)
+        result[package_id] = {"content": content}
+    return result
+
+
 def _get_local_infos_min(server_store, ref):
+    if server_store.metadata_index is not None:
+        return _get_indexed_infos_min(server_store, ref)
     result = {}
     new_ref = ref
     subdirs = list_folder_subdirs(server_store.packages(new_ref), level=1)
@@ -70,29 +85,30 @@ class SearchService(object):
         return info
 
     def _search_recipes(self, pattern=None, ignorecase=True):
-        subdirs = list_folder_subdirs(basedir=self._server_store.store, level=5)
+        if self._server_store.metadata_index is not None:
+            refs = self._server_store.metadata_index.recipes()
+        else:
+            subdirs = list_folder_subdirs(basedir=self._server_store.store, level=5)
 
-        def underscore_to_none(field):
-            return field if field != "_" else None
+            def underscore_to_none(field):
+                return field if field != "_" else None
 
-        if not pattern:
-            ret = []
+            refs = []
             for folder in subdirs:
                 fields_dir = [underscore_to_none(d) for d in folder.split("/")]
                 r = RecipeReference(*fields_dir)
                 r.revision = None
-                ret.append(r)
-            return sorted(ret)
+                refs.append(r)
+
+        if not pattern:
+            return sorted(refs)
         else:
             # Conan references in main storage
             pattern = str(pattern)
             b_pattern = translate(pattern)
             b_pattern = re.compile(b_pattern, re.IGNORECASE) if ignorecase else re.compile(b_pattern)
             ret = set()
-            for subdir in subdirs:
-                fields_dir = [underscore_to_none(d) for d in subdir.split("/")]
-                new_ref = RecipeReference(*fields_dir)
-                new_ref.revision = None
+            for new_ref in refs:
                 if new_ref.partial_match(b_pattern):
                     ret.add(new_ref)
 
@@ -1,14 +1,12 @@
 import copy
 import os
 
-from bottle import FileUpload, static_file
-
-from conans.errors import RecipeNotFoundException, PackageNotFoundException, NotFoundException
+from conans.errors import RecipeNotFoundException, PackageNotFoundException, NotFoundException, \
+    RequestErrorException, ForbiddenException, AuthenticationException
 from conan.internal.paths import CONAN_MANIFEST
 from conans.model.package_ref import PkgReference
-from conans.server.service.mime import get_mime_type
+from conans.server.service.file_response import serve_file
 from conans.server.store.server_store import ServerStore
-from conans.util.files import mkdir
 
 
 class ConanServiceV2:
@@ -34,14 +32,13 @@ class ConanServiceV2:
     def get_recipe_file(self, reference, filename, auth_user):
         self._authorizer.check_read_conan(auth_user, reference)
         path = self._server_store.get_recipe_file_path(reference, filename)
-        return static_file(os.path.basename(path), root=os.path.dirname(path),
-                           mimetype=get_mime_type(path))
+        return serve_file(path, self._server_store.blob_store.checksum)
 
     def upload_recipe_file(self, body, headers, reference, filename, auth_user):
         self._authorizer.check_write_conan(auth_user, reference)
         # FIXME: Check that reference contains revision (MANDATORY TO UPLOAD)
         path = self._server_store.get_recipe_file_path(reference, filename)
-        self._upload_to_path(body, headers, path)
+        self._upload_to_path(body, headers, path, auth_user)
 
         # If the upload was ok, of the manifest, update the pointer to the latest
         if filename == CONAN_MANIFEST:
@@ -81,6 +78,18 @@ class ConanServiceV2:
             raise PackageNotFoundException(pref)
         return _pref
 
+    def get_latest_package_references(self, prefs, auth_user):
+        """ the latest package revision of each of the given prefs, the ones without any
+        package revision are not returned
+        """
+        result = {}
+        for pref in prefs:
+            self._authorizer.check_read_conan(auth_user, pref.ref)
+            latest = self._server_store.get_last_package_revision(pref)
+            if latest:
+                result[pref] = latest
+        return result
+
     # PACKAGE METHODS
     def get_package_file_list(self, pref, auth_user):
         self._authorizer.check_read_conan(auth_user, pref.ref)
@@ -93,8 +102,7 @@ class ConanServiceV2:
     def get_package_file(self, pref, filename, auth_user):
         self._authorizer.check_read_conan(auth_user, pref.ref)
         path = self._server_store.get_package_file_path(pref, filename)
-        return static_file(os.path.basename(path), root=os.path.dirname(path),
-                           mimetype=get_mime_type(path))
+        return serve_file(path, self._server_store.blob_store.checksum)
 
     def upload_package_file(self, body, headers, pref, filename, auth_user):
         self._authorizer.check_write_conan(auth_user, pref.ref)
@@ -104,23 +112,55 @@ class ConanServiceV2:
         if not os.path.exists(recipe_path):
             raise RecipeNotFoundException(pref.ref)
         path = self._server_store.get_package_file_path(pref, filename)
-        self._upload_to_path(body, headers, path)
+        self._upload_to_path(body, headers, path, auth_user)
 
         # If the upload was ok, of the manifest, update the pointer to the latest
         if filename == CONAN_MANIFEST:
             self._server_store.update_last_package_revision(pref)
 
     # Misc
-    @staticmethod
-    def _upload_to_path(body, headers, path):
-        file_saver = FileUpload(body, None,
-                                filename=os.path.basename(path),
-                                headers=headers)
-        if os.path.exists(path):
-            os.unlink(path)
-        if not os.path.exists(os.path.dirname(path)):
-            mkdir(os.path.dirname(path))
-        file_saver.save(os.path.dirname(path))
+    def _upload_to_path(self, body, headers, path, auth_user):
+        """ streams the body to a temporary file, verifying its X-Checksum-Sha1 (if sent), and
+        moves it into place. The X-Checksum-Deploy uploads (without body) are deployed from an
+        identical file already in the server, if there is any that the user can read
+        """
+        blob_store = self._server_store.blob_store
+        sha1 = headers.get("X-Checksum-Sha1")
+        sha1 = sha1.lower() if sha1 else None
+        if "X-Checksum-Deploy" in headers:
+            # Otherwise the user could get the files of the references it cannot read
+            if (sha1 is None or not self._can_read_blob(sha1, auth_user)
+                    or not blob_store.link(sha1, path)):
+                raise NotFoundException("Not in the checksum storage")
+            return
+
+        length = headers.get("Content-Length")
+        try:
+            length = int(length) if length else None
+        except ValueError:
+            raise RequestErrorException("Invalid Content-Length: %s" % length)
+        tmp, size, tmp_sha1 = blob_store.receive(body, length)
+        if length is not None and size != length:
+            blob_store.discard(tmp)
+            raise RequestErrorException("Incomplete upload of %s: %s < %s bytes"
+                                        % (os.path.basename(path), size, length))
+        if sha1 is not None and sha1 != tmp_sha1:
+            blob_store.discard(tmp)
+            raise RequestErrorException("Corrupted upload of %s: sha1 checksum %s != %s"
+                                        % (os.path.basename(path), tmp_sha1, sha1))
+        blob_store.commit(tmp, path, tmp_sha1)
+
+    def _can_read_blob(self, sha1, auth_user):
+        for path in self._server_store.blob_store.linked_files(sha1):
+            ref = self._server_store.path_reference(path)
+            if ref is None:
+                continue
+            try:
+                self._authorizer.check_read_conan(auth_user, ref)
+                return True
+            except (ForbiddenException, AuthenticationException):
+                pass
+        return False
 
     # REMOVE
     def remove_recipe(self, ref, auth_user):
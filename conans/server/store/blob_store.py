@@ -0,0 +1,238 @@
+import hashlib
+import os
+import re
+import tempfile
+import uuid
+
+from conans.util.files import md5, sha1sum
+
+_SHA1_RE = re.compile(r"^[0-9a-f]{40}$")
+
+
+class BlobStore:
+    """ Content-addressed store of the uploaded files of the server, keyed by their sha1 and shared
+    by all the references and revisions. The storage files are hardlinks to the blobs, so identical
+    files are stored only once, and the checksum-deploy uploads (X-Checksum-Deploy) of the files
+    already in the server are just linked, without transferring them again.
+    The uploads are received in its "tmp" folder, in the same filesystem as the storage, so they
+    are atomically moved into place.
+    The reference counting is the filesystem links count: a blob with only 1 link is not used by
+    any reference anymore and it can be garbage collected. The files of the storage must never be
+    modified in place, they are always replaced.
+    The storage files linked to every blob are recorded in its "<sha1>.paths" file, so the
+    checksum-deploy can check that the user can read some of them. Its entries might be stale,
+    the files are checked to still be links of the blob.
+    The sha1 of every storage file is also saved when it is uploaded, in the "checksums" folder
+    (keyed by the md5 of its path, with its size and modification time to validate it), so the
+    downloads and the collection of the blobs don't need to hash them.
+    """
+    _CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, folder):
+        self._folder = folder
+        self._tmp_folder = os.path.join(folder, "tmp")
+        self._checksums_folder = os.path.join(folder, "checksums")
+        self._storage_folder = os.path.dirname(folder)
+
+    def _blob_path(self, sha1):
+        return os.path.join(self._folder, sha1[:2], sha1)
+
+    def _checksum_path(self, path):
+        # Flat, not mirroring the storage tree, that would look like references to the searches
+        key = md5(os.path.relpath(path, self._storage_folder))
+        return os.path.join(self._checksums_folder, key[:2], key)
+
+    def _save_checksum(self, path, sha1, stats=None):
+        checksum_path = self._checksum_path(path)
+        tmp = os.path.join(self._tmp_folder, uuid.uuid4().hex)
+        try:
+            stats = stats or os.stat(path)
+            os.makedirs(self._tmp_folder, exist_ok=True)
+            os.makedirs(os.path.dirname(checksum_path), exist_ok=True)
+            with open(tmp, "w") as f:
+                f.write("%s %d %d" % (sha1, stats.st_size, stats.st_mtime_ns))
+            os.replace(tmp, checksum_path)
+        except OSError:  # It will be computed again when needed
+            self.discard(tmp)
+
+    def checksum(self, path, stats):
+        """ sha1 of the storage file (stats is its os.stat()), the one saved when it was uploaded
+        if it was not modified since then, otherwise it is computed and saved
+        """
+        try:
+            with open(self._checksum_path(path)) as f:
+                sha1, size, mtime_ns = f.read().split()
+            if (int(size), int(mtime_ns)) == (stats.st_size, stats.st_mtime_ns):
+                return sha1
+        except (OSError, ValueError):  # Missing, or a previous version of the server
+            pass
+        sha1 = sha1sum(path)
+        self._save_checksum(path, sha1, stats)
+        return sha1
+
+    def forget(self, paths):
+        """ removes the saved checksums of these files (or the files in these folders), before
+        removing them from the storage
+        """
+        for path in paths:
+            files = [path] if os.path.isfile(path) else \
+                [os.path.join(root, f) for root, _, names in os.walk(path) for f in names]
+            for f in files:
+                self.discard(self._checksum_path(f))
+
+    def _record(self, blob, path):
+        try:
+            with open(blob + ".paths", "a") as f:  # Appending a line is atomic, no need to lock
+                f.write(os.path.relpath(path, self._storage_folder) + "\n")
+        except OSError:  # The file won't be checksum-deployed, but it is stored fine
+            pass
+
+    def linked_files(self, sha1):
+        """ the files of the storage that are links to the blob with that sha1
+        """
+        if not _SHA1_RE.match(sha1):  # It comes from the clients, it shouldn't be a path
+            return []
+        blob = self._blob_path(sha1)
+        try:
+            with open(blob + ".paths") as f:
+                paths = set(f.read().splitlines())
+            blob_ino = os.stat(blob).st_ino
+        except OSError:
+            return []
+        result = []
+        for path in sorted(paths):
+            path = os.path.join(self._storage_folder, path)
+            try:
+                if os.stat(path).st_ino == blob_ino:
+                    result.append(path)
+            except OSError:
+                pass
+        return result
+
+    def receive(self, stream, length=None):
+        """ streams the contents (up to length bytes, if defined) to a temporary file, hashing
+        them while they are written. Returns (tmp_path, size, sha1), the temporary file has to be
+        commit() or discard()
+        """
+        os.makedirs(self._tmp_folder, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self._tmp_folder)
+        sha1 = hashlib.sha1()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while length is None or size < length:
+                    chunk_size = self._CHUNK_SIZE if length is None \
+                        else min(self._CHUNK_SIZE, length - size)
+                    chunk = stream.read(chunk_size)
+                    if not chunk:
+                        break
+                    sha1.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            self.discard(tmp)
+            raise
+        return tmp, size, sha1.hexdigest()
+
+    @staticmethod
+    def discard(tmp):
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+    def commit(self, tmp, path, sha1):
+        """ moves the received temporary file to the path, linked to the blob of its contents,
+        that is added to the store if it is new
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if self.link(sha1, path):
+            self.discard(tmp)
+            return
+        os.replace(tmp, path)
+        self._save_checksum(path, sha1)
+        blob = self._blob_path(sha1)
+        try:
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            os.link(path, blob)
+        except OSError:  # No hardlinks support, or a concurrent upload added it, not deduplicated
+            return
+        self._record(blob, path)
+
+    def link(self, sha1, path):
+        """ replaces (or creates) the path with a link to the blob with that sha1, if it is in the
+        store, and returns if it was
+        """
+        if not _SHA1_RE.match(sha1):  # It comes from the clients, it shouldn't be a path
+            return False
+        blob = self._blob_path(sha1)
+        if not os.path.isfile(blob):
+            return False
+        tmp = os.path.join(self._tmp_folder, uuid.uuid4().hex)
+        try:
+            if os.path.exists(path) and os.path.samefile(blob, path):
+                return True
+            os.makedirs(self._tmp_folder, exist_ok=True)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.link(blob, tmp)
+            os.replace(tmp, path)
+        except OSError:  # Collected concurrently, or no hardlinks support
+            self.discard(tmp)
+            return False
+        self._save_checksum(path, sha1)
+        self._record(blob, path)
+        return True
+
+    def blobs(self, paths):
+        """ the blobs that are only linked by these files (or the files in these folders), so they
+        are no longer used once they are removed, to collect() them after removing them. Only the
+        files with such a blob are checked, with their saved checksum
+        """
+        if not os.path.isdir(self._folder):
+            return []
+        files = {}  # {inode: (path, stats, links to the inode in the paths)}
+        for path in paths:
+            if os.path.isfile(path):
+                candidates = [path]
+            else:
+                candidates = [os.path.join(root, f) for root, _, names in os.walk(path)
+                              for f in names]
+            for candidate in candidates:
+                try:
+                    stats = os.stat(candidate)
+                except OSError:
+                    continue
+                if stats.st_nlink > 1:  # Not deduplicated otherwise
+                    _, _, count = files.get(stats.st_ino, (None, None, 0))
+                    files[stats.st_ino] = candidate, stats, count + 1
+
+        result = []
+        for path, stats, count in files.values():
+            if stats.st_nlink != count + 1:  # Still used by other files, or not a blob link
+                continue
+            try:
+                blob = self._blob_path(self.checksum(path, stats))
+                if os.stat(blob).st_ino == stats.st_ino:
+                    result.append(blob)
+            except OSError:
+                pass
+        return result
+
+    def collect(self, blobs=None):
+        """ removes the given blobs (or all of them if None) that are not linked by any file of
+        the storage. The full scan is for the maintenance (conan_server --collect-blobs)
+        """
+        if blobs is None:
+            if not os.path.isdir(self._folder):
+                return
+            blobs = [os.path.join(self._folder, d, b) for d in os.listdir(self._folder)
+                     if d not in ("tmp", "checksums")
+                     for b in os.listdir(os.path.join(self._folder, d))
+                     if _SHA1_RE.match(b)]
+        for blob in blobs:
+            try:
+                if os.stat(blob).st_nlink == 1:
+                    os.remove(blob)
+                    self.discard(blob + ".paths")
+            except OSError:
+                pass
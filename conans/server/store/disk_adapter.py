@@ -5,7 +5,8 @@ import fasteners
 
 from conans.errors import NotFoundException
 from conans.util.files import md5sum, rmdir
-from conans.server.utils.files import path_exists, relative_dirs
+from conans.server.utils.files import path_exists, relative_dirs, is_case_sensitive, \
+    DirListingCache
 
 
 @contextmanager
@@ -23,9 +24,12 @@ class ServerDiskAdapter(object):
         self.base_url = base_url
         # URLs are generated removing this base path
         self._store_folder = base_storage_path
+        # Detected once, the case checks of case insensitive filesystems use the cached listings
+        is_case_sensitive(base_storage_path)
+        self._listings = DirListingCache()
 
     def _get_paths(self, absolute_path, files_subset):
-        if not path_exists(absolute_path, self._store_folder):
+        if not path_exists(absolute_path, self._store_folder, self._listings):
             raise NotFoundException("")
         paths = relative_dirs(absolute_path)
         if files_subset is not None:
@@ -44,15 +48,22 @@ class ServerDiskAdapter(object):
 
     def delete_folder(self, path):
         """Delete folder from disk. Path already contains base dir"""
-        if not path_exists(path, self._store_folder):
+        if not path_exists(path, self._store_folder, self._listings):
             raise NotFoundException("")
         rmdir(path)
+        self._listings.invalidate(path)
 
     def delete_file(self, path):
         """Delete files from bucket. Path already contains base dir"""
-        if not path_exists(path, self._store_folder):
+        if not path_exists(path, self._store_folder, self._listings):
             raise NotFoundException("")
         os.remove(path)
+        self._listings.invalidate(path)
+
+    def invalidate_listings(self, path):
+        """ to be called when the path is removed without this adapter
+        """
+        self._listings.invalidate(path)
 
     def path_exists(self, path):
         return os.path.exists(path)
@@ -0,0 +1,110 @@
+from conan.internal.cache.db.table import BaseDbTable, DbConnections
+from conans.model.recipe_ref import RecipeReference
+from conans.server.store.server_store import ref_dir_repr
+
+
+# The references are stored as their storage folders: name/version/user/channel, with "_" for
+# the empty user and channel, as the server references can have both "_" and None for them
+class _RecipesTable(BaseDbTable):
+    table_name = "recipes"
+    columns_description = [("reference", str),
+                           ("rrev", str)]
+    unique_together = ("reference", "rrev")
+
+
+class _PackagesTable(BaseDbTable):
+    """ only the latest package revision of every package_id, the one used by the searches
+    """
+    table_name = "packages"
+    columns_description = [("reference", str),
+                           ("rrev", str),
+                           ("package_id", str),
+                           ("prev", str),
+                           ("timestamp", float),
+                           ("conaninfo", str, True)]
+    unique_together = ("reference", "rrev", "package_id")
+
+
+class MetadataIndex:
+    """ SQLite index of the recipe revisions and the latest package revisions (with their
+    conaninfo.txt) of the server storage, so the searches don't need to walk the whole storage
+    and read every package. The revisions.txt files are still the source of truth, the index is
+    updated after them, and it can be rebuilt from them with ``conan_server --rebuild-index``
+    """
+
+    def __init__(self, filename):
+        self._connections = DbConnections(filename, wal=True)
+        self._recipes = _RecipesTable(filename, self._connections)
+        self._packages = _PackagesTable(filename, self._connections)
+        self._recipes.create_table()
+        self._packages.create_table()
+
+    def transaction(self):
+        return self._connections.transaction()
+
+    def clear(self):
+        with self.transaction(), self._connections.connection() as conn:
+            conn.execute("DELETE FROM recipes;")
+            conn.execute("DELETE FROM packages;")
+
+    def set_recipe_revisions(self, ref, revisions):
+        """ replaces the revisions of the reference (without revision)
+        """
+        with self.transaction(), self._connections.connection() as conn:
+            conn.execute("DELETE FROM recipes WHERE reference = ?;", (ref_dir_repr(ref),))
+            conn.executemany("INSERT INTO recipes VALUES (?, ?);",
+                             [(ref_dir_repr(ref), rrev) for rrev in revisions])
+
+    def set_package(self, pref, conaninfo):
+        """ pref is the latest package revision of its package_id, or a pref without revision
+        if there are no package revisions anymore
+        """
+        reference = ref_dir_repr(pref.ref)
+        with self.transaction(), self._connections.connection() as conn:
+            conn.execute("DELETE FROM packages WHERE reference = ? AND rrev = ? "
+                         "AND package_id = ?;", (reference, pref.ref.revision, pref.package_id))
+            if pref.revision is not None:
+                conn.execute("INSERT INTO packages VALUES (?, ?, ?, ?, ?, ?);",
+                             (reference, pref.ref.revision, pref.package_id, pref.revision,
+                              pref.timestamp, conaninfo))
+
+    def remove_recipe(self, ref):
+        """ all the revisions (and packages) of the reference, or only the given revision
+        """
+        with self.transaction(), self._connections.connection() as conn:
+            if ref.revision is None:
+                conn.execute("DELETE FROM recipes WHERE reference = ?;", (ref_dir_repr(ref),))
+                conn.execute("DELETE FROM packages WHERE reference = ?;", (ref_dir_repr(ref),))
+            else:
+                conn.execute("DELETE FROM recipes WHERE reference = ? AND rrev = ?;",
+                             (ref_dir_repr(ref), ref.revision))
+                conn.execute("DELETE FROM packages WHERE reference = ? AND rrev = ?;",
+                             (ref_dir_repr(ref), ref.revision))
+
+    def remove_packages(self, ref, package_ids=None):
+        with self.transaction(), self._connections.connection() as conn:
+            if not package_ids:
+                conn.execute("DELETE FROM packages WHERE reference = ? AND rrev = ?;",
+                             (ref_dir_repr(ref), ref.revision))
+            else:
+                conn.executemany("DELETE FROM packages WHERE reference = ? AND rrev = ? "
+                                 "AND package_id = ?;",
+                                 [(ref_dir_repr(ref), ref.revision, p) for p in package_ids])
+
+    def recipes(self):
+        """ one reference (without revision) per recipe revision, as the storage folders
+        """
+        with self._connections.connection() as conn:
+            rows = conn.execute("SELECT reference FROM recipes;").fetchall()
+        return [RecipeReference(*[f if f != "_" else None for f in row[0].split("/")])
+                for row in rows]
+
+    def packages(self, ref):
+        """ [(package_id, prev, conaninfo)] of the latest package revisions of the recipe
+        revision, conaninfo can be None if it was not in the storage when indexed
+        """
+        with self._connections.connection() as conn:
+            rows = conn.execute("SELECT package_id, prev, conaninfo FROM packages "
+                                "WHERE reference = ? AND rrev = ? ORDER BY package_id;",
+                                (ref_dir_repr(ref), ref.revision)).fetchall()
+        return rows
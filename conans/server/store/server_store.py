@@ -2,14 +2,18 @@ import os
 from os.path import join, normpath, relpath
 
 from conans.errors import ConanException, PackageNotFoundException, RecipeNotFoundException
-from conan.internal.paths import CONAN_MANIFEST
+from conan.internal.paths import CONAN_MANIFEST, CONANINFO
 from conans.model.package_ref import PkgReference
 from conans.model.recipe_ref import RecipeReference
 from conans.server.revision_list import RevisionList
+from conans.server.store.blob_store import BlobStore
+from conans.server.utils.files import list_folder_subdirs
+from conans.util.files import load
 
 REVISIONS_FILE = "revisions.txt"
 SERVER_EXPORT_FOLDER = "export"
 SERVER_PACKAGES_FOLDER = "package"
+BLOBS_FOLDER = ".blobs"
 
 
 def ref_dir_repr(ref):
@@ -18,9 +22,12 @@ def ref_dir_repr(ref):
 
 class ServerStore(object):
 
-    def __init__(self, storage_adapter):
+    def __init__(self, storage_adapter, metadata_index=None):
         self._storage_adapter = storage_adapter
         self._store_folder = storage_adapter._store_folder
+        # Optional MetadataIndex, to serve the searches without walking the storage
+        self.metadata_index = metadata_index
+        self.blob_store = BlobStore(join(self._store_folder, BLOBS_FOLDER))
 
     @property
     def store(self):
@@ -55,6 +62,16 @@ class ServerStore(object):
     def export(self, ref):
         return join(self.base_folder(ref), SERVER_EXPORT_FOLDER)
 
+    def path_reference(self, path):
+        """ the recipe reference (with revision) of a file of the storage, None if it is not
+        the file of a recipe or package
+        """
+        parts = relpath(path, self.store).split(os.sep)
+        if len(parts) < 7 or parts[5] not in (SERVER_EXPORT_FOLDER, SERVER_PACKAGES_FOLDER):
+            return None
+        fields = [f if f != "_" else None for f in parts[:4]]
+        return RecipeReference(*fields, revision=parts[4])
+
     def get_recipe_file_path(self, ref, filename):
         abspath = join(self.export(ref), filename)
         return abspath
@@ -104,17 +121,27 @@ class ServerStore(object):
                     os.rmdir(ref_path)
                 except OSError:
                     break  # not empty
+                self._storage_adapter.invalidate_listings(ref_path)
             ref_path = os.path.dirname(ref_path)
 
     # ######### DELETE (APIv1 and APIv2)
     def remove_recipe(self, ref):
         assert isinstance(ref, RecipeReference)
         if not ref.revision:
-            self._storage_adapter.delete_folder(self.conan_revisions_root(ref))
+            folder = self.conan_revisions_root(ref)
+            blobs = self.blob_store.blobs([folder])
+            self.blob_store.forget([folder])
+            self._storage_adapter.delete_folder(folder)
         else:
-            self._storage_adapter.delete_folder(self.base_folder(ref))
+            folder = self.base_folder(ref)
+            blobs = self.blob_store.blobs([folder])
+            self.blob_store.forget([folder])
+            self._storage_adapter.delete_folder(folder)
             self._remove_revision_from_index(ref)
+        if self.metadata_index is not None:
+            self.metadata_index.remove_recipe(ref)
         self._delete_empty_dirs(ref)
+        self.blob_store.collect(blobs)
 
     def remove_packages(self, ref, package_ids_filter):
         assert isinstance(ref, RecipeReference)
@@ -122,34 +149,53 @@ class ServerStore(object):
 
         if not package_ids_filter:  # Remove all packages
             packages_folder = self.packages(ref)
+            blobs = self.blob_store.blobs([packages_folder])
+            self.blob_store.forget([packages_folder])
             self._storage_adapter.delete_folder(packages_folder)
         else:
-            for package_id in package_ids_filter:
-                pref = PkgReference(ref, package_id)
-                # Remove all package revisions
-                package_folder = self.package_revisions_root(pref)
+            # Remove all package revisions
+            folders = [self.package_revisions_root(PkgReference(ref, package_id))
+                       for package_id in package_ids_filter]
+            blobs = self.blob_store.blobs(folders)
+            self.blob_store.forget(folders)
+            for package_folder in folders:
                 self._storage_adapter.delete_folder(package_folder)
+        if self.metadata_index is not None:
+            self.metadata_index.remove_packages(ref, package_ids_filter)
         self._delete_empty_dirs(ref)
+        self.blob_store.collect(blobs)
 
     def remove_package(self, pref):
         assert isinstance(pref, PkgReference)
         assert pref.revision is not None, "BUG: server store needs PREV remove_package"
         assert pref.ref.revision is not None, "BUG: server store needs RREV remove_package"
         package_folder = self.package(pref)
+        blobs = self.blob_store.blobs([package_folder])
+        self.blob_store.forget([package_folder])
         self._storage_adapter.delete_folder(package_folder)
         self._remove_package_revision_from_index(pref)
+        self._update_metadata_index_package(pref)
+        self.blob_store.collect(blobs)
 
     def remove_all_packages(self, ref):
         assert ref.revision is not None, "BUG: server store needs RREV remove_all_packages"
         assert isinstance(ref, RecipeReference)
         packages_folder = self.packages(ref)
+        blobs = self.blob_store.blobs([packages_folder])
+        self.blob_store.forget([packages_folder])
         self._storage_adapter.delete_folder(packages_folder)
+        if self.metadata_index is not None:
+            self.metadata_index.remove_packages(ref)
+        self.blob_store.collect(blobs)
 
     def remove_package_files(self, pref, files):
         subpath = self.package(pref)
-        for filepath in files:
-            path = join(subpath, filepath)
+        paths = [join(subpath, filepath) for filepath in files]
+        blobs = self.blob_store.blobs(paths)
+        self.blob_store.forget(paths)
+        for path in paths:
             self._storage_adapter.delete_file(path)
+        self.blob_store.collect(blobs)
 
     def get_upload_package_urls(self, pref, filesizes, user):
         """
@@ -217,11 +263,50 @@ class ServerStore(object):
         assert(isinstance(ref, RecipeReference))
         rev_file_path = self._recipe_revisions_file(ref)
         self._update_last_revision(rev_file_path, ref)
+        self._update_metadata_index_recipe(ref)
 
     def update_last_package_revision(self, pref):
         assert(isinstance(pref, PkgReference))
         rev_file_path = self._package_revisions_file(pref)
         self._update_last_revision(rev_file_path, pref)
+        self._update_metadata_index_package(pref)
+
+    # Methods to manage the optional metadata index, always updated after the revisions files
+    def _update_metadata_index_recipe(self, ref):
+        if self.metadata_index is None:
+            return
+        rev_list = self._get_revisions_list(self._recipe_revisions_file(ref))
+        ref_norev = RecipeReference(ref.name, ref.version, ref.user, ref.channel)
+        self.metadata_index.set_recipe_revisions(ref_norev,
+                                                 [r.revision for r in rev_list.as_list()])
+
+    def _update_metadata_index_package(self, pref):
+        if self.metadata_index is None:
+            return
+        latest = self.get_last_package_revision(PkgReference(pref.ref, pref.package_id))
+        conaninfo = None
+        if latest is None:
+            latest = PkgReference(pref.ref, pref.package_id)
+        else:
+            info_path = os.path.join(self.package(latest), CONANINFO)
+            if os.path.exists(info_path):
+                conaninfo = load(info_path)
+        self.metadata_index.set_package(latest, conaninfo)
+
+    def rebuild_metadata_index(self):
+        """ scans the whole storage to regenerate the metadata index from the revisions files
+        """
+        with self.metadata_index.transaction():
+            self.metadata_index.clear()
+            for folder in list_folder_subdirs(self.store, level=4):
+                fields = [f if f != "_" else None for f in folder.split("/")]
+                ref = RecipeReference(*fields)
+                self._update_metadata_index_recipe(ref)
+                rev_list = self._get_revisions_list(self._recipe_revisions_file(ref))
+                for rev in rev_list.as_list():
+                    ref_rev = RecipeReference(*fields, revision=rev.revision)
+                    for package_id in list_folder_subdirs(self.packages(ref_rev), level=1):
+                        self._update_metadata_index_package(PkgReference(ref_rev, package_id))
 
     def _update_last_revision(self, rev_file_path, ref):
         if self._storage_adapter.path_exists(rev_file_path):
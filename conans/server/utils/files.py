@@ -1,5 +1,9 @@
 import os
-import sys
+import tempfile
+import threading
+
+# {folder: bool} filesystem case sensitivity, detected only once per folder
+_case_sensitive_folders = {}
 
 
 def list_folder_subdirs(basedir, level):
@@ -15,22 +19,74 @@ def list_folder_subdirs(basedir, level):
     return ret
 
 
-def path_exists(path, basedir):
-    """Case sensitive, for windows, optional
+def is_case_sensitive(folder):
+    """ whether the filesystem of the folder is case sensitive, checking the actual behavior with
+    a temporary file, as it doesn't depend only on the platform (macOS, WSL, mounted volumes...)
+    """
+    result = _case_sensitive_folders.get(folder)
+    if result is None:
+        try:
+            with tempfile.NamedTemporaryFile(prefix="CaseCheck", dir=folder) as f:
+                lower_name = os.path.basename(f.name).lower()
+                result = not os.path.exists(os.path.join(folder, lower_name))
+        except OSError:
+            return False  # Not cached, the folder might not exist yet or be read-only
+        _case_sensitive_folders[folder] = result
+    return result
+
+
+class DirListingCache:
+    """ os.listdir() of the folders, for the case checks of path_exists() in case insensitive
+    filesystems. A name not found in a listing is listed again, in case it was just created, so
+    only the removals need to invalidate them
+    """
+    _MAX_LISTINGS = 10000
+
+    def __init__(self):
+        self._listings = {}
+        self._lock = threading.Lock()
+
+    def contains(self, folder, name):
+        listing = self._listings.get(folder)
+        if listing is None or name not in listing:
+            listing = set(os.listdir(folder))
+            with self._lock:
+                if len(self._listings) >= self._MAX_LISTINGS:
+                    self._listings.clear()
+                self._listings[folder] = listing
+        return name in listing
+
+    def invalidate(self, path):
+        """ path was removed, forget the listing of its parent and the ones inside it
+        """
+        path = os.path.normpath(path)
+        parent = os.path.dirname(path)
+        with self._lock:
+            for folder in list(self._listings):
+                if folder in (path, parent) or folder.startswith(path + os.sep):
+                    self._listings.pop(folder, None)
+
+
+def path_exists(path, basedir, listings=None):
+    """Case sensitive, also for case insensitive filesystems (Windows, macOS)
     basedir for skip caps check for tmp folders in testing for example (returned always
-    in lowercase for some strange reason)"""
+    in lowercase for some strange reason). The optional DirListingCache avoids listing the
+    same folders in every call"""
     exists = os.path.exists(path)
-    if not exists or sys.platform == "linux2":
+    if not exists or is_case_sensitive(basedir):
         return exists
 
     path = os.path.normpath(path)
     path = os.path.relpath(path, basedir)
     chunks = path.split(os.sep)
-    tmp = basedir
+    tmp = os.path.normpath(basedir)
 
     for chunk in chunks:
-        if chunk and chunk not in os.listdir(tmp):
-            return False
+        if chunk:
+            found = listings.contains(tmp, chunk) if listings is not None \
+                else chunk in os.listdir(tmp)
+            if not found:
+                return False
         tmp = os.path.normpath(tmp + os.sep + chunk)
     return True
 
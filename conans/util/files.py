@@ -5,9 +5,11 @@ import os
 import platform
 import shutil
 import stat
+import struct
 import sys
 import tarfile
 import time
+import zlib
 
 from contextlib import contextmanager
 
@@ -257,10 +259,131 @@ def mkdir(path):
     os.makedirs(path)
 
 
-def gzopen_without_timestamps(name, mode="r", fileobj=None, compresslevel=None, **kwargs):
+def _deflate_block(data, zdict, compresslevel, last):
+    if zdict:
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS,
+                                      zlib.DEF_MEM_LEVEL, zlib.Z_DEFAULT_STRATEGY, zdict)
+    else:
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if last
+                                                        else zlib.Z_SYNC_FLUSH)
+
+
+class ParallelGzipWriter:
+    """ Block-parallel (pigz-like) gzip writer. The data is split in fixed size blocks that are
+    deflated in a thread pool, each one using the last 32KB of the previous block as dictionary
+    and ending in a sync flush, so their concatenation is a single standard gzip member.
+    The output only depends on the data, the compresslevel and the block size, never on the
+    number of threads, so it is reproducible
+    """
+    BLOCK_SIZE = 128 * 1024
+    _DICT_SIZE = 32 * 1024
+
+    def __init__(self, name, fileobj, compresslevel=9, threads=1):
+        from multiprocessing.pool import ThreadPool
+        self._fileobj = fileobj
+        self._compresslevel = compresslevel
+        self._pool = ThreadPool(threads)
+        self._max_pending = 2 * threads  # bound the memory of the blocks being compressed
+        self._pending = []  # results of the blocks in order
+        self._buffer = bytearray()
+        self._zdict = None
+        self._crc = 0
+        self._size = 0
+        self._closed = False
+        try:
+            self._write_header(name)
+        except BaseException:
+            self._pool.close()
+            self._pool.join()
+            raise
+
+    def _write_header(self, name):
+        # Same header as gzip.GzipFile with mtime=0
+        try:
+            fname = os.path.basename(name).encode("latin-1") if name else b""
+        except UnicodeEncodeError:
+            fname = b""
+        if fname.endswith(b".gz"):
+            fname = fname[:-3]
+        flags = b"\010" if fname else b"\000"
+        if self._compresslevel == 9:
+            xfl = b"\002"
+        elif self._compresslevel == 1:
+            xfl = b"\004"
+        else:
+            xfl = b"\000"
+        self._fileobj.write(b"\037\213\010" + flags + struct.pack("<L", 0) + xfl + b"\377")
+        if fname:
+            self._fileobj.write(fname + b"\000")
+
+    def tell(self):
+        return self._size
+
+    def write(self, data):
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        self._buffer += data
+        while len(self._buffer) >= self.BLOCK_SIZE:
+            block = bytes(self._buffer[:self.BLOCK_SIZE])
+            del self._buffer[:self.BLOCK_SIZE]
+            self._submit(block, last=False)
+        return len(data)
+
+    def _submit(self, block, last):
+        result = self._pool.apply_async(_deflate_block, (block, self._zdict, self._compresslevel,
+                                                         last))
+        self._pending.append(result)
+        self._zdict = block[-self._DICT_SIZE:]
+        while len(self._pending) > self._max_pending:
+            self._fileobj.write(self._pending.pop(0).get())
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._submit(bytes(self._buffer), last=True)
+            self._buffer.clear()
+            for result in self._pending:
+                self._fileobj.write(result.get())
+            self._pending = []
+            self._fileobj.write(struct.pack("<LL", self._crc & 0xffffffff,
+                                            self._size & 0xffffffff))
+        finally:
+            self._pool.close()
+            self._pool.join()
+
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def open_tar_writer(name, fileobj, compression_format="gzip", compresslevel=None, threads=None):
+    """ TarFile to write a reproducible archive into fileobj, with the "gzip", "zstd", "xz" or
+    "none" (uncompressed) compression_format.
+    The compresslevel only applies to gzip, the other formats use their default level
+    """
+    if compression_format == "zstd":
+        # zstd output is the same for any number of threads >= 1 (but != for 0, no threads)
+        compressor = _zstandard().ZstdCompressor(threads=threads or 0)
+        writer = compressor.stream_writer(fileobj, closefd=False)
+        t = tarfile.TarFile.taropen(name, "w", writer, format=tarfile.PAX_FORMAT)
+        t._extfileobj = False  # Closing the tar finishes the zstd frame, not the fileobj
+        return t
+    if compression_format == "xz":
+        return tarfile.open(name, "w:xz", fileobj=fileobj, format=tarfile.PAX_FORMAT)
+    if compression_format == "none":
+        return tarfile.TarFile.taropen(name, "w", fileobj, format=tarfile.PAX_FORMAT)
+    return gzopen_without_timestamps(name, mode="w", fileobj=fileobj,
+                                     compresslevel=compresslevel, threads=threads)
+
+
+def gzopen_without_timestamps(name, mode="r", fileobj=None, compresslevel=None, threads=None,
+                              **kwargs):
     """ !! Method overrided by laso to pass mtime=0 (!=None) to avoid time.time() was
         setted in Gzip file causing md5 to change. Not possible using the
         previous tarfile open because arguments are not passed to GzipFile constructor
+        If threads is defined (and >= 1), the archive is written with the ParallelGzipWriter
     """
 
     if mode not in ("r", "w"):
@@ -268,7 +391,10 @@ def gzopen_without_timestamps(name, mode="r", fileobj=None, compresslevel=None,
 
     try:
         compresslevel = compresslevel if compresslevel is not None else 9  # default Gzip = 9
-        fileobj = gzip.GzipFile(name, mode, compresslevel, fileobj, mtime=0)
+        if threads is not None and threads >= 1 and mode == "w":
+            fileobj = ParallelGzipWriter(name, fileobj, compresslevel, threads)
+        else:
+            fileobj = gzip.GzipFile(name, mode, compresslevel, fileobj, mtime=0)
     except OSError:
         if fileobj is not None and mode == 'r':
             raise tarfile.ReadError("not a gzip file")
@@ -291,16 +417,156 @@ def gzopen_without_timestamps(name, mode="r", fileobj=None, compresslevel=None,
     return t
 
 
-def tar_extract(fileobj, destination_dir):
-    the_tar = tarfile.open(fileobj=fileobj)
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ConanException("The 'zstd' compression format requires the 'zstandard' Python "
+                             "package, install it with 'pip install zstandard'")
+    return zstandard
+
+
+class _PrefixedReader:
+    """ Sequential reader of the already read prefix bytes followed by the rest of the fileobj
+    """
+    def __init__(self, prefix, fileobj):
+        self._prefix = prefix
+        self._fileobj = fileobj
+
+    def read(self, size=-1):
+        if not self._prefix:
+            return self._fileobj.read(size)
+        if 0 <= size <= len(self._prefix):
+            result, self._prefix = self._prefix[:size], self._prefix[size:]
+            return result
+        result, self._prefix = self._prefix, b""
+        return result + self._fileobj.read(size - len(result) if size > 0 else -1)
+
+
+def tar_extract(fileobj, destination_dir, stream=False, threads=None):
+    """ stream=True reads the fileobj sequentially, without seeking (e.g. a network response)
+    The compression is detected from the content: gzip, xz, bz2, zstd or none
+    threads: if defined, the files are written in a thread pool, see tar_extractall()
+    """
+    if stream:
+        magic = fileobj.read(len(_ZSTD_MAGIC))
+        fileobj = _PrefixedReader(magic, fileobj)
+    else:
+        pos = fileobj.tell()
+        magic = fileobj.read(len(_ZSTD_MAGIC))
+        fileobj.seek(pos)
+    if magic == _ZSTD_MAGIC:
+        fileobj = _zstandard().ZstdDecompressor().stream_reader(fileobj, closefd=False)
+        stream = True
+    the_tar = tarfile.open(fileobj=fileobj, mode="r|*" if stream else "r")
     # NOTE: The errorlevel=2 has been removed because it was failing in Win10, it didn't allow to
     # "could not change modification time", with time=0
     # the_tar.errorlevel = 2  # raise exception if any error
     the_tar.extraction_filter = (lambda member, path: member)  # fully_trusted, avoid Py3.14 break
-    the_tar.extractall(path=destination_dir)
+    tar_extractall(the_tar, destination_dir, threads=threads)
     the_tar.close()
 
 
+def tar_extractall(the_tar, destination_dir, members=None, threads=None):
+    """ Same as the_tar.extractall(), using the the_tar.extraction_filter, but if threads is
+    defined, the regular files are written by a pool of threads
+    """
+    if not threads:
+        the_tar.extractall(path=destination_dir, members=members)
+        return
+    _ParallelTarExtractor(the_tar, destination_dir, threads).extractall(members)
+
+
+class _ParallelTarExtractor:
+    """ The archive is still decompressed and read sequentially (it can be a stream), but the
+    contents of the regular files are written by a thread pool, as the creation of many small
+    files is the bottleneck in slow filesystems (e.g. NFS). The directories are created as they
+    are found, and their permissions and times are set in batch at the end, like extractall()
+    """
+    MAX_BUFFERED = 64 * 1024 * 1024  # bound the memory of the contents pending to be written
+    MAX_FILE_SIZE = 4 * 1024 * 1024  # bigger files are written directly by the reading thread
+
+    def __init__(self, the_tar, destination_dir, threads):
+        self._tar = the_tar
+        self._destination_dir = destination_dir
+        self._threads = threads
+        self._pending = {}  # {target_path: (async_result, size)}, in submission order
+        self._buffered = 0
+        self._created_dirs = set()
+
+    def extractall(self, members=None):
+        from multiprocessing.pool import ThreadPool
+        pool = ThreadPool(self._threads)
+        directories = []
+        try:
+            for member in (members if members is not None else self._tar):
+                tarinfo = self._tar.extraction_filter(member, self._destination_dir)
+                if tarinfo is None:
+                    continue
+                target_path = self._target_path(tarinfo)
+                if target_path in self._pending:  # duplicated member, the last one wins
+                    self._wait()
+                if tarinfo.isdir():
+                    self._makedirs(target_path)
+                    directories.append(tarinfo)
+                elif tarinfo.isreg() and tarinfo.size <= self.MAX_FILE_SIZE:
+                    self._makedirs(os.path.dirname(target_path))
+                    data = self._tar.extractfile(tarinfo).read()
+                    result = pool.apply_async(self._write_file, (tarinfo, target_path, data))
+                    self._pending[target_path] = result, len(data)
+                    self._buffered += len(data)
+                    while self._buffered > self.MAX_BUFFERED:
+                        self._wait_oldest()
+                else:
+                    if tarinfo.islnk():  # The target of the hard link must be already written
+                        self._wait()
+                    # the original member, the extraction_filter is applied again by extract()
+                    self._tar.extract(member, self._destination_dir)
+            self._wait()
+        finally:
+            pool.close()
+            pool.join()
+
+        # Reverse sort, so the permissions of a directory are set after its subdirectories
+        directories.sort(key=lambda d: d.name, reverse=True)
+        for tarinfo in directories:
+            self._set_attrs(tarinfo, self._target_path(tarinfo))
+
+    def _target_path(self, tarinfo):
+        target_path = os.path.join(self._destination_dir, tarinfo.name).rstrip("/")
+        return target_path.replace("/", os.sep)
+
+    def _makedirs(self, path):
+        if path and path not in self._created_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._created_dirs.add(path)
+
+    def _wait_oldest(self):
+        target_path = next(iter(self._pending))
+        result, size = self._pending.pop(target_path)
+        self._buffered -= size
+        result.get()  # raises the exception of the writing thread, if any
+
+    def _wait(self):
+        while self._pending:
+            self._wait_oldest()
+
+    def _write_file(self, tarinfo, target_path, data):
+        with open(target_path, "wb") as f:
+            f.write(data)
+        self._set_attrs(tarinfo, target_path)
+
+    def _set_attrs(self, tarinfo, target_path):
+        try:
+            self._tar.chown(tarinfo, target_path, False)
+            self._tar.chmod(tarinfo, target_path)
+            self._tar.utime(tarinfo, target_path)
+        except tarfile.ExtractError:
+            # Same as extractall(), these are non-fatal errors unless errorlevel > 1
+            if self._tar.errorlevel > 1:
+                raise
+
+
 def exception_message_safe(exc):
     try:
         return str(exc)
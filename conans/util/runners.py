@@ -2,6 +2,7 @@ import os
 import subprocess
 import sys
 import tempfile
+import threading
 from contextlib import contextmanager
 from io import StringIO
 
@@ -32,6 +33,63 @@ else:
         yield
 
 
+class ParallelJobs:
+    """ Runs jobs in several threads, but only one of them runs Python code at a time, like a
+    lock that is only released while the job waits for a subprocess in conan_run(). The
+    subprocesses of the different jobs run concurrently, but the rest is as if they were run
+    sequentially. The current dir and the environment are process-wide, so every job gets its
+    own ones back when it takes the lock again.
+    """
+    _current = threading.local()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cwd = os.getcwd()
+        self._environ = dict(os.environ)
+
+    @staticmethod
+    def current():
+        """ the ParallelJobs running the calling thread job, if any """
+        return getattr(ParallelJobs._current, "jobs", None)
+
+    @staticmethod
+    def _restore(cwd, environ):
+        os.chdir(cwd)
+        if os.environ != environ:
+            os.environ.clear()
+            os.environ.update(environ)
+
+    @contextmanager
+    def job(self):
+        """ runs the block as a job, starting from the current dir and the environment of the
+        thread that created this object
+        """
+        self._lock.acquire()
+        ParallelJobs._current.jobs = self
+        try:
+            self._restore(self._cwd, self._environ)
+            yield
+        finally:
+            ParallelJobs._current.jobs = None
+            try:
+                self._restore(self._cwd, self._environ)
+            finally:
+                self._lock.release()
+
+    @contextmanager
+    def released(self):
+        """ other jobs can run while the calling job is in this block, that must not run Python
+        code depending on the current dir, the environment or other shared state
+        """
+        cwd, environ = os.getcwd(), dict(os.environ)
+        self._lock.release()
+        try:
+            yield
+        finally:
+            self._lock.acquire()
+            self._restore(cwd, environ)
+
+
 def conan_run(command, stdout=None, stderr=None, cwd=None, shell=True):
     """
     @param shell:
@@ -40,6 +98,12 @@ def conan_run(command, stdout=None, stderr=None, cwd=None, shell=True):
     @param stdout: Instead of print to sys.stdout print to that stream. Could be None
     @param cwd: Move to directory to execute
     """
+    jobs = ParallelJobs.current()
+    if jobs is not None:
+        # The output is captured and written at once, not to interleave it with other jobs
+        output = StringIO()
+        stdout = stdout or output
+        stderr = stderr or output
     stdout = stdout or sys.stderr
     stderr = stderr or sys.stderr
 
@@ -52,13 +116,21 @@ def conan_run(command, stdout=None, stderr=None, cwd=None, shell=True):
         except Exception as e:
             raise ConanException("Error while running cmd\nError: %s" % (str(e)))
 
-        proc_stdout, proc_stderr = proc.communicate()
+        if jobs is not None:
+            with jobs.released():
+                proc_stdout, proc_stderr = proc.communicate()
+        else:
+            proc_stdout, proc_stderr = proc.communicate()
         # If the output is piped, like user provided a StringIO or testing, the communicate
         # will capture and return something when thing finished
         if proc_stdout:
             stdout.write(proc_stdout.decode("utf-8", errors="ignore"))
         if proc_stderr:
             stderr.write(proc_stderr.decode("utf-8", errors="ignore"))
+        if jobs is not None and output.getvalue():
+            from conan.api.output import ConanOutput
+            # Written with the rest of the job output, if it is buffered
+            (ConanOutput.thread_buffer() or sys.stderr).write(output.getvalue())
         return proc.returncode
 
 
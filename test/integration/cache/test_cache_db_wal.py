@@ -0,0 +1,135 @@
+import os
+import sqlite3
+import time
+
+import pytest
+from mock import patch
+
+from conan.internal.cache.db.cache_database import CacheDatabase
+from conan.test.assets.genconanfile import GenConanfile
+from conan.test.utils.test_files import temp_folder
+from conan.test.utils.tools import TestClient
+from conans.model.package_ref import PkgReference
+from conans.model.recipe_ref import RecipeReference
+
+
+def test_cache_sqlite_wal():
+    c = TestClient(light=True)
+    c.save_home({"global.conf": "core.cache:sqlite_wal=True"})
+    c.save({"conanfile.py": GenConanfile("pkg", "0.1")})
+    c.run("create .")
+    db = os.path.join(c.cache_folder, "p", "cache.sqlite3")
+    connection = sqlite3.connect(db)
+    try:
+        assert connection.execute("PRAGMA journal_mode;").fetchone()[0] == "wal"
+    finally:
+        connection.close()
+
+    time.sleep(2)
+    c.run("install --requires=pkg/0.1")
+    # The LRU was updated by the install, nothing is removed
+    c.run("remove * --lru=1s -c")
+    c.run("list *:*")
+    assert "pkg/0.1" in c.out
+    assert "da39a3ee5e6b4b0d3255bfef95601890afd80709" in c.out
+
+
+@pytest.mark.parametrize("wal", [False, True])
+def test_update_lru_journal(wal):
+    db = CacheDatabase(os.path.join(temp_folder(), "cache.sqlite3"), wal=wal)
+    ref = RecipeReference.loads("pkg/0.1#rrev%1")
+    db.create_recipe("path", ref)
+    pref = PkgReference(ref, "pkgid", "prev", 1)
+    db.create_package("pkgpath", pref, None)
+    lrus = db.get_recipe_lru(ref), db.get_package_lru(pref)
+
+    time.sleep(1.1)
+    db.update_recipe_lru(ref)
+    db.update_package_lru(pref)
+    # Nothing is written until the journal is flushed
+    assert (db.get_recipe_lru(ref), db.get_package_lru(pref)) == lrus
+    db.flush_lru()
+    assert db.get_recipe_lru(ref) > lrus[0]
+    assert db.get_package_lru(pref) > lrus[1]
+
+    # A failure in any of them discards the whole transaction
+    lrus = db.get_recipe_lru(ref), db.get_package_lru(pref)
+    time.sleep(1.1)
+    db.update_recipe_lru(ref)
+    db.update_package_lru(PkgReference(ref, "pkgid"))  # prev is mandatory
+    with pytest.raises(AssertionError):
+        db.flush_lru()
+    assert (db.get_recipe_lru(ref), db.get_package_lru(pref)) == lrus
+
+
+def test_update_lru_journal_retry():
+    """ the journal is kept when the transaction fails, it is written by the next flush
+    """
+    db = CacheDatabase(os.path.join(temp_folder(), "cache.sqlite3"))
+    ref = RecipeReference.loads("pkg/0.1#rrev%1")
+    db.create_recipe("path", ref)
+    lru = db.get_recipe_lru(ref)
+
+    time.sleep(1.1)
+    db.update_recipe_lru(ref)
+    with patch.object(db._recipes, "update_lru",
+                      side_effect=sqlite3.OperationalError("database is locked")):
+        with pytest.raises(sqlite3.OperationalError):
+            db.flush_lru()
+    assert db.get_recipe_lru(ref) == lru
+    db.flush_lru()
+    assert db.get_recipe_lru(ref) > lru
+
+
+def test_update_lru_python_requires():
+    """ the python_requires loaded outside a graph expansion, as in the export, are written too
+    """
+    c = TestClient(light=True)
+    c.save({"tool/conanfile.py": GenConanfile("tool", "0.1"),
+            "pkg/conanfile.py": GenConanfile("pkg", "0.1").with_python_requires("tool/0.1")})
+    c.run("export tool")
+    db = CacheDatabase(os.path.join(c.cache_folder, "p", "cache.sqlite3"))
+    ref = db.get_latest_recipe(RecipeReference.loads("tool/0.1"))["ref"]
+    lru = db.get_recipe_lru(ref)
+    time.sleep(1.1)
+    c.run("export pkg")
+    assert db.get_recipe_lru(ref) > lru
+
+
+def test_update_lru_granularity():
+    db = CacheDatabase(os.path.join(temp_folder(), "cache.sqlite3"), lru_granularity="1h")
+    ref = RecipeReference.loads("pkg/0.1#rrev%1")
+    db.create_recipe("path", ref)
+    lru = db.get_recipe_lru(ref)
+    time.sleep(1.1)
+    db.update_recipe_lru(ref)
+    db.flush_lru()
+    assert db.get_recipe_lru(ref) == lru  # It was updated less than 1h ago
+
+
+def test_update_lru_granularity_conf():
+    c = TestClient(light=True)
+    c.save_home({"global.conf": "core.cache:lru_granularity=1h"})
+    c.save({"conanfile.py": GenConanfile("pkg", "0.1")})
+    c.run("create .")
+    time.sleep(2)
+    c.run("install --requires=pkg/0.1")
+    # The LRU was not updated by the install
+    c.run("remove * --lru=1s -c")
+    c.run("list *")
+    assert "pkg/0.1" not in c.out
+
+
+def test_update_lru_flush_error():
+    """ a failed LRU flush (e.g. a locked database) doesn't hide the error of the command
+    """
+    c = TestClient(light=True)
+    c.save({"dep/conanfile.py": GenConanfile("dep", "0.1"),
+            "pkg/conanfile.py": GenConanfile("pkg", "0.1").with_requires("dep/0.1",
+                                                                         "missing/0.1")})
+    c.run("export dep")
+    with patch.object(CacheDatabase, "flush_lru",
+                      side_effect=sqlite3.OperationalError("database is locked")):
+        c.run("install pkg", assert_error=True)
+    assert "WARN: The cache LRU couldn't be updated: database is locked" in c.out
+    assert "ERROR: Package 'missing/0.1' not resolved" in c.out
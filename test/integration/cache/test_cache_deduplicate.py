@@ -0,0 +1,72 @@
+import os
+import platform
+
+import pytest
+
+from conan.test.assets.genconanfile import GenConanfile
+from conan.test.utils.tools import TestClient
+from conans.util.files import load
+
+
+def _blobs(c):
+    blobs_folder = os.path.join(c.cache_folder, "p", "blobs")
+    if not os.path.isdir(blobs_folder):
+        return []
+    return [b for d in os.listdir(blobs_folder) for b in os.listdir(os.path.join(blobs_folder, d))]
+
+
+@pytest.mark.skipif(platform.system() == "Windows", reason="Hardlinks might need privileges")
+def test_cache_deduplicate():
+    c = TestClient(default_server_user=True)
+    c.save_home({"global.conf": "core.cache:deduplicate=True"})
+    conanfile = GenConanfile("pkg", "0.1").with_settings("os") \
+                                          .with_package_file("include/header.h", "header") \
+                                          .with_package_file("include/other.h", "header")
+    c.save({"conanfile.py": conanfile})
+    c.run("create . -s os=Linux")
+    linux_pref = c.created_layout().reference
+    linux = c.created_layout().package()
+    c.run("create . -s os=Windows")
+    windows = c.created_layout().package()
+
+    linux_header = os.path.join(linux, "include", "header.h")
+    windows_header = os.path.join(windows, "include", "header.h")
+    assert os.path.samefile(linux_header, windows_header)
+    assert os.stat(linux_header).st_nlink == 3  # the blob and the 2 packages
+    # identical files in the same package are not linked, so archives are not affected
+    assert not os.path.samefile(linux_header, os.path.join(linux, "include", "other.h"))
+    assert len(_blobs(c)) == 3  # header + conaninfo.txt of every package
+    c.run("cache check-integrity *")
+    assert "ERROR" not in c.out
+
+    # Downloaded packages are deduplicated too
+    c.run("upload * -r=default -c")
+    c.run("remove pkg/*:* -c")
+    assert _blobs(c) == []  # garbage collected with the packages
+    c.run("install --requires=pkg/0.1 -s os=Linux")
+    c.run("install --requires=pkg/0.1 -s os=Windows")
+    assert len(_blobs(c)) == 3
+    header = os.path.join(c.get_latest_pkg_layout(linux_pref).package(), "include", "header.h")
+    assert os.stat(header).st_nlink == 3
+    assert load(header) == "header"
+
+    c.run("remove * -c")
+    assert _blobs(c) == []
+
+
+@pytest.mark.skipif(platform.system() == "Windows", reason="Hardlinks might need privileges")
+def test_cache_deduplicate_clean():
+    c = TestClient(light=True)
+    c.save_home({"global.conf": "core.cache:deduplicate=True"})
+    c.save({"conanfile.py": GenConanfile("pkg", "0.1").with_package_file("file.txt", "file")})
+    c.run("create .")
+    assert len(_blobs(c)) == 2
+    c.run("create .")  # Building the same package revision again reuses the blobs
+    assert len(_blobs(c)) == 2
+    package_folder = c.created_layout().package()
+    c.run("cache clean")
+    assert len(_blobs(c)) == 2
+    # The blobs no longer linked by any package are collected by "cache clean"
+    os.remove(os.path.join(package_folder, "file.txt"))
+    c.run("cache clean")
+    assert len(_blobs(c)) == 1
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from conan.test.assets.genconanfile import GenConanfile
+from conan.test.utils.test_files import temp_folder
+from conan.test.utils.tools import TestClient, TestRequester
+from conans.util.files import load
+
+
+def _client(requester_class=None, compression_format="gzip"):
+    c = TestClient(light=True, default_server_user=True, requester_class=requester_class)
+    c.save({"conanfile.py": GenConanfile("pkg", "0.1").with_package_file("file.txt", "content")
+                                                      .with_package_file("sub/other.txt", "other")})
+    c.save_home({"global.conf": f"core.upload:compression_format={compression_format}"})
+    c.run("create .")
+    c.run("upload * -c -r default")
+    c.run("remove * -c")
+    c.save_home({"global.conf": "core.download:extract_streaming=True"})
+    return c
+
+
+@pytest.mark.parametrize("compression_format", ["gzip", "xz", "none"])
+def test_download_extract_streaming(compression_format):
+    c = _client(compression_format=compression_format)
+    c.run("install --requires=pkg/0.1")
+    c.assert_listed_binary({"pkg/0.1": ("da39a3ee5e6b4b0d3255bfef95601890afd80709",
+                                        "Download (default)")})
+    pref = c.get_latest_package_reference("pkg/0.1")
+    layout = c.get_latest_pkg_layout(pref)
+    assert load(os.path.join(layout.package(), "file.txt")) == "content"
+    assert load(os.path.join(layout.package(), "sub", "other.txt")) == "other"
+    assert os.path.isfile(os.path.join(layout.package(), "conaninfo.txt"))
+    assert os.path.isfile(os.path.join(layout.package(), "conanmanifest.txt"))
+    # The compressed archive is never saved
+    assert not os.listdir(layout.download_package())
+    c.run("cache check-integrity *")
+    assert "pkg/0.1:da39a3ee5e6b4b0d3255bfef95601890afd80709: Integrity checked: ok" in c.out
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_download_extract_threads(streaming):
+    c = _client()
+    c.save_home({"global.conf": f"core.download:extract_streaming={streaming}\n"
+                                "core.extract:threads=4"})
+    c.run("install --requires=pkg/0.1")
+    pref = c.get_latest_package_reference("pkg/0.1")
+    layout = c.get_latest_pkg_layout(pref)
+    assert load(os.path.join(layout.package(), "file.txt")) == "content"
+    assert load(os.path.join(layout.package(), "sub", "other.txt")) == "other"
+    c.run("cache check-integrity *")
+    assert "pkg/0.1:da39a3ee5e6b4b0d3255bfef95601890afd80709: Integrity checked: ok" in c.out
+
+
+def test_download_extract_streaming_download_cache():
+    c = _client()
+    download_cache = temp_folder()
+    c.save_home({"global.conf": "core.download:extract_streaming=True\n"
+                                f"core.download:download_cache={download_cache}"})
+    c.run("install --requires=pkg/0.1")
+    pref = c.get_latest_package_reference("pkg/0.1")
+    layout = c.get_latest_pkg_layout(pref)
+    assert load(os.path.join(layout.package(), "file.txt")) == "content"
+    assert not os.path.exists(os.path.join(layout.download_package(), "conan_package.tgz"))
+    # The archive is only kept in the download cache
+    c.run("remove * -c")
+    c.run("install --requires=pkg/0.1")
+    layout = c.get_latest_pkg_layout(pref)
+    assert load(os.path.join(layout.package(), "file.txt")) == "content"
+
+
+class _TruncatedRequester(TestRequester):
+    def get(self, url, **kwargs):
+        response = super().get(url, **kwargs)
+        if url.endswith("conan_package.tgz"):
+            response.test_response.body = response.test_response.body[:40]
+        return response
+
+
+def test_download_extract_streaming_corrupted():
+    c = _client(requester_class=_TruncatedRequester)
+    c.save_home({"global.conf": "core.download:extract_streaming=True\n"
+                                "core.download:retry_wait=0"})
+    c.run("install --requires=pkg/0.1", assert_error=True)
+    assert "Waiting 0 seconds to retry..." in c.out
+    assert "Download failed, check server, possibly try again" in c.out
+    # The failed package is not left in the cache
+    c.run("list pkg/0.1:*")
+    assert "da39a3ee5e6b4b0d3255bfef95601890afd80709" not in c.out
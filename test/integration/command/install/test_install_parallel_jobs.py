@@ -0,0 +1,130 @@
+import json
+import os
+import textwrap
+
+from conan.test.utils.env import environment_update
+from conan.test.utils.tools import TestClient
+
+
+conanfile = textwrap.dedent("""
+    import os, sys, time, json
+    from conan import ConanFile
+    from conan.tools.files import save
+
+    class Pkg(ConanFile):
+        version = "0.1"
+        fail = False
+
+        def build(self):
+            start = time.time()
+            # The environment and current dir are kept while other packages build
+            os.environ["MY_PKG"] = self.name
+            sleep = (f"import time; print('{self.name} START'); time.sleep(1); "
+                     f"print('{self.name} END')")
+            self.run(f'"{sys.executable}" -c "{sleep}"')
+            assert os.environ["MY_PKG"] == self.name
+            assert os.getcwd() == self.build_folder
+            if self.fail:
+                raise Exception(f"{self.name} failed!!!")
+            save(self, os.path.join(os.environ["TIMES_FOLDER"], self.name),
+                 json.dumps([start, time.time()]))
+    """)
+
+
+def _client(pkgs, parallel=4):
+    c = TestClient(light=True)
+    c.save_home({"global.conf": f"core.build:parallel_jobs={parallel}"})
+    for name, requires, fail in pkgs:
+        requires = f"requires = {requires}" if requires else ""
+        c.save({f"{name}/conanfile.py": conanfile + f"    {requires}\n    fail = {fail}\n"})
+        c.run(f"export {name} --name={name}")
+    return c
+
+
+def _times(c, name):
+    return json.loads(c.load(os.path.join("times", name)))
+
+
+def test_parallel_jobs():
+    # pkga, pkgb, pkgc are independent, app depends on all of them
+    c = _client([("pkga", None, False), ("pkgb", None, False), ("pkgc", None, False),
+                 ("app", ("'pkga/0.1', 'pkgb/0.1', 'pkgc/0.1'"), False)])
+    times = os.path.join(c.current_folder, "times")
+    with environment_update({"TIMES_FOLDER": times}):
+        c.run("install --requires=app/0.1 --build=missing")
+    assert "Installing packages in 4 parallel jobs" in c.out
+    libs = [_times(c, n) for n in ("pkga", "pkgb", "pkgc")]
+    # All the independent packages have been building at the same time
+    assert max(start for start, _ in libs) < min(end for _, end in libs)
+    # app only starts after all its dependencies finished
+    assert _times(c, "app")[0] > max(end for _, end in libs)
+    # The output of every command is not interleaved with the others
+    for name in ("pkga", "pkgb", "pkgc", "app"):
+        assert f"{name} START\n{name} END" in c.out
+        assert f"{name}/0.1: Package '" in c.out
+
+
+def test_parallel_jobs_failure():
+    # pkga and pkgb fail, the error is always the one of pkga, app is never built
+    c = _client([("pkga", None, True), ("pkgb", None, True), ("pkgc", None, False),
+                 ("app", ("'pkga/0.1', 'pkgb/0.1', 'pkgc/0.1'"), False)])
+    times = os.path.join(c.current_folder, "times")
+    with environment_update({"TIMES_FOLDER": times}):
+        c.run("install --requires=app/0.1 --build=missing", assert_error=True)
+    assert "ERROR: pkga/0.1: Error in build() method" in c.out
+    assert "pkga failed!!!" in c.out
+    assert "app START" not in c.out
+    assert os.listdir(times) == ["pkgc"]
+
+
+def test_parallel_jobs_same_recipe():
+    # Two binaries of dep/0.1 (shared for the host, static for the build context) are built at the
+    # same time, but their source() is only run once
+    dep = textwrap.dedent("""
+        import os, sys
+        from conan import ConanFile
+        from conan.tools.files import load
+
+        class Pkg(ConanFile):
+            name = "dep"
+            version = "0.1"
+            options = {"shared": [True, False]}
+            default_options = {"shared": False}
+
+            def source(self):
+                self.output.info("Running source()")
+                sleep = "import time; time.sleep(1); open('src.txt', 'w').write('src')"
+                self.run(f'"{sys.executable}" -c "{sleep}"')
+
+            def build(self):
+                self.output.info(f"Building shared={self.options.shared}")
+                sleep = "import time; time.sleep(1)"
+                self.run(f'"{sys.executable}" -c "{sleep}"')
+                self.output.info(f"Built {load(self, os.path.join(self.source_folder, 'src.txt'))}")
+        """)
+    app = textwrap.dedent("""
+        from conan import ConanFile
+
+        class Pkg(ConanFile):
+            name = "app"
+            version = "0.1"
+            default_options = {"dep/*:shared": True}
+
+            def requirements(self):
+                self.requires("dep/0.1")
+
+            def build_requirements(self):
+                self.tool_requires("dep/0.1")
+        """)
+    c = TestClient(light=True)
+    c.save_home({"global.conf": "core.build:parallel_jobs=4"})
+    c.save({"dep/conanfile.py": dep, "app/conanfile.py": app})
+    c.run("export dep")
+    c.run("install app --build=missing")
+    assert c.out.count("dep/0.1: Running source()") == 1
+    assert c.out.count("dep/0.1: Built src") == 2
+    # The output of every package is written at once, not interleaved with the other
+    for shared in ("True", "False"):
+        block = c.out.split(f"Building shared={shared}")[1]
+        assert block.index("Built src") < block.index("dep/0.1: Package '")
+        assert "Building shared=" not in block[:block.index("Built src")]
@@ -57,3 +57,39 @@ def test_upload_parallel_fail_on_interaction():
     client.run('remote logout default')
     client.run('upload lib* -c -r default', assert_error=True)
     assert "ERROR: Conan interactive mode disabled. [Remote: default]" in client.out
+
+
+def test_upload_pipeline_parallel_files():
+    """ Compressing the packages while uploading the previous ones, and the files of every
+    package concurrently, the conanmanifest.txt always the last one
+    """
+    class PutRecorder(TestRequester):
+        puts = []
+
+        def put(self, url, *args, **kwargs):
+            PutRecorder.puts.append(url)
+            return super(PutRecorder, self).put(url, *args, **kwargs)
+
+    client = TestClient(requester_class=PutRecorder, default_server_user=True)
+    client.save_home({"global.conf": "core.upload:pipeline=True\ncore.upload:parallel_files=4"})
+    client.save({"conanfile.py": GenConanfile("pkg", "0.1").with_settings("os")
+                                                           .with_exports_sources("*.h"),
+                 "header.h": "header"})
+    for os_ in ("Windows", "Linux", "Macos"):
+        client.run(f"create . -s os={os_}")
+    client.run("upload * -c -r default")
+    assert "Preparing and uploading artifacts" in client.out
+    assert client.out.count("Uploading package 'pkg/0.1") == 3
+    # every recipe or package uploads its manifest after all its other files
+    folders = {}
+    for url in PutRecorder.puts:
+        folder, filename = url.rsplit("/", 1)
+        folders.setdefault(folder, []).append(filename)
+    assert len(folders) == 4
+    for filenames in folders.values():
+        assert len(filenames) == 3
+        assert filenames[-1] == "conanmanifest.txt"
+
+    client.run("remove * -c")
+    client.run("install --requires=pkg/0.1 -s os=Linux")
+    assert "Downloaded package revision" in client.out
@@ -1,9 +1,13 @@
 import os
+from collections import OrderedDict
+
+import pytest
 
 from conans.model.recipe_ref import RecipeReference
 from conan.test.assets.genconanfile import GenConanfile
 from conan.test.utils.test_files import uncompress_packaged_files
-from conan.test.utils.tools import TestClient
+from conan.test.utils.tools import TestClient, TestServer
+from conans.util.files import load
 
 
 def test_reuse_uploaded_tgz():
@@ -89,3 +93,59 @@ def test_upload_only_tgz_if_needed():
     folder = uncompress_packaged_files(server_paths, pref)
     libraries = os.listdir(os.path.join(folder, "lib"))
     assert len(libraries) == 1
+
+
+@pytest.mark.parametrize("compression_format, ext", [("xz", "txz"), ("none", "tar"),
+                                                     ("zstd", "tzst")])
+def test_upload_compression_format(compression_format, ext):
+    if compression_format == "zstd":
+        pytest.importorskip("zstandard")
+    client = TestClient(light=True, default_server_user=True)
+    client.save_home({"global.conf": f"core.upload:compression_format={compression_format}"})
+    client.save({"conanfile.py": GenConanfile("pkg", "0.1").with_exports_sources("*.h")
+                                                           .with_package_file("lib/a.lib", "lib"),
+                 "pkg.h": "header"})
+    client.run("create .")
+    client.run("upload * -r default -c")
+    assert f"Compressing conan_export.{ext}" not in client.out  # Nothing to compress
+    assert f"Compressing conan_sources.{ext}" in client.out
+    assert f"Compressing conan_package.{ext}" in client.out
+    ref = RecipeReference.loads("pkg/0.1")
+    server_store = client.servers["default"].server_store
+    latest = client.cache.get_latest_recipe_reference(ref)
+    pref = client.cache.get_package_references(latest)[0]
+    pref = client.cache.get_latest_package_reference(pref)
+    assert os.path.isfile(os.path.join(server_store.package(pref), f"conan_package.{ext}"))
+
+    # Any client, with any configuration, can install it
+    servers = OrderedDict([("default", client.servers["default"]),
+                           ("other", TestServer(users={"admin": "password"}))])
+    other = TestClient(light=True, servers=servers, inputs=["admin", "password"])
+    other.run("install --requires=pkg/0.1 --build=missing")
+    other.assert_listed_binary({"pkg/0.1": (pref.package_id, "Download (default)")})
+    layout = other.get_latest_pkg_layout(pref)
+    assert load(os.path.join(layout.package(), "lib", "a.lib")) == "lib"
+    other.run("cache check-integrity *")
+    assert "Integrity check: ok" in other.out
+
+    # Uploading to another remote reuses the downloaded archives
+    other.save_home({"global.conf": "core.upload:compression_format=gzip"})
+    other.run("upload * -r other -c")
+    assert "Compressing" not in other.out
+    other_store = servers["other"].server_store
+    assert os.path.isfile(os.path.join(other_store.package(pref), f"conan_package.{ext}"))
+
+    # The sources are downloaded too
+    other.run("install --requires=pkg/0.1 --build=pkg*")
+    assert "pkg/0.1: Package" in other.out
+    ref_layout = other.get_latest_ref_layout(latest)
+    assert load(os.path.join(ref_layout.export_sources(), "pkg.h")) == "header"
+
+
+def test_upload_compression_format_invalid():
+    client = TestClient(light=True, default_server_user=True)
+    client.save_home({"global.conf": "core.upload:compression_format=rar"})
+    client.save({"conanfile.py": GenConanfile("pkg", "0.1")})
+    client.run("create .")
+    client.run("upload * -r default -c", assert_error=True)
+    assert "Unknown value 'rar' for 'core.upload:compression_format'" in client.out
@@ -10,6 +10,7 @@ import requests
 from mock import patch
 from requests import Response
 
+from conans import CHECKSUM_DEPLOY
 from conans.errors import ConanException
 from conans.model.package_ref import PkgReference
 from conans.model.recipe_ref import RecipeReference
@@ -116,7 +117,7 @@ class UploadTest(unittest.TestCase):
 
         def gzopen_patched(name, mode="r", fileobj=None, **kwargs):
             raise ConanException("Error gzopen %s" % name)
-        with patch('conan.internal.api.uploader.gzopen_without_timestamps', new=gzopen_patched):
+        with patch('conans.util.files.gzopen_without_timestamps', new=gzopen_patched):
             client.run("upload * --confirm -r default --only-recipe",
                        assert_error=True)
             self.assertIn("Error gzopen conan_sources.tgz", client.out)
@@ -145,7 +146,7 @@ class UploadTest(unittest.TestCase):
             if name == PACKAGE_TGZ_NAME:
                 raise ConanException("Error gzopen %s" % name)
             return gzopen_without_timestamps(name, mode, fileobj, **kwargs)
-        with patch('conan.internal.api.uploader.gzopen_without_timestamps', new=gzopen_patched):
+        with patch('conans.util.files.gzopen_without_timestamps', new=gzopen_patched):
             client.run("upload * --confirm -r default", assert_error=True)
             self.assertIn("Error gzopen conan_package.tgz", client.out)
 
@@ -563,3 +564,37 @@ def test_upload_json_output():
     revs = list_pkgs["default"]["liba/0.1"]["revisions"]["a565bd5defd3a99e157698fcc6e23b25"]
     pkg = revs["packages"]["9e0f8140f0fe6b967392f8d5da9881e232e05ff8"]
     assert pkg["info"] == {"settings": {"os": "Linux"}, "options": {"shared": "False"}}
+
+
+class _DeployRequester(TestRequester):
+
+    def put(self, url, **kwargs):
+        response = super().put(url, **kwargs)
+        if "X-Checksum-Deploy" in kwargs.get("headers", {}) and response.status_code == 201:
+            print(f"DEPLOYED: {url.rsplit('/', 1)[-1]}")
+        return response
+
+
+def test_upload_checksum_deploy():
+    """ the files already in the server, from other revisions, are deployed by their checksum,
+    not uploaded again
+    """
+    server = TestServer(users={"admin": "password"}, server_capabilities=[CHECKSUM_DEPLOY])
+    c = TestClient(servers={"default": server}, inputs=["admin", "password"], light=True,
+                   requester_class=_DeployRequester)
+    c.save({"conanfile.py": GenConanfile("liba", "0.1").with_package_file("lib.a", "contents")})
+    c.run("create .")
+    c.run("upload * -r=default -c")
+    assert "DEPLOYED" not in c.out
+
+    c.save({"conanfile.py": GenConanfile("liba", "0.1").with_package_file("lib.a", "contents")
+                                                       .with_class_attribute("description='new'")})
+    c.run("create .")
+    c.run("upload * -r=default -c")
+    # The package binary is the same, but its archive is not, it has the files timestamps
+    assert "DEPLOYED: conaninfo.txt" in c.out
+    assert "DEPLOYED: conanfile.py" not in c.out
+
+    c.run("remove * -c")
+    c.run("install --requires=liba/0.1")
+    assert "liba/0.1: Downloaded package" in c.out
@@ -1,12 +1,16 @@
 import os
 
+import pytest
+
 from conan.test.assets.genconanfile import GenConanfile
 from conan.test.utils.tools import TestClient
 from conans.util.files import save
 
 
-def test_cache_integrity():
+@pytest.mark.parametrize("manifest_hashes", [False, True])
+def test_cache_integrity(manifest_hashes):
     t = TestClient()
+    t.save_home({"global.conf": f"core.cache:manifest_hashes={manifest_hashes}"})
     t.save({"conanfile.py": GenConanfile()})
     t.run("create . --name pkg1 --version 1.0")
     t.run("create . --name pkg2 --version=2.0")
@@ -23,6 +27,10 @@ def test_cache_integrity():
     assert "pkg1/1.0:da39a3ee5e6b4b0d3255bfef95601890afd80709: Integrity checked: ok" in t.out
     assert "ERROR: pkg2/2.0:da39a3ee5e6b4b0d3255bfef95601890afd80709: Manifest mismatch" in t.out
     assert "ERROR: pkg3/3.0:da39a3ee5e6b4b0d3255bfef95601890afd80709: Manifest mismatch" in t.out
+    # Nothing changed, same result
+    t.run("cache check-integrity *", assert_error=True)
+    assert "pkg1/1.0:da39a3ee5e6b4b0d3255bfef95601890afd80709: Integrity checked: ok" in t.out
+    assert "ERROR: pkg2/2.0:da39a3ee5e6b4b0d3255bfef95601890afd80709: Manifest mismatch" in t.out
 
 
 def test_cache_integrity_export_sources():
@@ -41,3 +49,28 @@ def test_cache_integrity_export_sources():
     t.run("install --requires=pkg/0.1")
     t.run("cache check-integrity *")
     assert "pkg/0.1: Integrity checked: ok" in t.out
+
+
+def test_export_manifest_hashes():
+    t = TestClient(light=True)
+    t.save_home({"global.conf": "core.cache:manifest_hashes=True"})
+    t.save({"conanfile.py": GenConanfile("pkg", "0.1").with_exports_sources("src/*"),
+            "src/mysource.cpp": "source"})
+    old = 1000000000  # old modification times, not considered racy
+    for f in ("conanfile.py", "src/mysource.cpp"):
+        os.utime(os.path.join(t.current_folder, f), (old, old))
+    t.run("export .")
+    rrev = t.exported_recipe_revision()
+
+    # The unchanged user files are not hashed again, an edit keeping the same stat is not seen
+    source = os.path.join(t.current_folder, "src", "mysource.cpp")
+    save(source, "SOURCE")
+    os.utime(source, (old, old))
+    t.run("export .")
+    assert t.exported_recipe_revision() == rrev
+    t.run("cache check-integrity *")
+    assert "pkg/0.1: Integrity checked: ok" in t.out
+
+    os.utime(source, (old + 1, old + 1))
+    t.run("export .")
+    assert t.exported_recipe_revision() != rrev
@@ -34,6 +34,19 @@ def test_cache_save_restore():
     assert "\\" not in package_list
 
 
+@pytest.mark.parametrize("conf", ["core.gzip:threads=2", "core.upload:compression_format=xz",
+                                  "core.upload:compression_format=none"])
+def test_cache_save_restore_compression(conf):
+    c = TestClient()
+    c.save({"conanfile.py": GenConanfile().with_settings("os")})
+    c.run("create . --name=pkg --version=1.0 -s os=Linux")
+    c.run("create . --name=pkg --version=1.1 -s os=Linux")
+    c.run("create . --name=other --version=2.0 -s os=Linux")
+    c.run(f"cache save pkg/*:* -cc {conf}")
+    cache_path = os.path.join(c.current_folder, "conan_cache_save.tgz")
+    _validate_restore(cache_path)
+
+
 def test_cache_save_restore_with_package_file():
     """If we have some sources in the root (like the CMakeLists.txt)
     we don't declare folders.source"""
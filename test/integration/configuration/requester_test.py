@@ -57,3 +57,26 @@ class ConanRequesterHeadersTests(unittest.TestCase):
             requester.get(url="aaa", headers={"User-Agent": "MyUserAgent"})
             headers = requester._http_requester.get.call_args[1]["headers"]
             self.assertEqual("MyUserAgent", headers["User-Agent"])
+
+
+class TestConanRequesterPool:
+    def test_pool_maxsize_parallel(self):
+        requester = ConanRequester(ConfDefinition())
+        assert requester._http_requester.get_adapter("https://any")._pool_maxsize == 10
+
+        config = ConfDefinition()
+        config.update("core.download:parallel", 8)
+        config.update("core.download:segments", 4)
+        config.update("core.upload:parallel", 16)
+        requester = ConanRequester(config)
+        assert requester._http_requester.get_adapter("https://any")._pool_maxsize == 32
+
+        config.update("core.net.http:pool_maxsize", 5)
+        requester = ConanRequester(config)
+        assert requester._http_requester.get_adapter("http://any")._pool_maxsize == 5
+
+    def test_requester_reused(self):
+        from conan.api.conan_api import ConanAPI
+        from conan.internal.conan_app import ConanApp
+        api = ConanAPI(temp_folder())
+        assert ConanApp(api).requester is ConanApp(api).requester
@@ -0,0 +1,78 @@
+from conan.test.assets.genconanfile import GenConanfile
+from conan.test.utils.tools import TestClient, TestRequester
+
+
+class _DownloadsRequester(TestRequester):
+
+    def get(self, url, **kwargs):
+        if url.endswith("conan_package.tgz"):
+            print(f"DOWNLOAD: {url}")
+        return super().get(url, **kwargs)
+
+
+def _client():
+    # app -> liba -> zlib (static, skipped)
+    #    \-> libb (header-only)
+    c = TestClient(default_server_user=True, light=True, requester_class=_DownloadsRequester)
+    c.save({"zlib/conanfile.py": GenConanfile("zlib", "1.0").with_package_type("static-library"),
+            "liba/conanfile.py": GenConanfile("liba", "1.0").with_package_type("shared-library")
+                                                            .with_requires("zlib/1.0"),
+            "libb/conanfile.py": GenConanfile("libb", "1.0"),
+            "app/conanfile.py": GenConanfile("app", "1.0").with_requires("liba/1.0", "libb/1.0")})
+    for pkg in ("zlib", "liba", "libb"):
+        c.run(f"create {pkg}")
+    c.run("upload * -r=default -c")
+    c.run("remove * -c")
+    return c
+
+
+def test_prefetch_binaries():
+    c = _client()
+    c.save_home({"global.conf": "core.download:prefetch_parallel=4"})
+    c.run("install app")
+    # Every package is downloaded once, the installer just waits for the prefetched ones
+    assert c.out.count("DOWNLOAD: ") == 3
+    assert "Downloading 2 packages" in c.out
+    c.assert_listed_binary({"liba/1.0": ("7551f3602249578c48e367cc772f38f65959e098",
+                                         "Download (default)"),
+                            "libb/1.0": ("da39a3ee5e6b4b0d3255bfef95601890afd80709",
+                                         "Download (default)")})
+    assert "Skipped binaries\n    zlib/1.0" in c.out
+    # The speculatively downloaded zlib, finally skipped, is complete in the cache too
+    c.run("list *:*")
+    assert "zlib/1.0" in c.out and "da39a3ee5e6b4b0d3255bfef95601890afd80709" in c.out
+    c.run("install app")
+    assert "DOWNLOAD: " not in c.out
+
+
+def test_prefetch_binaries_disabled():
+    c = _client()
+    c.run("install app")
+    assert c.out.count("DOWNLOAD: ") == 2
+
+
+def test_prefetch_binaries_not_installed():
+    # Only the commands that install the binaries prefetch them
+    c = _client()
+    c.save_home({"global.conf": "core.download:prefetch_parallel=4"})
+    c.run("graph info app")
+    c.run("lock create app")
+    assert "DOWNLOAD: " not in c.out
+    c.run("list *:*")
+    assert "da39a3ee5e6b4b0d3255bfef95601890afd80709" not in c.out
+
+
+def test_prefetch_binaries_install_error():
+    c = _client()
+    c.save_home({"global.conf": "core.download:prefetch_parallel=4"})
+    c.save({"libc/conanfile.py": GenConanfile("libc", "1.0"),
+            "app/conanfile.py": GenConanfile("app", "1.0").with_requires("liba/1.0", "libb/1.0",
+                                                                         "libc/1.0")})
+    c.run("export libc")
+    c.run("install app", assert_error=True)
+    assert "ERROR: Missing prebuilt package for 'libc/1.0'" in c.out
+    # The prefetched binaries are complete or not started, not interrupted by the error
+    c.run("list *:*")
+    assert "Corrupted" not in c.out
+    c.run("install app --build=missing")
+    c.assert_listed_binary({"libc/1.0": ("da39a3ee5e6b4b0d3255bfef95601890afd80709", "Build")})
@@ -0,0 +1,100 @@
+import json
+
+from conan.test.assets.genconanfile import GenConanfile
+from conan.test.utils.tools import TestClient
+
+
+def _client_with_uploaded_graph():
+    # app -> liba -> zlib
+    #    \-> libb ---/
+    #    \-> libc/[>=1.0]
+    c = TestClient(default_server_user=True, light=True)
+    c.save({"zlib/conanfile.py": GenConanfile("zlib", "1.0"),
+            "liba/conanfile.py": GenConanfile("liba", "1.0").with_requires("zlib/1.0"),
+            "libb/conanfile.py": GenConanfile("libb", "1.0").with_requires("zlib/1.0"),
+            "libc/conanfile.py": GenConanfile("libc", "1.0"),
+            "app/conanfile.py": GenConanfile("app", "1.0").with_requires("liba/1.0", "libb/1.0",
+                                                                         "libc/[>=1.0]")})
+    for pkg in ("zlib", "liba", "libb", "libc"):
+        c.run(f"export {pkg}")
+    c.run("upload * -r=default -c")
+    c.run("remove * -c")
+    return c
+
+
+def test_prefetch_recipes():
+    c = _client_with_uploaded_graph()
+    c.save_home({"global.conf": "core.graph:prefetch_parallel=4"})
+    c.run("graph info app --format=json")
+    for pkg in ("zlib", "liba", "libb", "libc"):
+        assert f'"ref": "{pkg}/1.0#' in c.stdout
+    c.run("list *")
+    for pkg in ("zlib", "liba", "libb", "libc"):
+        assert f"{pkg}/1.0" in c.out
+
+
+def test_prefetch_recipes_same_graph():
+    """ the resulting graph must be identical to the one computed without prefetching
+    """
+    c = _client_with_uploaded_graph()
+    c.run("graph info app --format=json")
+    expected = c.stdout
+    c.run("remove * -c")
+    c.save_home({"global.conf": "core.graph:prefetch_parallel=4"})
+    c.run("graph info app --format=json")
+    assert c.stdout == expected
+
+
+def test_prefetch_recipes_missing():
+    c = TestClient(default_server_user=True, light=True)
+    c.save_home({"global.conf": "core.graph:prefetch_parallel=4"})
+    c.save({"conanfile.py": GenConanfile("app", "1.0").with_requires("missing/1.0")})
+    c.run("graph info .", assert_error=True)
+    assert "Package 'missing/1.0' not resolved: Unable to find 'missing/1.0' in remotes" in c.out
+
+
+def test_prefetch_recipes_ranges_invariant():
+    """ a pinned recipe prefetched into the cache must not change the resolution of a version
+    range that is expanded before it
+    """
+    # pkgb -> pkgc -(tool)-> cmake/[*]
+    #    \-(tool)-> cmake/1.0 (only in the server)
+    c = TestClient(default_server_user=True, light=True)
+    c.save_home({"global.conf": "core.graph:prefetch_parallel=4"})
+    c.save({"cmake/conanfile.py": GenConanfile("cmake"),
+            "pkgc/conanfile.py": GenConanfile("pkgc", "1.0").with_tool_requires("cmake/[*]"),
+            "pkgb/conanfile.py": GenConanfile("pkgb", "1.0").with_requires("pkgc/1.0")
+                                                            .with_tool_requires("cmake/1.0")})
+    c.run("export cmake --version=0.5")
+    c.run("export cmake --version=1.0")
+    c.run("upload cmake/1.0* -c -r default")
+    c.run("remove cmake/1.0* -c")
+    c.run("export pkgc")
+    c.run("export pkgb")
+    c.run("graph info --requires=pkgb/1.0 --format=json")
+    graph = json.loads(c.stdout)["graph"]["nodes"]
+    pkgc = next(n for n in graph.values() if n["ref"].startswith("pkgc/1.0"))
+    cmake = next(d for d in pkgc["dependencies"].values() if d["ref"].startswith("cmake"))
+    assert cmake["ref"] == "cmake/0.5"
+
+
+def test_prefetch_recipes_overridden():
+    """ the requires replaced by a downstream force are not prefetched
+    """
+    # app -> liba -> zlib/1.2 (only in the server)
+    #    \-(force)-> zlib/1.3
+    c = TestClient(default_server_user=True, light=True)
+    c.save({"zlib/conanfile.py": GenConanfile("zlib"),
+            "liba/conanfile.py": GenConanfile("liba", "1.0").with_requires("zlib/1.2"),
+            "app/conanfile.py": GenConanfile("app", "1.0").with_requires("liba/1.0")
+                                                          .with_requirement("zlib/1.3",
+                                                                            force=True)})
+    c.run("export zlib --version=1.2")
+    c.run("upload zlib* -c -r default")
+    c.run("remove zlib* -c")
+    c.run("export zlib --version=1.3")
+    c.run("export liba")
+    c.save_home({"global.conf": "core.graph:prefetch_parallel=4"})
+    c.run("graph info app")
+    c.run("list zlib/1.2")
+    assert "ERROR: Recipe 'zlib/1.2' not found" in c.out
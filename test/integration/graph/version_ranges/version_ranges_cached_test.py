@@ -1,3 +1,4 @@
+import time
 from collections import OrderedDict
 
 import pytest
@@ -66,6 +67,74 @@ class TestVersionRangesCache:
             assert self.counters["server1"] == 1
 
 
+class TestVersionRangesPersistentCache:
+
+    @staticmethod
+    def _search(client, command):
+        """ returns the number of search requests to the remote done by the command, with an
+        empty local cache, so the ranges are always resolved in the remote
+        """
+        client.run("remove * -c")
+        calls = []
+        search_recipes = RemoteManager.search_recipes
+
+        def counted(remote_manager, remote, pattern):
+            calls.append(pattern)
+            return search_recipes(remote_manager, remote, pattern)
+
+        with patch.object(RemoteManager, "search_recipes", new=counted):
+            client.run(command)
+        return len(calls)
+
+    def test_remote_search_ttl(self):
+        c = TestClient(light=True, default_server_user=True)
+        c.save_home({"global.conf": "core.version_ranges:remote_search_ttl=3600"})
+        c.save({"conanfile.py": GenConanfile("liba")})
+        c.run("create . --version=1.0")
+        c.run("upload * -r=default -c")
+        c.run("remove * -c")
+
+        assert self._search(c, "graph info --requires=liba/[*]") == 1
+        assert "liba/1.0" in c.out
+        # Second process reuses the persisted results
+        assert self._search(c, "graph info --requires=liba/[*]") == 0
+        assert "liba/1.0" in c.out
+        # --update bypasses it
+        assert self._search(c, "graph info --requires=liba/[*] --update") == 1
+
+        # An upload invalidates it
+        c.run("create . --version=1.1")
+        c.run("upload * -r=default -c")
+        assert self._search(c, "graph info --requires=liba/[*]") == 1
+        assert "liba/1.1" in c.out
+        assert self._search(c, "graph info --requires=liba/[*]") == 0
+
+        # Changes in remotes invalidate it
+        c.run("remote disable default")
+        c.run("remote enable default")
+        assert self._search(c, "graph info --requires=liba/[*]") == 1
+
+    def test_remote_search_ttl_expired(self):
+        c = TestClient(light=True, default_server_user=True)
+        c.save_home({"global.conf": "core.version_ranges:remote_search_ttl=3600"})
+        c.save({"conanfile.py": GenConanfile("liba")})
+        c.run("create . --version=1.0")
+        c.run("upload * -r=default -c")
+        c.run("remove * -c")
+        assert self._search(c, "graph info --requires=liba/[*]") == 1
+        with patch("time.time", return_value=time.time() + 3601):
+            assert self._search(c, "graph info --requires=liba/[*]") == 1
+
+    def test_remote_search_no_ttl(self):
+        c = TestClient(light=True, default_server_user=True)
+        c.save({"conanfile.py": GenConanfile("liba")})
+        c.run("create . --version=1.0")
+        c.run("upload * -r=default -c")
+        c.run("remove * -c")
+        assert self._search(c, "graph info --requires=liba/[*]") == 1
+        assert self._search(c, "graph info --requires=liba/[*]") == 1
+
+
 class TestVersionRangesDiamond:
 
     def test_caching_errors(self):
@@ -0,0 +1,87 @@
+import re
+
+from conans import LATEST_PACKAGES_BATCH
+from conan.test.assets.genconanfile import GenConanfile
+from conan.test.utils.tools import TestClient, TestRequester, TestServer
+
+
+class RequesterClass(TestRequester):
+
+    def get(self, url, **kwargs):
+        print(f"GET: {url}")
+        return super(RequesterClass, self).get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        print(f"POST: {url}")
+        return super(RequesterClass, self).post(url, **kwargs)
+
+
+def _client(server_capabilities):
+    server = TestServer(users={"admin": "password"}, server_capabilities=server_capabilities)
+    c = TestClient(servers={"default": server}, inputs=["admin", "password"],
+                   requester_class=RequesterClass)
+    c.save({"dep/conanfile.py": GenConanfile(),
+            "app/conanfile.py": GenConanfile("app", "0.1").with_requires("dep1/0.1", "dep2/0.1",
+                                                                         "dep3/0.1")})
+    for i in (1, 2, 3):
+        c.run(f"create dep --name=dep{i} --version=0.1")
+    c.run("upload * -r=default -c")
+    c.run("remove * -c")
+    c.run("create dep --name=dep3 --version=0.1")  # dep3 is already in the cache
+    return c
+
+
+def test_latest_packages_batch():
+    c = _client([LATEST_PACKAGES_BATCH])
+    c.run("install app")
+    assert c.out.count("POST: ") == 1
+    assert "/v2/conans/packages/latest" in c.out
+    # No individual request for the latest package revision of any binary
+    assert not re.search(r"packages/[0-9a-f]+/latest", c.out)
+    pkg_id = "da39a3ee5e6b4b0d3255bfef95601890afd80709"
+    c.assert_listed_binary({"dep1/0.1": (pkg_id, "Download (default)"),
+                            "dep2/0.1": (pkg_id, "Download (default)"),
+                            "dep3/0.1": (pkg_id, "Cache")})
+
+
+def test_latest_packages_batch_missing():
+    c = _client([LATEST_PACKAGES_BATCH])
+    c.run("remove dep2/*:* -r=default -c")
+    c.run("remove dep2/*:* -c")
+    c.run("install app", assert_error=True)
+    assert "ERROR: Missing prebuilt package for 'dep2/0.1'" in c.out
+    c.run("install app --build=missing")
+    pkg_id = "da39a3ee5e6b4b0d3255bfef95601890afd80709"
+    c.assert_listed_binary({"dep1/0.1": (pkg_id, "Download (default)"),
+                            "dep2/0.1": (pkg_id, "Build")})
+
+
+def test_latest_packages_batch_not_supported():
+    c = _client([])
+    c.run("install app")
+    assert "POST: " not in c.out
+    assert "dep1/0.1/_/_/revisions/4d670581ccb765839f2239cc8dff8fbd/packages/" \
+           "da39a3ee5e6b4b0d3255bfef95601890afd80709/latest" in c.out
+    pkg_id = "da39a3ee5e6b4b0d3255bfef95601890afd80709"
+    c.assert_listed_binary({"dep1/0.1": (pkg_id, "Download (default)"),
+                            "dep2/0.1": (pkg_id, "Download (default)")})
+
+
+def test_latest_packages_batch_forbidden():
+    """ a pref that cannot be read fails the whole batch, then the individual request of every
+    binary is done, so the error is reported for that binary, like without the batch
+    """
+    server = TestServer(read_permissions=[("dep2/*@*/*", "nobody"), ("*/*@*/*", "*")],
+                        users={"admin": "password"}, server_capabilities=[LATEST_PACKAGES_BATCH])
+    c = TestClient(servers={"default": server}, inputs=["admin", "password"],
+                   requester_class=RequesterClass)
+    c.save({"dep/conanfile.py": GenConanfile(),
+            "app/conanfile.py": GenConanfile("app", "0.1").with_requires("dep1/0.1", "dep2/0.1")})
+    c.run("create dep --name=dep1 --version=0.1")
+    c.run("export dep --name=dep2 --version=0.1")
+    c.run("upload dep1* -r=default -c")
+    c.run("remove dep1* -c")
+    c.run("install app", assert_error=True)
+    assert "POST: " in c.out
+    assert re.search(r"GET: .*/dep2/0.1/_/_/revisions/[0-9a-f]+/packages/[0-9a-f]+/latest", c.out)
+    assert "ERROR: Permission denied for user: 'admin'" in c.out
@@ -155,3 +155,28 @@ def test_back_default_compatibility_migration():
     with patch('conan.api.conan_api.ClientMigrator', new=lambda *args, **kwargs: migrator):
         t.run("-v")  # Fire the backward migration
         assert f"WARN: Downgrading cache from Conan {conan_version} to 2.3.2" in t.out
+
+
+def test_migration_db_indexes():
+    t = TestClient(light=True)
+    t.save({"conanfile.py": GenConanfile("pkg", "0.1")})
+    t.run("create .")
+    db = os.path.join(t.cache_folder, "p", "cache.sqlite3")
+
+    def _indexes():
+        connection = sqlite3.connect(db, isolation_level=None, timeout=1)
+        try:
+            r = connection.execute("SELECT name FROM sqlite_master WHERE type='index' "
+                                   "AND sql IS NOT NULL")
+            return sorted(row[0] for row in r.fetchall())
+        finally:
+            connection.close()
+
+    expected = ["packages_reference_rrev_pkgid_timestamp_idx", "recipes_reference_timestamp_idx"]
+    assert _indexes() == expected
+    _drop_lru_column(os.path.dirname(db))  # Recreates the tables without the indexes
+    assert _indexes() == []
+    save(os.path.join(t.cache_folder, "version.txt"), "1.0.0")
+    t.run("list *:*")
+    assert _indexes() == expected
+    assert "pkg/0.1" in t.out
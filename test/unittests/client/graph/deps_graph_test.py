@@ -6,6 +6,7 @@ from conans.client.graph.graph import CONTEXT_HOST
 from conans.client.graph.graph_builder import DepsGraph, Node
 from conans.model.conan_file import ConanFile
 from conans.model.recipe_ref import RecipeReference
+from conans.model.requires import Requirement
 
 
 class DepsGraphTest(unittest.TestCase):
@@ -111,3 +112,66 @@ class DepsGraphTest(unittest.TestCase):
         deps.add_edge(n2, n32, None)
         deps.add_edge(n32, n5, None)
         self.assertEqual([[n31, n5], [n32], [n2], [n1]], deps.by_levels())
+
+    def test_levels_cache(self):
+        ref1 = RecipeReference.loads("hello/1.0@user/stable")
+        ref2 = RecipeReference.loads("hello/2.0@user/stable")
+        ref3 = RecipeReference.loads("hello/3.0@user/stable")
+
+        deps = DepsGraph()
+        n1 = Node(ref1, Mock(), context=CONTEXT_HOST)
+        n2 = Node(ref2, Mock(), context=CONTEXT_HOST)
+        n3 = Node(ref3, Mock(), context=CONTEXT_HOST)
+        deps.add_node(n1)
+        deps.add_node(n2)
+        deps.add_edge(n1, n2, None)
+        levels = deps.by_levels()
+        self.assertEqual([[n2], [n1]], levels)
+        self.assertIs(levels, deps.by_levels())
+
+        # Adding nodes and edges invalidates the cache
+        deps.add_node(n3)
+        self.assertEqual([[n2, n3], [n1]], deps.by_levels())
+        deps.add_edge(n2, n3, None)
+        self.assertEqual([[n3], [n2], [n1]], deps.by_levels())
+
+    def test_levels_package_id_order(self):
+        # The nodes in the same level are sorted by package_id, that can change after computing
+        ref = RecipeReference.loads("hello/1.0@user/stable")
+        deps = DepsGraph()
+        n1 = Node(ref, Mock(), context=CONTEXT_HOST)
+        n2 = Node(ref, Mock(), context=CONTEXT_HOST)
+        deps.add_node(n1)
+        deps.add_node(n2)
+        self.assertEqual([[n1, n2]], deps.by_levels())
+        n1.package_id = "2"
+        n2.package_id = "1"
+        self.assertEqual([[n2, n1]], deps.by_levels())
+
+    def test_transitive_index(self):
+        app = Node(RecipeReference.loads("app/1.0"), Mock(vendor=False), context=CONTEXT_HOST)
+        lib = Node(RecipeReference.loads("lib/1.0"), Mock(vendor=False), context=CONTEXT_HOST)
+        lib_require = Requirement(RecipeReference.loads("lib/1.0"))
+        zlib_require = Requirement(RecipeReference.loads("zlib/1.0"))
+        app.add_transitive_require(lib_require)
+        app.add_transitive_require(zlib_require)
+        deps = DepsGraph()
+        deps.add_node(app)
+        deps.add_node(lib)
+        deps.add_edge(app, lib, lib_require)
+        app.propagate_downstream(lib_require, lib)
+        index = deps.transitive_index
+        self.assertEqual(2, index.count("lib"))  # lib node + app transitive_deps
+        self.assertEqual(1, index.count("zlib"))
+        # The own not expanded require of app cannot be found downstream
+        self.assertIsNone(app.check_downstream_exists(zlib_require))
+        # But "zlib" is found in app when expanding lib requires
+        lib_zlib = Requirement(RecipeReference.loads("zlib/1.1"))
+        lib.add_transitive_require(lib_zlib)
+        prev_require, prev_node, base = lib.check_downstream_exists(lib_zlib)
+        self.assertIs(prev_require, zlib_require)
+        self.assertIsNone(prev_node)
+        self.assertIs(base, app)
+        lib_bzip2 = Requirement(RecipeReference.loads("bzip2/1.0"))
+        lib.add_transitive_require(lib_bzip2)
+        self.assertIsNone(lib.check_downstream_exists(lib_bzip2))
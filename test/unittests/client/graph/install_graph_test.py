@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from conans.client.graph.install_graph import InstallGraph
+
+
+def _build_order(nodes, seed):
+    """ a random DAG of nodes, every node can only depend on the previous ones, but the list is
+    shuffled, so the install order is different from the definition order
+    """
+    rand = random.Random(seed)
+    refs = [f"pkg{i}/1.0#rev{i}" for i in range(nodes)]
+    items = []
+    for i, ref in enumerate(refs):
+        depends = rand.sample(refs[:i], min(i, rand.randint(0, 4)))
+        binary = "Build" if rand.random() < 0.3 else "Download"
+        package = {"package_id": f"pkgid{i}", "prev": None, "context": "host", "binary": binary,
+                   "options": [], "filenames": [], "depends": [], "overrides": {}}
+        items.append({"ref": ref, "depends": depends, "packages": [[package]]})
+    rand.shuffle(items)
+    return {"order_by": "recipe", "reduced": False, "order": [items]}
+
+
+def _legacy_install_order(nodes):
+    levels = []
+    opened = nodes
+    while opened:
+        current_level = [o for o in opened.values() if not any(n in opened for n in o.depends)]
+        levels.append(current_level)
+        opened = {k: v for k, v in opened.items() if v not in current_level}
+    return levels
+
+
+def _legacy_reduce(nodes):
+    result = {}
+    for k, node in nodes.items():
+        if node.need_build:
+            result[k] = node
+        else:
+            dependencies = node.depends
+            for n in nodes.values():
+                if k in n.depends:
+                    n.depends = [d for d in n.depends if d != k]
+                    n.depends.extend(d for d in dependencies if d not in n.depends)
+    return result
+
+
+def _serialize(levels):
+    return [[n.serialize() for n in level] for level in levels]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_install_order_same_as_legacy(seed):
+    data = _build_order(200, seed)
+    install_graph = InstallGraph.deserialize(data, "file")
+    expected = _serialize(_legacy_install_order(install_graph._nodes))
+    assert _serialize(install_graph.install_order()) == expected
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_reduce_same_as_legacy(seed):
+    data = _build_order(200, seed)
+    install_graph = InstallGraph.deserialize(data, "file")
+    install_graph.reduce()
+    legacy = InstallGraph.deserialize(data, "file")
+    expected = _serialize(_legacy_install_order(_legacy_reduce(legacy._nodes)))
+    assert _serialize(install_graph.install_order()) == expected
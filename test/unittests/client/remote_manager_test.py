@@ -1,10 +1,14 @@
+import gzip
 import os
+import tarfile
 import unittest
 
+from mock import patch
+
 from conan.internal.api.uploader import compress_files
 from conan.internal.paths import PACKAGE_TGZ_NAME
 from conan.test.utils.test_files import temp_folder
-from conans.util.files import save
+from conans.util.files import save, load, tar_extract, ParallelGzipWriter
 
 
 class RemoteManagerTest(unittest.TestCase):
@@ -23,3 +27,53 @@ class RemoteManagerTest(unittest.TestCase):
         self.assertTrue(os.path.exists(path))
         expected_path = os.path.join(folder, PACKAGE_TGZ_NAME)
         self.assertEqual(path, expected_path)
+
+    def test_compress_files_parallel(self):
+        folder = temp_folder()
+        # Several blocks, with repeated data across the blocks boundaries
+        content = "".join(f"line {i} of the big file\n" for i in range(30000))
+        save(os.path.join(folder, "big.txt"), content)
+        save(os.path.join(folder, "small.txt"), "small")
+        files = {"big.txt": os.path.join(folder, "big.txt"),
+                 "small.txt": os.path.join(folder, "small.txt")}
+
+        results = []
+        for threads in (1, 4):
+            dest = temp_folder()
+            path = compress_files(files, PACKAGE_TGZ_NAME, dest_dir=dest, threads=threads)
+            with open(path, "rb") as f:
+                results.append(f.read())
+        # Reproducible, independent of the number of threads
+        self.assertEqual(results[0], results[1])
+
+        # Standard gzip stream, readable by any gzip and tarfile
+        with tarfile.open(fileobj=gzip.GzipFile(path), mode="r|") as tar:
+            self.assertEqual(["big.txt", "small.txt"], [m.name for m in tar])
+        extract = temp_folder()
+        with open(path, "rb") as f:
+            tar_extract(f, extract)
+        self.assertEqual(content, load(os.path.join(extract, "big.txt")))
+        self.assertEqual("small", load(os.path.join(extract, "small.txt")))
+
+    def test_compress_files_no_threads(self):
+        # core.gzip:threads=0 disables the parallel compression, same as not defining it
+        folder = temp_folder()
+        save(os.path.join(folder, "file.txt"), "contents")
+        files = {"file.txt": os.path.join(folder, "file.txt")}
+        results = []
+        for threads in (None, 0):
+            path = compress_files(files, PACKAGE_TGZ_NAME, dest_dir=temp_folder(),
+                                  threads=threads)
+            with open(path, "rb") as f:
+                results.append(f.read())
+        self.assertEqual(results[0], results[1])
+
+    def test_parallel_gzip_writer_header_error(self):
+        class _FailingFile:
+            def write(self, _):
+                raise OSError("disk full")
+
+        with patch("multiprocessing.pool.ThreadPool.join") as join:
+            with self.assertRaisesRegex(OSError, "disk full"):
+                ParallelGzipWriter("conan_package.tgz", _FailingFile(), threads=2)
+            self.assertEqual(1, join.call_count)
@@ -1,9 +1,11 @@
 import os
 import re
 import tempfile
+import threading
 import unittest
 
 import pytest
+import requests
 
 from conans.client.downloaders.file_downloader import FileDownloader
 from conans.errors import ConanException
@@ -34,20 +36,24 @@ class MockRequester(object):
         self._chunk_size = chunk_size if chunk_size is not None else len(data)
         self._accept_ranges = accept_ranges
         self._echo_header = echo_header.copy() if echo_header else {}
+        self.ranges = []
 
     def get(self, *_args, **kwargs):
         start = 0
         headers = kwargs.get("headers") or {}
         transfer_range = headers.get("range", "")
-        match = re.match(r"bytes=([0-9]+)-", transfer_range)
+        self.ranges.append(transfer_range)
+        match = re.match(r"bytes=([0-9]+)-([0-9]*)", transfer_range)
         status = 200
+        end = len(self._data) - 1
         headers = {"Content-Length": len(self._data), "Accept-Ranges": "bytes"}
         if match and self._accept_ranges:
             start = int(match.groups()[0])
+            end = int(match.groups()[1]) if match.groups()[1] else end
             if start < len(self._data):
                 status = 206
-                headers.update({"Content-Length": str(len(self._data) - start),
-                                "Content-Range": "bytes {}-{}/{}".format(start, len(self._data) - 1,
+                headers.update({"Content-Length": str(end + 1 - start),
+                                "Content-Range": "bytes {}-{}/{}".format(start, end,
                                                                          len(self._data))})
             else:
                 status = 416
@@ -55,7 +61,8 @@ class MockRequester(object):
                                 "Content-Range": "bytes */{}".format(len(self._data))})
         else:
             headers.update(self._echo_header)
-        response = MockResponse(self._data[start:start + self._chunk_size], status_code=status,
+        response = MockResponse(self._data[start:min(start + self._chunk_size, end + 1)],
+                                status_code=status,
                                 headers=headers)
         return response
 
@@ -113,3 +120,106 @@ class DownloaderUnitTest(unittest.TestCase):
         downloader.download("fake_url", file_path=self.target)
         actual_content = open(self.target, "rb").read()
         self.assertEqual(expected_content, actual_content)
+
+
+class TestSegmentedDownload:
+    data = os.urandom(11 * 1000 * 1000)  # Only files > 10MB are segmented
+
+    def test_segmented_download(self, tmp_path):
+        target = str(tmp_path / "target")
+        requester = MockRequester(self.data)
+        downloader = FileDownloader(requester=requester, segments=4)
+        downloader.download("fake_url", file_path=target)
+        assert open(target, "rb").read() == self.data
+        # The first segment is read from the initial response
+        assert sorted(requester.ranges) == ["", "bytes=2750000-5499999", "bytes=5500000-8249999",
+                                            "bytes=8250000-10999999"]
+
+    def test_segmented_download_resume_segments(self, tmp_path):
+        target = str(tmp_path / "target")
+        # Every response is truncated, each segment needs a second request to complete
+        requester = MockRequester(self.data, chunk_size=2000000)
+        downloader = FileDownloader(requester=requester, segments=4)
+        downloader.download("fake_url", file_path=target, retry=0)
+        assert open(target, "rb").read() == self.data
+        assert "bytes=2000000-2749999" in requester.ranges
+
+    def test_segmented_download_checksum(self, tmp_path):
+        target = str(tmp_path / "target")
+        requester = MockRequester(self.data, echo_header={"X-Checksum-Sha1": "1234"})
+        downloader = FileDownloader(requester=requester, segments=4)
+        with pytest.raises(ConanException, match="sha1 signature failed"):
+            downloader.download("fake_url", file_path=target, retry=0)
+        assert not os.path.exists(target)
+
+    def test_not_segmented_if_no_ranges(self, tmp_path):
+        target = str(tmp_path / "target")
+        requester = MockRequester(self.data, accept_ranges=False,
+                                  echo_header={"Accept-Ranges": "none"})
+        downloader = FileDownloader(requester=requester, segments=4)
+        downloader.download("fake_url", file_path=target)
+        assert open(target, "rb").read() == self.data
+        assert requester.ranges == [""]
+
+    def test_segmented_download_ranges_not_served(self, tmp_path, capsys):
+        # Accept-Ranges: bytes is advertised, but the ranges are answered with the full file
+        target = str(tmp_path / "target")
+        requester = MockRequester(self.data, accept_ranges=False)
+        downloader = FileDownloader(requester=requester, segments=4)
+        downloader.download("fake_url", file_path=target, retry=0)
+        assert open(target, "rb").read() == self.data
+        assert "downloading it without segments" in capsys.readouterr().err
+        # Every segment fails once, without retries, then a single stream download
+        assert len(requester.ranges) <= 5
+        assert requester.ranges[0] == requester.ranges[-1] == ""
+
+    def test_segmented_download_broken_connection(self, tmp_path, monkeypatch):
+        # The connection of a segment is broken in the middle once, it is resumed
+        class BrokenResponse(MockResponse):
+            def iter_content(self, size):
+                yield self.data[:1000]
+                raise requests.exceptions.ChunkedEncodingError("connection broken")
+
+        class BrokenRequester(MockRequester):
+            broken = False
+
+            def get(self, *args, **kwargs):
+                response = super().get(*args, **kwargs)
+                with lock:
+                    if response.status_code == 206 and not self.broken:
+                        self.broken = kwargs["headers"]["range"]
+                        response.__class__ = BrokenResponse
+                return response
+
+        lock = threading.Lock()
+        monkeypatch.setattr("time.sleep", lambda _: None)
+        target = str(tmp_path / "target")
+        requester = BrokenRequester(self.data)
+        downloader = FileDownloader(requester=requester, segments=4)
+        downloader.download("fake_url", file_path=target, retry=0)
+        assert open(target, "rb").read() == self.data
+        assert len(requester.ranges) == 5
+        start, end = (int(v) for v in requester.broken[len("bytes="):].split("-"))
+        assert f"bytes={start + 1000}-{end}" in requester.ranges
+
+    def test_segmented_download_broken_segment(self, tmp_path, monkeypatch):
+        # A segment fails always, after its retries the download fails and the others stop
+        class BrokenResponse(MockResponse):
+            def iter_content(self, size):
+                raise requests.exceptions.ConnectionError("connection broken")
+
+        class BrokenRequester(MockRequester):
+            def get(self, *args, **kwargs):
+                response = super().get(*args, **kwargs)
+                if (kwargs.get("headers") or {}).get("range") == "bytes=2750000-5499999":
+                    response.__class__ = BrokenResponse
+                return response
+
+        monkeypatch.setattr("time.sleep", lambda _: None)
+        target = str(tmp_path / "target")
+        requester = BrokenRequester(self.data)
+        downloader = FileDownloader(requester=requester, segments=4)
+        with pytest.raises(ConanException, match="connection broken"):
+            downloader.download("fake_url", file_path=target, retry=0)
+        assert requester.ranges.count("bytes=2750000-5499999") == 4
+        assert not os.path.exists(target)
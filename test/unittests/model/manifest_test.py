@@ -1,11 +1,12 @@
 import os
 import platform
+import shutil
 
 import pytest
 
 from conans.model.manifest import FileTreeManifest
 from conan.test.utils.test_files import temp_folder
-from conans.util.files import load, md5, save
+from conans.util.files import load, md5, mkdir, save
 
 
 @pytest.mark.skipif(platform.system() == "Windows", reason="decent symlinks only")
@@ -82,3 +83,83 @@ def test_pycache_included():
     manifest = repr(manifest)
     assert "pythonfile.pyc" in manifest
     assert "__pycache__/damn.py" in manifest
+
+
+def test_archive_names_included():
+    # Only the archives produced by Conan (.tgz) are excluded, not user files with similar names
+    tmp_dir = temp_folder()
+    for filename in ("conan_package.tgz", "conan_package.tar", "conan_sources.tzst", "file.txt"):
+        save(os.path.join(tmp_dir, filename), "contents")
+
+    manifest = FileTreeManifest.create(tmp_dir)
+    assert set(manifest.file_sums) == {"conan_package.tar", "conan_sources.tzst", "file.txt"}
+
+
+def test_tree_manifest_hash_cache():
+    tmp_dir = temp_folder()
+    folder = os.path.join(tmp_dir, "folder")
+    for i in range(10):
+        save(os.path.join(folder, f"sub{i % 3}", f"file{i}.txt"), f"content{i}")
+    old = 1000000000  # old modification times, not considered racy
+    for root, _, files in os.walk(folder):
+        for f in files:
+            os.utime(os.path.join(root, f), (old, old))
+    hash_cache = os.path.join(tmp_dir, "hashes.json")
+
+    expected = repr(FileTreeManifest.create(folder))
+    manifest = FileTreeManifest.create(folder, hash_cache=hash_cache)
+    assert repr(manifest).split("\n", 1)[1] == expected.split("\n", 1)[1]
+    assert os.path.isfile(hash_cache)
+
+    # The cached md5 are used for the unchanged files
+    cached_file = os.path.join(folder, "sub0", "file0.txt")
+    with open(cached_file, "r+") as f:  # same size and modification time
+        f.write("CONTENT0")
+    os.utime(cached_file, (old, old))
+    manifest = FileTreeManifest.create(folder, hash_cache=hash_cache)
+    assert manifest.file_sums["sub0/file0.txt"] == md5("content0")
+
+    # The modified ones are hashed again
+    save(os.path.join(folder, "sub1", "file1.txt"), "modified")
+    manifest = FileTreeManifest.create(folder, hash_cache=hash_cache)
+    assert manifest.file_sums["sub1/file1.txt"] == md5("modified")
+    # and the files modified recently are not cached, they could change with the same stat
+    save(os.path.join(folder, "sub1", "file1.txt"), "modifiex")
+    manifest = FileTreeManifest.create(folder, hash_cache=hash_cache)
+    assert manifest.file_sums["sub1/file1.txt"] == md5("modifiex")
+
+
+def test_tree_manifest_hash_cache_origin():
+    tmp_dir = temp_folder()
+    recipe = os.path.join(tmp_dir, "recipe")
+    save(os.path.join(recipe, "conanfile.py"), "conanfile")
+    save(os.path.join(recipe, "src", "main.cpp"), "main")
+    old = 1000000000  # old modification times, not considered racy
+    for f in ("conanfile.py", "src/main.cpp"):
+        os.utime(os.path.join(recipe, f), (old, old))
+    hash_cache = os.path.join(tmp_dir, "hashes.json")
+
+    def export():
+        export_folder = temp_folder()
+        sources_folder = temp_folder()
+        shutil.copy2(os.path.join(recipe, "conanfile.py"), export_folder)
+        mkdir(os.path.join(sources_folder, "src"))
+        shutil.copy2(os.path.join(recipe, "src", "main.cpp"), os.path.join(sources_folder, "src"))
+        return FileTreeManifest.create(export_folder, sources_folder, hash_cache=hash_cache,
+                                       origin_folder=recipe)
+
+    manifest = export()
+    assert manifest.file_sums == {"conanfile.py": md5("conanfile"),
+                                  "export_source/src/main.cpp": md5("main")}
+
+    # The new copies of the unchanged user files use the cached md5 of their originals
+    main = os.path.join(recipe, "src", "main.cpp")
+    save(main, "MAIN")  # same size and modification time
+    os.utime(main, (old, old))
+    manifest = export()
+    assert manifest.file_sums["export_source/src/main.cpp"] == md5("main")
+
+    # The copies that don't match the original stat are hashed
+    os.utime(main, (old + 1, old + 1))
+    manifest = export()
+    assert manifest.file_sums["export_source/src/main.cpp"] == md5("MAIN")
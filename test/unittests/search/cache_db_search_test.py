@@ -1,3 +1,43 @@
-class CacheDbSearchTest:
-    # TODO: cache2.0 add some unittests for serach in cache db
-    pass
+import os
+
+import pytest
+
+from conan.internal.cache.db.cache_database import CacheDatabase
+from conan.test.utils.test_files import temp_folder
+from conans.model.recipe_ref import RecipeReference
+
+
+class TestCacheDbSearch:
+
+    @pytest.fixture(autouse=True)
+    def _db(self):
+        self.db = CacheDatabase(os.path.join(temp_folder(), "cache.sqlite3"))
+        for i, r in enumerate(["zlib/1.2.11#rev1", "zlib/1.2.13#rev2", "zlib_ng/2.0#rev3",
+                               "zlibx/1.0@user/stable#rev4", "Openssl/3.0#rev5"]):
+            ref = RecipeReference.loads(r)
+            ref.timestamp = i
+            self.db.create_recipe(f"path{i}", ref)
+
+    def _search(self, prefix, ignorecase=True):
+        return [r.repr_notime() for r in self.db.list_references(prefix, ignorecase)]
+
+    def test_no_prefix(self):
+        assert len(self._search(None)) == 5
+
+    def test_prefix(self):
+        # Ordered by timestamp, latest first
+        assert self._search("zlib/") == ["zlib/1.2.13#rev2", "zlib/1.2.11#rev1"]
+        assert self._search("zlibx/1.0@user") == ["zlibx/1.0@user/stable#rev4"]
+        assert self._search("zlib/1.2.11#") == ["zlib/1.2.11#rev1"]
+        assert self._search("zlib/1.2.11#rev1") == ["zlib/1.2.11#rev1"]
+        assert self._search("zlib/1.2.11#rev2") == []
+
+    def test_prefix_like_wildcards_escaped(self):
+        # The "_" is a LIKE wildcard, it must be matched literally
+        assert self._search("zlib_") == ["zlib_ng/2.0#rev3"]
+        assert self._search("zlib%") == []
+
+    def test_prefix_ignorecase(self):
+        assert self._search("openssl") == ["Openssl/3.0#rev5"]
+        assert self._search("openssl", ignorecase=False) == []
+        assert self._search("Openssl", ignorecase=False) == ["Openssl/3.0#rev5"]
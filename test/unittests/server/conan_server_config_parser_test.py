@@ -103,3 +103,27 @@ disk_storage_path: ./custom_data
         save(conf_path, server_conf)
         server_config = ConanServerConfigParser(server_dir, is_custom_path=True)
         self.assertEqual(server_config.disk_storage_path, os.path.join(server_dir, "custom_data"))
+
+    def test_workers(self):
+        tmp_dir = temp_folder()
+        server_dir = os.path.join(tmp_dir, ".conan_server")
+        mkdir(server_dir)
+        conf_path = os.path.join(server_dir, "server.conf")
+        save(conf_path, "[server]\n\n[write_permissions]\n\n[users]\n")
+        server_config = ConanServerConfigParser(tmp_dir)
+        self.assertEqual(server_config.threads, 0)
+        self.assertEqual(server_config.processes, 1)
+        self.assertEqual(server_config.request_queue, 64)
+        self.assertEqual(server_config.keepalive_timeout, 5)
+
+        save(conf_path, "[server]\nthreads: 8\nprocesses: 2\nrequest_queue: 10\n"
+                        "keepalive_timeout: 2\n\n[write_permissions]\n\n[users]\n")
+        server_config = ConanServerConfigParser(tmp_dir, environment={"CONAN_SERVER_THREADS": "4"})
+        self.assertEqual(server_config.threads, 4)
+        self.assertEqual(server_config.processes, 2)
+        self.assertEqual(server_config.request_queue, 10)
+        self.assertEqual(server_config.keepalive_timeout, 2)
+
+        server_config = ConanServerConfigParser(tmp_dir, environment={"CONAN_SERVER_THREADS": "a"})
+        with self.assertRaisesRegex(ConanException, "'threads' setting must be an integer"):
+            server_config.threads
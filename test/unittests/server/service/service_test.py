@@ -1,8 +1,13 @@
 import copy
+import hashlib
+import io
 import os
 import unittest
 
-from conans.errors import NotFoundException
+import pytest
+from mock import patch
+
+from conans.errors import NotFoundException, RequestErrorException
 from conans.model.manifest import FileTreeManifest
 from conans.model.package_ref import PkgReference
 from conans.model.recipe_ref import RecipeReference
@@ -11,6 +16,7 @@ from conans.server.service.authorize import BasicAuthorizer
 from conans.server.service.v2.search import SearchService
 from conans.server.service.v2.service_v2 import ConanServiceV2
 from conans.server.store.disk_adapter import ServerDiskAdapter
+from conans.server.store.metadata_index import MetadataIndex
 from conans.server.store.server_store import ServerStore
 from conan.test.assets.genconanfile import GenConanfile
 from conan.test.utils.test_files import temp_folder
@@ -127,3 +133,193 @@ class ConanServiceTest(unittest.TestCase):
         self.assertRaises(NotFoundException,
                           self.service.remove_recipe,
                           RecipeReference("Fake", "1.0", "lasote", "stable"), "lasote")
+
+
+class TestMetadataIndex:
+
+    @staticmethod
+    def _upload(server_store, pref, options):
+        save_files(server_store.export(pref.ref), {"conanfile.py": "", CONAN_MANIFEST: ""})
+        server_store.update_last_revision(pref.ref)
+        save_files(server_store.package(pref), {CONANINFO: options, CONAN_MANIFEST: ""})
+        server_store.update_last_package_revision(pref)
+
+    def test_search_indexed(self):
+        tmp_dir = temp_folder()
+        adapter = ServerDiskAdapter("http://url", tmp_dir)
+        index_path = os.path.join(tmp_dir, ".metadata_index.sqlite3")
+        server_store = ServerStore(adapter, MetadataIndex(index_path))
+        authorizer = BasicAuthorizer([("*/*@*/*", "*")], [("*/*@*/*", "*")])
+        search_service = SearchService(authorizer, server_store, "lasote")
+        service = ConanServiceV2(authorizer, server_store)
+
+        ref = RecipeReference.loads("openssl/2.0@lasote/testing#rev1")
+        ref2 = RecipeReference.loads("zlib/1.0#rev2")
+        pref = PkgReference(ref, "pkgid1", "prev1")
+        self._upload(server_store, pref, "[options]\nshared=True")
+        self._upload(server_store, PkgReference(ref, "pkgid2", "prev2"), "[options]\nshared=False")
+        self._upload(server_store, PkgReference(ref2, "pkgid3", "prev3"), "")
+
+        expected_refs = [RecipeReference.loads("openssl/2.0@lasote/testing"),
+                         RecipeReference.loads("zlib/1.0")]
+        expected_infos = {"pkgid1": {"content": "[options]\nshared=True"},
+                          "pkgid2": {"content": "[options]\nshared=False"}}
+        assert search_service.search() == expected_refs
+        assert search_service.search(pattern="zlib*") == expected_refs[1:]
+        assert search_service.search_packages(ref) == expected_infos
+
+        # New package revision
+        self._upload(server_store, PkgReference(ref, "pkgid1", "prev4"), "[options]\nshared=1")
+        assert search_service.search_packages(ref)["pkgid1"] == {"content": "[options]\nshared=1"}
+        service.remove_package(PkgReference(ref, "pkgid1", "prev4"), "lasote")
+        assert search_service.search_packages(ref) == expected_infos
+
+        # The index is the same when it is rebuilt from the storage
+        rebuilt_store = ServerStore(adapter, MetadataIndex(index_path))
+        rebuilt_store.rebuild_metadata_index()
+        assert SearchService(authorizer, rebuilt_store, "lasote").search() == expected_refs
+        assert search_service.search_packages(ref) == expected_infos
+
+        service.remove_all_packages(ref, "lasote")
+        assert search_service.search_packages(ref) == {}
+        service.remove_recipe(ref2, "lasote")
+        assert search_service.search() == expected_refs[:1]
+
+
+class TestUploads:
+
+    @pytest.fixture
+    def service(self):
+        authorizer = BasicAuthorizer([("*/*@*/*", "*")], [("*/*@*/*", "*")])
+        adapter = ServerDiskAdapter("http://url", temp_folder())
+        self.server_store = ServerStore(storage_adapter=adapter)
+        return ConanServiceV2(authorizer, self.server_store)
+
+    @staticmethod
+    def _upload(service, ref, contents, sha1=None):
+        headers = {"Content-Length": str(len(contents))}
+        if sha1:
+            headers["X-Checksum-Sha1"] = sha1
+        service.upload_recipe_file(io.BytesIO(contents), headers, ref, "conan_export.tgz",
+                                   "lasote")
+        service._server_store.update_last_revision(ref)
+        return service._server_store.get_recipe_file_path(ref, "conan_export.tgz")
+
+    def test_checksum(self, service):
+        ref = RecipeReference.loads("zlib/1.0#rev1")
+        contents = b"contents" * 1000
+        sha1 = hashlib.sha1(contents).hexdigest()
+        path = self._upload(service, ref, contents, sha1)
+        with open(path, "rb") as f:
+            assert f.read() == contents
+
+        with pytest.raises(RequestErrorException, match="Corrupted upload of conan_export.tgz"):
+            self._upload(service, ref, b"other contents", sha1)
+        with open(path, "rb") as f:  # The previous file is kept
+            assert f.read() == contents
+
+        headers = {"Content-Length": "100000"}
+        with pytest.raises(RequestErrorException, match="Incomplete upload of conan_export.tgz"):
+            service.upload_recipe_file(io.BytesIO(contents), headers, ref, "conan_export.tgz",
+                                       "lasote")
+        assert os.listdir(os.path.join(self.server_store.store, ".blobs", "tmp")) == []
+
+    def test_dedup(self, service):
+        ref1 = RecipeReference.loads("zlib/1.0#rev1")
+        ref2 = RecipeReference.loads("zlib/1.0#rev2")
+        ref3 = RecipeReference.loads("zlib/1.0#rev3")
+        contents = b"contents" * 1000
+        sha1 = hashlib.sha1(contents).hexdigest()
+        path1 = self._upload(service, ref1, contents, sha1)
+        # The same file uploaded again is stored only once
+        path2 = self._upload(service, ref2, contents)
+        assert os.path.samefile(path1, path2)
+
+        # The checksum deploy doesn't need the file
+        headers = {"X-Checksum-Deploy": "true", "X-Checksum-Sha1": sha1}
+        service.upload_recipe_file(io.BytesIO(b""), headers, ref3, "conan_export.tgz", "lasote")
+        self.server_store.update_last_revision(ref3)
+        path3 = self.server_store.get_recipe_file_path(ref3, "conan_export.tgz")
+        assert os.path.samefile(path1, path3)
+        for wrong_sha1 in (hashlib.sha1(b"other").hexdigest(), "../../" + sha1):
+            headers = {"X-Checksum-Deploy": "true", "X-Checksum-Sha1": wrong_sha1}
+            with pytest.raises(NotFoundException):
+                service.upload_recipe_file(io.BytesIO(b""), headers, ref3, "conanfile.py",
+                                           "lasote")
+
+        # The blob is collected only when it is not used anymore
+        blob = os.path.join(self.server_store.store, ".blobs", sha1[:2], sha1)
+        service.remove_recipe(ref1, "lasote")
+        service.remove_recipe(ref2, "lasote")
+        assert os.path.exists(blob)
+        service.remove_recipe(ref3, "lasote")
+        assert not os.path.exists(blob)
+
+    def test_collect_blobs(self, service):
+        ref1 = RecipeReference.loads("zlib/1.0#rev1")
+        ref2 = RecipeReference.loads("zlib/1.0#rev2")
+        contents = b"contents" * 1000
+        sha1 = hashlib.sha1(contents).hexdigest()
+        self._upload(service, ref1, contents)
+        self._upload(service, ref2, contents)
+        blob = os.path.join(self.server_store.store, ".blobs", sha1[:2], sha1)
+        # A blob not used by any file, from a crashed removal
+        unused_sha1 = hashlib.sha1(b"unused").hexdigest()
+        unused = os.path.join(self.server_store.store, ".blobs", unused_sha1[:2], unused_sha1)
+        save(unused, "unused")
+
+        # Only the blobs of the removed files are collected, both revisions at once
+        service.remove_recipe(RecipeReference.loads("zlib/1.0"), "lasote")
+        assert not os.path.exists(blob)
+        assert os.path.exists(unused)
+        # The maintenance full collection
+        self.server_store.blob_store.collect()
+        assert not os.path.exists(unused)
+
+    def test_saved_checksum(self, service):
+        ref = RecipeReference.loads("zlib/1.0#rev1")
+        contents = b"contents" * 1000
+        sha1 = hashlib.sha1(contents).hexdigest()
+        path = self._upload(service, ref, contents)
+        blob_store = self.server_store.blob_store
+        # The sha1 computed at upload time is served, without hashing the file
+        with patch("conans.server.store.blob_store.sha1sum") as sha1sum:
+            assert blob_store.checksum(path, os.stat(path)) == sha1
+            assert sha1sum.call_count == 0
+        # A file modified in the storage is hashed again
+        os.unlink(path)
+        save(path, "modified")
+        assert blob_store.checksum(path, os.stat(path)) == hashlib.sha1(b"modified").hexdigest()
+
+        checksums = os.path.join(self.server_store.store, ".blobs", "checksums")
+        assert sum(len(files) for _, _, files in os.walk(checksums)) == 1
+        service.remove_recipe(ref, "lasote")
+        assert sum(len(files) for _, _, files in os.walk(checksums)) == 0
+
+    def test_checksum_deploy_read_permission(self):
+        # Only the "admin" can read "secret", everybody can write everything
+        authorizer = BasicAuthorizer([("secret/*@*/*", "admin"), ("zlib/*@*/*", "*")],
+                                     [("*/*@*/*", "*")])
+        server_store = ServerStore(ServerDiskAdapter("http://url", temp_folder()))
+        service = ConanServiceV2(authorizer, server_store)
+        contents = b"secret contents" * 1000
+        sha1 = hashlib.sha1(contents).hexdigest()
+        secret = RecipeReference.loads("secret/1.0#rev1")
+        service.upload_recipe_file(io.BytesIO(contents), {"Content-Length": str(len(contents))},
+                                   secret, "conan_export.tgz", "admin")
+
+        # Knowing the sha1 is not enough to get a copy of the file in a readable reference
+        ref = RecipeReference.loads("zlib/1.0#rev1")
+        headers = {"X-Checksum-Deploy": "true", "X-Checksum-Sha1": sha1}
+        with pytest.raises(NotFoundException):
+            service.upload_recipe_file(io.BytesIO(b""), headers, ref, "conan_export.tgz",
+                                       "user")
+        assert not os.path.exists(server_store.get_recipe_file_path(ref, "conan_export.tgz"))
+        # The users that can read it can deploy it
+        service.upload_recipe_file(io.BytesIO(b""), headers, ref, "conan_export.tgz", "admin")
+        # And then anybody, as it is in a readable reference
+        ref2 = RecipeReference.loads("zlib/1.0#rev2")
+        service.upload_recipe_file(io.BytesIO(b""), headers, ref2, "conan_export.tgz", "user")
+        path = server_store.get_recipe_file_path(ref2, "conan_export.tgz")
+        assert os.path.samefile(path, server_store.get_recipe_file_path(secret,
+                                                                         "conan_export.tgz"))
@@ -0,0 +1,83 @@
+import os
+
+import bottle
+import pytest
+import webtest
+
+from conan.test.utils.test_files import temp_folder
+from conans.server.service.file_response import serve_file
+from conans.util.files import save, sha1sum
+
+
+class TestServeFile:
+
+    @pytest.fixture
+    def app(self):
+        folder = temp_folder()
+        self.path = os.path.join(folder, "conan_package.tgz")
+        save(self.path, "".join(str(i) for i in range(1000)))
+        self.contents = "".join(str(i) for i in range(1000)).encode()
+        self.sha1 = sha1sum(self.path)
+        app = bottle.Bottle()
+
+        @app.route("/<filename>")
+        def get_file(filename):
+            return serve_file(os.path.join(folder, filename))
+
+        return webtest.TestApp(app)
+
+    def test_full(self, app):
+        response = app.get("/conan_package.tgz")
+        assert response.status_int == 200
+        assert response.body == self.contents
+        assert response.headers["Content-Length"] == str(len(self.contents))
+        assert response.headers["Content-Type"] == "x-gzip"
+        assert response.headers["Accept-Ranges"] == "bytes"
+        assert response.headers["ETag"] == '"%s"' % self.sha1
+        assert response.headers["X-Checksum-Sha1"] == self.sha1
+
+        response = app.head("/conan_package.tgz")
+        assert response.body == b""
+        assert response.headers["Content-Length"] == str(len(self.contents))
+        app.get("/missing.tgz", status=404)
+
+    def test_etag(self, app):
+        response = app.get("/conan_package.tgz", headers={"If-None-Match": '"%s"' % self.sha1},
+                           status=304)
+        assert response.body == b""
+        response = app.get("/conan_package.tgz", headers={"If-None-Match": '"other", *'},
+                           status=304)
+        assert response.body == b""
+        response = app.get("/conan_package.tgz", headers={"If-None-Match": '"other"'})
+        assert response.body == self.contents
+
+        # Modified file, new ETag
+        save(self.path, "new contents")
+        response = app.get("/conan_package.tgz", headers={"If-None-Match": '"%s"' % self.sha1})
+        assert response.body == b"new contents"
+        assert response.headers["ETag"] == '"%s"' % sha1sum(self.path)
+
+    def test_range(self, app):
+        total = len(self.contents)
+        response = app.get("/conan_package.tgz", headers={"Range": "bytes=10-19"}, status=206)
+        assert response.body == self.contents[10:20]
+        assert response.headers["Content-Range"] == "bytes 10-19/%d" % total
+        assert response.headers["Content-Length"] == "10"
+
+        response = app.get("/conan_package.tgz", headers={"Range": "bytes=-5"}, status=206)
+        assert response.body == self.contents[-5:]
+        response = app.get("/conan_package.tgz", headers={"Range": "bytes=100-"}, status=206)
+        assert response.body == self.contents[100:]
+
+        response = app.get("/conan_package.tgz", headers={"Range": "bytes=%d-" % total},
+                           status=416)
+        assert response.headers["Content-Range"] == "bytes */%d" % total
+
+    def test_if_range(self, app):
+        response = app.get("/conan_package.tgz", status=206,
+                           headers={"Range": "bytes=10-19", "If-Range": '"%s"' % self.sha1})
+        assert response.body == self.contents[10:20]
+        # The file changed, the full file is sent
+        response = app.get("/conan_package.tgz", status=200,
+                           headers={"Range": "bytes=10-19", "If-Range": '"other"'})
+        assert response.body == self.contents
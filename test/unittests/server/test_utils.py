@@ -1,6 +1,7 @@
 import os
+import platform
 
-from conans.server.utils.files import path_exists
+from conans.server.utils.files import path_exists, is_case_sensitive, DirListingCache
 from conan.test.utils.test_files import temp_folder
 from conans.util.files import mkdir
 
@@ -15,3 +16,33 @@ def test_path_exists():
     mkdir(new_path)
     assert path_exists(new_path, tmp_dir)
     assert not path_exists(os.path.join(tmp_dir, "capsdir"), tmp_dir)
+
+
+def test_is_case_sensitive():
+    tmp_dir = temp_folder()
+    assert is_case_sensitive(tmp_dir) == (platform.system() == "Linux")
+    # Not cached if the folder doesn't exist yet
+    assert not is_case_sensitive(os.path.join(tmp_dir, "missing"))
+    mkdir(os.path.join(tmp_dir, "missing"))
+    assert is_case_sensitive(os.path.join(tmp_dir, "missing")) == (platform.system() == "Linux")
+
+
+def test_path_exists_listings(monkeypatch):
+    """ the case check of case insensitive filesystems uses the cached listings
+    """
+    tmp_dir = temp_folder()
+    monkeypatch.setattr("conans.server.utils.files._case_sensitive_folders", {tmp_dir: False})
+    listings = DirListingCache()
+    mkdir(os.path.join(tmp_dir, "CapsDir", "sub"))
+    assert path_exists(os.path.join(tmp_dir, "CapsDir", "sub"), tmp_dir, listings)
+    assert listings.contains(os.path.join(tmp_dir, "CapsDir"), "sub")
+
+    # New folders are listed again
+    mkdir(os.path.join(tmp_dir, "CapsDir", "sub2"))
+    assert path_exists(os.path.join(tmp_dir, "CapsDir", "sub2"), tmp_dir, listings)
+
+    # The removed ones need invalidation
+    os.rmdir(os.path.join(tmp_dir, "CapsDir", "sub2"))
+    listings.invalidate(os.path.join(tmp_dir, "CapsDir", "sub2"))
+    mkdir(os.path.join(tmp_dir, "CapsDir", "Sub2"))
+    assert not listings.contains(os.path.join(tmp_dir, "CapsDir"), "sub2")
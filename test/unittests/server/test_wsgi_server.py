@@ -0,0 +1,138 @@
+import http.client
+import socket
+import threading
+
+import os
+
+import bottle
+import pytest
+
+from conan.test.utils.test_files import temp_folder
+from conans.server.rest.wsgi_server import WorkersWSGIServer
+from conans.server.service.file_response import serve_file
+
+
+class TestWorkersWSGIServer:
+
+    @pytest.fixture
+    def server(self):
+        app = bottle.Bottle()
+        self.release = threading.Event()
+        self.blocked = threading.Semaphore(0)
+
+        @app.route("/fast")
+        def fast():
+            return "fast"
+
+        @app.route("/slow")
+        def slow():
+            self.blocked.release()
+            self.release.wait(10)
+            return "slow"
+
+        self.folder = temp_folder()
+
+        @app.route("/files/<filename>")
+        def get_file(filename):
+            return serve_file(os.path.join(self.folder, filename))
+
+        @app.route("/upload", method="PUT")
+        def upload():
+            return "uploaded"  # Never reads the body
+
+        servers = []
+
+        def _server(threads, request_queue=64):
+            server = WorkersWSGIServer(("127.0.0.1", 0), threads, request_queue=request_queue,
+                                       keepalive_timeout=2, quiet=True)
+            server.set_app(app)
+            thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05})
+            thread.start()
+            servers.append((server, thread))
+            return server
+
+        yield _server
+        self.release.set()
+        for server, thread in servers:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+    @staticmethod
+    def _connection(server):
+        return http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+
+    def _slow_request(self, server):
+        conn = self._connection(server)
+        conn.request("GET", "/slow")
+        assert self.blocked.acquire(timeout=10)
+        return conn
+
+    def test_concurrent_requests(self, server):
+        server = server(threads=2)
+        slow = self._slow_request(server)
+        # The slow request doesn't block the others
+        conn = self._connection(server)
+        conn.request("GET", "/fast")
+        response = conn.getresponse()
+        assert response.status == 200
+        assert response.read() == b"fast"
+        self.release.set()
+        assert slow.getresponse().read() == b"slow"
+
+    def test_keep_alive(self, server):
+        server = server(threads=1)
+        conn = self._connection(server)
+        conn.request("PUT", "/upload", body=b"contents" * 100)
+        response = conn.getresponse()
+        assert response.read() == b"uploaded"
+        sock = conn.sock
+        # The unread body was discarded, the same connection serves the next request
+        for _ in range(2):
+            conn.request("GET", "/fast")
+            response = conn.getresponse()
+            assert response.read() == b"fast"
+            assert conn.sock is sock
+
+    def test_queue_full(self, server):
+        server = server(threads=1, request_queue=1)
+        slow = self._slow_request(server)
+        queued = self._connection(server)
+        queued.request("GET", "/fast")
+        # The single worker is busy and the queue is full, rejected
+        rejected = socket.create_connection(server.server_address, timeout=10)
+        rejected.sendall(b"GET /fast HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        assert rejected.recv(1024).startswith(b"HTTP/1.1 503 Service Unavailable")
+        rejected.close()
+
+        self.release.set()
+        assert slow.getresponse().read() == b"slow"
+        assert queued.getresponse().read() == b"fast"
+
+    def test_graceful_shutdown(self, server):
+        server = server(threads=1)
+        slow = self._slow_request(server)
+        closing = threading.Thread(target=server.server_close)
+        closing.start()
+        self.release.set()
+        # The request in progress is completed, and the connection is not kept alive
+        response = slow.getresponse()
+        assert response.read() == b"slow"
+        assert response.getheader("Connection") == "close"
+        closing.join()
+
+    def test_sendfile(self, server):
+        server = server(threads=1)
+        contents = os.urandom(1024 * 1024)
+        with open(os.path.join(self.folder, "conan_package.tgz"), "wb") as f:
+            f.write(contents)
+        conn = self._connection(server)
+        conn.request("GET", "/files/conan_package.tgz")
+        assert conn.getresponse().read() == contents
+        conn.request("GET", "/files/conan_package.tgz", headers={"Range": "bytes=1000-1999"})
+        response = conn.getresponse()
+        assert response.status == 206
+        assert response.read() == contents[1000:2000]
+        # The connection is still usable after the sendfile() of the ranges
+        conn.request("GET", "/fast")
+        assert conn.getresponse().read() == b"fast"
@@ -1,4 +1,5 @@
 import os
+import tarfile
 import zipfile
 from os.path import basename
 
@@ -7,7 +8,7 @@ import pytest
 from conan.tools.files import unzip
 from conan.test.utils.mocks import ConanFileMock
 from conan.test.utils.test_files import temp_folder
-from conans.util.files import save
+from conans.util.files import save, load
 
 
 def test_impossible_to_import_untargz():
@@ -29,3 +30,21 @@ def test_unzip():
     dest_dir = temp_folder()
     unzip(conanfile, os.path.join(tmp_dir, 'zipfile.zip'), dest_dir)
     assert os.path.exists(os.path.join(dest_dir, "foo.txt"))
+
+
+@pytest.mark.parametrize("strip_root", [False, True])
+def test_untargz_threads(strip_root):
+    tmp_dir = temp_folder()
+    save(os.path.join(tmp_dir, "src", "pkg", "foo.txt"), "bar")
+    save(os.path.join(tmp_dir, "src", "pkg", "sub", "other.txt"), "other")
+    tgz_path = os.path.join(tmp_dir, "file.tgz")
+    with tarfile.open(tgz_path, "w:gz") as tgz:
+        tgz.add(os.path.join(tmp_dir, "src", "pkg"), "pkg")
+
+    conanfile = ConanFileMock({})
+    conanfile.conf.define("tools.files.unzip:threads", 4)
+    dest_dir = temp_folder()
+    unzip(conanfile, tgz_path, dest_dir, strip_root=strip_root)
+    root = dest_dir if strip_root else os.path.join(dest_dir, "pkg")
+    assert load(os.path.join(root, "foo.txt")) == "bar"
+    assert load(os.path.join(root, "sub", "other.txt")) == "other"
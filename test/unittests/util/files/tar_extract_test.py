@@ -2,8 +2,10 @@
 
 import os
 import platform
+import stat
 import tarfile
 import unittest
+from io import BytesIO
 
 import pytest
 
@@ -61,3 +63,89 @@ class TarExtractTest(unittest.TestCase):
             with open(self.tgz_file, 'rb') as file_handler:
                 tar_extract(file_handler, destination_dir)
             check_files(destination_dir)
+
+
+def _tree(folder):
+    result = {}
+    for root, dirs, files in os.walk(folder):
+        for name in dirs + files:
+            path = os.path.join(root, name)
+            st = os.lstat(path)
+            rel_path = os.path.relpath(path, folder)
+            if os.path.islink(path):
+                result[rel_path] = "link", os.readlink(path)
+            elif os.path.isdir(path):  # The implicit ones have the current time
+                result[rel_path] = "dir", stat.S_IMODE(st.st_mode)
+            else:
+                with open(path, "rb") as f:
+                    content = f.read()
+                result[rel_path] = content, stat.S_IMODE(st.st_mode), int(st.st_mtime), st.st_nlink
+    return result
+
+
+@pytest.mark.skipif(platform.system() == "Windows", reason="Requires Linux or Mac")
+@pytest.mark.parametrize("stream", [False, True])
+def test_tar_extract_threads(stream, monkeypatch):
+    """ the parallel extraction must produce the same result as the tarfile extractall()
+    """
+    from conans.util import files
+    # so the big files and the bounded memory code paths are also covered
+    monkeypatch.setattr(files._ParallelTarExtractor, "MAX_FILE_SIZE", 1000)
+    monkeypatch.setattr(files._ParallelTarExtractor, "MAX_BUFFERED", 3000)
+
+    tmp_folder = temp_folder()
+    tgz_file = os.path.join(tmp_folder, "file.tgz")
+    with open(tgz_file, "wb") as tgz_handle:
+        tgz = gzopen_without_timestamps("name", mode="w", fileobj=tgz_handle)
+
+        def add(name, content=None, mode=0o644, **kwargs):
+            info = tarfile.TarInfo(name=name)
+            info.mode = mode
+            info.mtime = 1234567 + len(name)
+            for k, v in kwargs.items():
+                setattr(info, k, v)
+            if content is not None:
+                info.size = len(content)
+                tgz.addfile(tarinfo=info, fileobj=BytesIO(content))
+            else:
+                tgz.addfile(tarinfo=info)
+
+        add("include", type=tarfile.DIRTYPE, mode=0o555)  # read-only, set at the end
+        for i in range(20):
+            add(f"include/header{i}.h", b"header %d" % i * (i * 20))
+        add("lib/libfoo.so.1", b"binary" * 1000, mode=0o755)  # no dir entry, big file
+        add("lib/libfoo.so", type=tarfile.SYMTYPE, linkname="libfoo.so.1")
+        add("lib/libfoo.a", type=tarfile.LNKTYPE, linkname="include/header3.h")
+        add("bin/tool", b"first", mode=0o700)
+        add("bin/tool", b"second", mode=0o750)  # duplicated, the last one wins
+        add("empty", type=tarfile.DIRTYPE, mode=0o750)
+        tgz.close()
+
+    expected = os.path.join(tmp_folder, "expected")
+    with open(tgz_file, "rb") as file_handler:
+        tar_extract(file_handler, expected, stream=stream)
+    dest = os.path.join(tmp_folder, "dest")
+    with open(tgz_file, "rb") as file_handler:
+        tar_extract(file_handler, dest, stream=stream, threads=4)
+
+    result = _tree(dest)
+    assert result == _tree(expected)
+    assert result["bin/tool"][:2] == (b"second", 0o750)
+    assert result["include"] == ("dir", 0o555)
+    assert int(os.stat(os.path.join(dest, "include")).st_mtime) == 1234567 + len("include")
+    assert result["lib/libfoo.so"] == ("link", "libfoo.so.1")
+    assert result["lib/libfoo.a"][3] == 2  # hardlink
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@pytest.mark.parametrize("content", [b"", b"ab"])
+def test_tar_extract_short_file(stream, content):
+    """ an empty or truncated archive is a tarfile.ReadError, not a seek error
+    """
+    tmp_folder = temp_folder()
+    tgz_file = os.path.join(tmp_folder, "file.tgz")
+    with open(tgz_file, "wb") as f:
+        f.write(content)
+    with open(tgz_file, "rb") as file_handler:
+        with pytest.raises(tarfile.ReadError):
+            tar_extract(file_handler, os.path.join(tmp_folder, "dest"), stream=stream)